@@ -144,7 +144,8 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # JSONRenderer's output, encoded with orjson when it is installed
+        'jobs.renderers.FastJSONRenderer',
     ],
 }
 
@@ -162,14 +163,108 @@ CORS_ALLOW_CREDENTIALS = True
 # Rate limiting configuration
 RATE_LIMIT_EXEMPT_IPS = ['127.0.0.1', '::1', 'localhost']
 
-# Caching configuration for rate limiting
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'job-dashboard-cache',
+# Caching configuration for rate limiting and API caches. Use Redis when
+# REDIS_URL is set so limits and cache versions are shared by all workers.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'job-dashboard-cache',
+        }
     }
+
+# Whether the default cache is shared by every worker and management command.
+# The jobs version that drives ETags and the response and count caches lives
+# there; with a per-process cache (LocMemCache) writes made elsewhere would
+# never invalidate them, so those features are off unless this is true
+JOB_CACHE_SHARED = config('JOB_CACHE_SHARED', default=bool(REDIS_URL), cast=bool)
+
+# Seconds JobViewSet keeps rendered response data per action; 0 disables.
+# Entries are keyed by the jobs version, so writes make them unreachable.
+JOB_RESPONSE_CACHE_TTLS = {
+    'list': config('JOB_LIST_CACHE_TTL', default=30, cast=int),
+    'retrieve': config('JOB_DETAIL_CACHE_TTL', default=30, cast=int),
+    'stats': config('JOB_STATS_CACHE_TTL', default=10, cast=int),
+    'timeseries': config('JOB_TIMESERIES_CACHE_TTL', default=10, cast=int),
+    'durations': config('JOB_DURATIONS_CACHE_TTL', default=60, cast=int),
 }
 
+# Job list counts: unfiltered lists on tables at least this large report the
+# planner's row estimate; filtered counts are cached for JOB_COUNT_CACHE_TTL seconds
+JOB_COUNT_ESTIMATE_THRESHOLD = config('JOB_COUNT_ESTIMATE_THRESHOLD', default=100000, cast=int)
+JOB_COUNT_CACHE_TTL = config('JOB_COUNT_CACHE_TTL', default=60, cast=int)
+
+# How often `manage.py refresh_job_stats --loop` refreshes job_stats_view (seconds)
+JOB_STATS_REFRESH_INTERVAL = config('JOB_STATS_REFRESH_INTERVAL', default=60, cast=int)
+
+# Number of jobs written per transaction by bulk endpoints
+JOB_BULK_CHUNK_SIZE = config('JOB_BULK_CHUNK_SIZE', default=1000, cast=int)
+
+# Rows fetched per server-side cursor round trip by /api/jobs/export/
+JOB_EXPORT_CHUNK_SIZE = config('JOB_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Seconds between background health samples served by /health/
+HEALTH_SAMPLE_INTERVAL = config('HEALTH_SAMPLE_INTERVAL', default=15, cast=int)
+
+# Seconds the application section of /metrics/ is cached between scrapes
+APP_METRICS_CACHE_TTL = config('APP_METRICS_CACHE_TTL', default=10, cast=int)
+
+# Stuck-job sweeper (manage.py sweep_stuck_jobs): RUNNING jobs with no status
+# update for longer than their timeout in seconds are failed. A timeout for the
+# job's resource_requirements "class" wins over one for its priority, which
+# wins over JOB_STUCK_TIMEOUT, e.g. {'gpu': 21600} and {10: 1800}.
+JOB_STUCK_TIMEOUT = config('JOB_STUCK_TIMEOUT', default=7200, cast=int)
+JOB_STUCK_TIMEOUTS_BY_PRIORITY = {}
+JOB_STUCK_TIMEOUTS_BY_RESOURCE_CLASS = {}
+JOB_SWEEP_INTERVAL = config('JOB_SWEEP_INTERVAL', default=300, cast=int)
+
+# Status transition rollups for /api/jobs/timeseries/ (`manage.py roll_up_job_status`).
+# A minute is rolled up JOB_ROLLUP_GRACE seconds after it ends, so that
+# transactions committing late are still counted.
+JOB_ROLLUP_INTERVAL = config('JOB_ROLLUP_INTERVAL', default=60, cast=int)
+JOB_ROLLUP_GRACE = config('JOB_ROLLUP_GRACE', default=120, cast=int)
+JOB_TIMESERIES_MAX_BUCKETS = config('JOB_TIMESERIES_MAX_BUCKETS', default=1440, cast=int)
+
+# JobStatus history (PostgreSQL: monthly partitions of jobs_jobstatus).
+# create_job_status_partitions keeps JOB_STATUS_PARTITIONS_AHEAD months ready;
+# compact_job_history collapses histories of jobs finished more than
+# JOB_STATUS_COMPACT_AFTER_DAYS ago and, when JOB_STATUS_RETENTION_DAYS is
+# non-zero, removes partitions entirely older than that
+JOB_STATUS_PARTITIONS_AHEAD = config('JOB_STATUS_PARTITIONS_AHEAD', default=3, cast=int)
+JOB_STATUS_COMPACT_AFTER_DAYS = config('JOB_STATUS_COMPACT_AFTER_DAYS', default=30, cast=int)
+JOB_STATUS_RETENTION_DAYS = config('JOB_STATUS_RETENTION_DAYS', default=0, cast=int)
+
+# Cold storage (manage.py archive_jobs): finished jobs older than
+# JOB_ARCHIVE_AFTER_DAYS are moved to gzip JSONL files in JOB_ARCHIVE_DIR,
+# compressed in independently readable blocks of JOB_ARCHIVE_BLOCK_SIZE jobs
+JOB_ARCHIVE_DIR = config('JOB_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+JOB_ARCHIVE_AFTER_DAYS = config('JOB_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+JOB_ARCHIVE_BLOCK_SIZE = config('JOB_ARCHIVE_BLOCK_SIZE', default=100, cast=int)
+
+# Live event stream (/api/jobs/events/, ASGI only): seconds between keepalive
+# comments, events replayed after a Last-Event-ID, ids before it that are
+# replayed again (in case they committed late), and events buffered per
+# connection before it is sent a reset
+JOB_EVENTS_HEARTBEAT = config('JOB_EVENTS_HEARTBEAT', default=15, cast=int)
+JOB_EVENTS_RESUME_LIMIT = config('JOB_EVENTS_RESUME_LIMIT', default=1000, cast=int)
+JOB_EVENTS_REPLAY_OVERLAP = config('JOB_EVENTS_REPLAY_OVERLAP', default=100, cast=int)
+JOB_EVENTS_QUEUE_SIZE = config('JOB_EVENTS_QUEUE_SIZE', default=1000, cast=int)
+
+# Per-request SQL instrumentation (jobs/querystats.py): adds X-DB-Queries and
+# X-DB-Time headers to API responses and logs a warning when one normalized
+# query shape runs more than JOB_SQL_REPEAT_THRESHOLD times in a request
+JOB_SQL_INSTRUMENTATION = config('JOB_SQL_INSTRUMENTATION', default=False, cast=bool)
+JOB_SQL_REPEAT_THRESHOLD = config('JOB_SQL_REPEAT_THRESHOLD', default=5, cast=int)
+
 # Logging configuration (console only for simplicity)
 LOGGING = {
     'version': 1,
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration shared by all deployments.
+
+Worker settings are still passed on the command line (see Dockerfile.backend);
+this file only wires up prometheus_client's multiprocess mode so that
+/metrics/prometheus/ aggregates samples from every worker.
+"""
+import os
+import shutil
+
+# Must be set before any worker imports prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    # Files left by a previous master would be merged into the new totals
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -11,19 +11,22 @@ class JobStatusInline(admin.TabularInline):
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ['name', 'created_at', 'get_latest_status']
-    list_filter = ['created_at']
+    list_filter = ['current_status', 'created_at']
     search_fields = ['name']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = [
+        'created_at', 'updated_at', 'current_status', 'current_progress',
+        'current_message', 'current_status_entry_id', 'status_changed_at',
+    ]
     inlines = [JobStatusInline]
 
     def get_latest_status(self, obj):
-        latest = obj.latest_status
-        return latest.status_type if latest else 'No status'
+        return obj.current_status or 'No status'
     get_latest_status.short_description = 'Latest Status'
 
 
 @admin.register(JobStatus)
 class JobStatusAdmin(admin.ModelAdmin):
     list_display = ['job', 'status_type', 'timestamp']
+    list_select_related = ['job']
     list_filter = ['status_type', 'timestamp']
     readonly_fields = ['timestamp']
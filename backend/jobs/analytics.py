@@ -0,0 +1,79 @@
+"""
+Per-phase duration analytics.
+
+Queue wait, run time and retry gaps come from the Job phase columns
+(PHASE_TIME_FIELDS) that record_status() accumulates at transition time,
+so distributions are aggregated over jobs_job alone and never scan the
+status history.
+"""
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection, models
+from django.db.models import Aggregate, Avg, Count
+from django.db.models.functions import Extract
+
+from .monitoring import PERCENTILES
+
+# Reported name -> Job column
+PHASES = {
+    'queue_wait_seconds': 'queue_time',
+    'run_time_seconds': 'run_time',
+    'retry_gap_seconds': 'retry_gap_time',
+}
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL percentile_cont over PERCENTILES; returns a list of values"""
+    function = 'percentile_cont'
+    template = "%(function)s(ARRAY[%(fractions)s]::float8[]) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, **extra):
+        super().__init__(
+            expression,
+            fractions=', '.join(str(fraction) for fraction in PERCENTILES),
+            output_field=ArrayField(models.FloatField()),
+            **extra,
+        )
+
+
+def phase_aggregates():
+    aggregates = {}
+    for name, field in PHASES.items():
+        aggregates[f'{name}__count'] = Count(field)
+        aggregates[f'{name}__avg'] = Avg(field)
+        if connection.vendor == 'postgresql':
+            aggregates[f'{name}__percentiles'] = PercentileCont(Extract(field, 'epoch'))
+    return aggregates
+
+
+def phase_distributions(row):
+    """{phase: {'count', 'avg', 'p50', 'p90', 'p99'}} in seconds from an aggregate row"""
+    keys = [f'p{int(fraction * 100)}' for fraction in PERCENTILES]
+    distributions = {}
+    for name in PHASES:
+        avg = row[f'{name}__avg']
+        percentiles = row.get(f'{name}__percentiles') or [None] * len(keys)
+        distributions[name] = {
+            'count': row[f'{name}__count'],
+            'avg': round(avg.total_seconds(), 2) if avg is not None else None,
+            **{key: round(value, 2) if value is not None else None for key, value in zip(keys, percentiles)},
+        }
+    return distributions
+
+
+def get_phase_durations(queryset):
+    """
+    Queue wait, run time and retry gap distributions for the jobs in
+    `queryset`, overall and per priority. Percentiles are None when the
+    database isn't PostgreSQL.
+    """
+    queryset = queryset.order_by()
+    aggregates = phase_aggregates()
+    by_priority = queryset.values('priority').annotate(jobs=Count('id'), **aggregates).order_by('priority')
+    overall = queryset.aggregate(jobs=Count('id'), **aggregates)
+    return {
+        'overall': {'jobs': overall['jobs'], **phase_distributions(overall)},
+        'by_priority': [
+            {'priority': row['priority'], 'jobs': row['jobs'], **phase_distributions(row)}
+            for row in by_priority
+        ],
+    }
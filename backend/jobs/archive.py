@@ -0,0 +1,138 @@
+"""
+Cold storage for finished jobs.
+
+Archived jobs are written to gzip-compressed JSONL files under
+JOB_ARCHIVE_DIR, one line per job holding the job and its status history.
+Each file is a series of independent gzip members ("blocks") of up to
+JOB_ARCHIVE_BLOCK_SIZE jobs, so the file as a whole still reads with zcat,
+while ArchivedJob records the byte offset and length of the block holding
+each job. Reading one job back only decompresses its block.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_jobs_version
+from .db import delete_where_in
+from .models import TERMINAL_STATUSES, ArchivedJob, Job, JobStatus
+
+
+def get_archive_dir():
+    return Path(getattr(settings, 'JOB_ARCHIVE_DIR', settings.BASE_DIR / 'archive'))
+
+
+class JobArchiver:
+    """Moves terminal jobs finished before a cutoff into a new archive file"""
+
+    def __init__(self, cutoff, batch_size=None, block_size=None, archive_dir=None):
+        self.cutoff = cutoff
+        self.batch_size = batch_size or getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000)
+        self.block_size = block_size or getattr(settings, 'JOB_ARCHIVE_BLOCK_SIZE', 100)
+        self.archive_dir = Path(archive_dir) if archive_dir else get_archive_dir()
+        self.archive_file = f"jobs-{timezone.now():%Y%m%dT%H%M%S}.jsonl.gz"
+
+    def candidates(self, after_id):
+        return list(
+            Job.objects.filter(
+                id__gt=after_id,
+                current_status__in=TERMINAL_STATUSES,
+                completed_at__lt=self.cutoff,
+            ).order_by('id').values_list('id', flat=True)[:self.batch_size]
+        )
+
+    def run(self):
+        """Archive every eligible job; returns the number archived"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / self.archive_file
+
+        archived = 0
+        last_id = 0
+        with open(path, 'ab') as archive:
+            while True:
+                job_ids = self.candidates(last_id)
+                if not job_ids:
+                    break
+                last_id = job_ids[-1]
+                archived += self.archive_batch(archive, job_ids)
+
+        if not archived:
+            path.unlink(missing_ok=True)
+        return archived
+
+    def archive_batch(self, archive, job_ids):
+        """
+        Lock the batch, append it to the archive file and make that durable,
+        then index it and delete the rows, all in one transaction. Jobs
+        locked by a concurrent write are skipped and eligibility is checked
+        again under the lock, so a job restarted since it was selected stays
+        put. A status written concurrently is either committed before the
+        lock, and archived, or fails on the deleted job (its job UPDATE or
+        foreign key check), so none is deleted without being archived.
+        If the transaction fails the written blocks are simply left
+        unindexed. Returns the number of jobs archived.
+        """
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.select_for_update(skip_locked=True).filter(
+                    id__in=job_ids,
+                    current_status__in=TERMINAL_STATUSES,
+                    completed_at__lt=self.cutoff,
+                ).order_by('id').values()
+            )
+            if not jobs:
+                return 0
+            archived_ids = [job['id'] for job in jobs]
+
+            statuses = defaultdict(list)
+            for status in JobStatus.objects.filter(job_id__in=archived_ids).order_by(
+                'job_id', 'timestamp', 'id'
+            ).values():
+                statuses[status['job_id']].append(status)
+
+            index = []
+            for start in range(0, len(jobs), self.block_size):
+                block = jobs[start:start + self.block_size]
+                lines = [
+                    json.dumps({'job': job, 'statuses': statuses[job['id']]}, cls=DjangoJSONEncoder) + '\n'
+                    for job in block
+                ]
+                offset = archive.tell()
+                archive.write(gzip.compress(''.join(lines).encode()))
+                length = archive.tell() - offset
+                index.extend(
+                    ArchivedJob(job_id=job['id'], archive_file=self.archive_file, offset=offset, length=length)
+                    for job in block
+                )
+            archive.flush()
+            os.fsync(archive.fileno())
+
+            ArchivedJob.objects.bulk_create(index)
+            # Plain DELETEs: the collector would load every row to send signals
+            delete_where_in(JobStatus, 'job', archived_ids)
+            delete_where_in(Job, 'id', archived_ids)
+            transaction.on_commit(bump_jobs_version)
+        return len(archived_ids)
+
+
+def read_archived_job(job_id):
+    """Return the archived {'job': ..., 'statuses': [...]} record, or None"""
+    entry = ArchivedJob.objects.filter(job_id=job_id).first()
+    if entry is None:
+        return None
+
+    with open(get_archive_dir() / entry.archive_file, 'rb') as archive:
+        archive.seek(entry.offset)
+        block = gzip.decompress(archive.read(entry.length))
+
+    for line in block.splitlines():
+        record = json.loads(line)
+        if record['job']['id'] == job_id:
+            return record
+    return None
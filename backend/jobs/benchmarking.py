@@ -0,0 +1,223 @@
+"""
+Backend benchmark harness (manage.py benchmark_api).
+
+Each scenario issues requests against the real Django stack: middleware,
+views, serializers and database. Requests go either in-process through the
+test client, with the response and count caches off so every request pays
+the endpoint's full cost, or over HTTP to a running server as configured.
+Per scenario it reports latency percentiles, throughput, and SQL queries
+per request. Query counts come from CaptureQueriesContext in-process, and
+from the X-DB-Queries response header over HTTP when the server sends it.
+
+Results can be saved as a baseline JSON file and later compared with
+compare_to_baseline(), which lists every regression beyond a tolerance.
+"""
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.db.models import Count, Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .models import STATUS_CHOICES, Job
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # build(rng, context) -> (path, JSON body or None)
+    build: callable
+
+
+def list_path(**params):
+    return f"/api/jobs/?{urlencode(params)}" if params else '/api/jobs/'
+
+
+def scenarios():
+    """Scenarios by name. Parameters vary per request so caches see a realistic mix."""
+    statuses = [status_type for status_type, _ in STATUS_CHOICES]
+    search_terms = ['data', 'training', 'backup', 'report', 'sync', 'log']
+    return {scenario.name: scenario for scenario in [
+        Scenario('list_shallow', 'GET', lambda rng, ctx: (list_path(page=rng.randint(1, min(5, ctx['pages']))), None)),
+        Scenario('list_deep', 'GET', lambda rng, ctx: (
+            list_path(page=rng.randint(max(1, ctx['pages'] // 2), ctx['pages'])), None
+        )),
+        Scenario('list_cursor', 'GET', lambda rng, ctx: (list_path(cursor='', page_size=rng.choice([20, 50])), None)),
+        Scenario('filter_status', 'GET', lambda rng, ctx: (list_path(status=rng.choice(statuses)), None)),
+        Scenario('filter_priority', 'GET', lambda rng, ctx: (list_path(priority=rng.randint(1, 10)), None)),
+        Scenario('filter_created', 'GET', lambda rng, ctx: (
+            list_path(created_after=(ctx['oldest'] + (ctx['newest'] - ctx['oldest']) * rng.random()).isoformat()),
+            None,
+        )),
+        Scenario('search', 'GET', lambda rng, ctx: (list_path(search=rng.choice(search_terms)), None)),
+        Scenario('stats', 'GET', lambda rng, ctx: ('/api/jobs/stats/', None)),
+        Scenario('detail', 'GET', lambda rng, ctx: (f"/api/jobs/{rng.choice(ctx['job_ids'])}/", None)),
+        Scenario('update', 'PATCH', lambda rng, ctx: (
+            f"/api/jobs/{rng.choice(ctx['job_ids'])}/",
+            {'status_type': 'RUNNING', 'progress': rng.randint(0, 100), 'message': 'benchmark'},
+        )),
+        Scenario('bulk_status_update', 'POST', lambda rng, ctx: (
+            '/api/jobs/bulk_status_update/',
+            {
+                'job_ids': rng.sample(ctx['job_ids'], min(50, len(ctx['job_ids']))),
+                'status': {'status_type': 'RUNNING', 'progress': rng.randint(0, 100)},
+            },
+        )),
+    ]}
+
+
+def build_context(sample_size=1000, seed=0):
+    """Existing job IDs to pick from, the created_at range and the number of default-size list pages"""
+    bounds = Job.objects.aggregate(
+        min_id=Min('id'), max_id=Max('id'), oldest=Min('created_at'), newest=Max('created_at'), count=Count('id'),
+    )
+    if not bounds['count']:
+        return {'job_ids': []}
+
+    # Sample IDs from the key range rather than ORDER BY random() over the table
+    span = range(bounds['min_id'], bounds['max_id'] + 1)
+    candidates = random.Random(seed).sample(span, min(len(span), sample_size * 2))
+    job_ids = sorted(Job.objects.filter(id__in=candidates).values_list('id', flat=True))[:sample_size]
+    return {
+        'job_ids': job_ids,
+        'oldest': bounds['oldest'],
+        'newest': bounds['newest'],
+        'pages': max(1, math.ceil(bounds['count'] / 20)),
+    }
+
+
+class InProcessTransport:
+    """Django test client per thread; SQL queries are counted on the thread's connection"""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def request(self, method, path, body):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            # localhost is in ALLOWED_HOSTS and exempt from rate limiting
+            client = self.local.client = Client(HTTP_HOST='localhost', REMOTE_ADDR='127.0.0.1')
+        data = json.dumps(body) if body is not None else None
+        with CaptureQueriesContext(connection) as queries:
+            response = client.generic(method, path, data or '', content_type='application/json')
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+        return response.status_code, len(queries.captured_queries)
+
+    def close(self):
+        connection.close()
+
+
+class HTTPTransport:
+    """Requests to a running server; query counts need its X-DB-Queries header"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            e.read()
+            status, headers = e.code, e.headers
+        queries = headers.get('X-DB-Queries')
+        return status, int(queries) if queries is not None else None
+
+    def close(self):
+        pass
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def run_scenario(scenario, transport, context, requests, concurrency, seed=0):
+    """Issue `requests` requests from `concurrency` threads; returns the scenario's result"""
+    rng = random.Random(f'{seed}:{scenario.name}')
+    calls = [scenario.build(rng, context) for _ in range(requests)]
+    latencies, query_counts, errors = [], [], 0
+    lock = threading.Lock()
+
+    def worker(worker_calls):
+        nonlocal errors
+        try:
+            for path, body in worker_calls:
+                started = time.perf_counter()
+                status, queries = transport.request(scenario.method, path, body)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed_ms)
+                    if queries is not None:
+                        query_counts.append(queries)
+                    if status >= 400:
+                        errors += 1
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, calls[index::concurrency]) for index in range(concurrency)]:
+            future.result()
+    wall_time = time.perf_counter() - started
+
+    latencies.sort()
+    p50, p95, p99 = (percentile(latencies, fraction) for fraction in (0.5, 0.95, 0.99))
+    return {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': round(p50, 2) if p50 is not None else None,
+        'p95_ms': round(p95, 2) if p95 is not None else None,
+        'p99_ms': round(p99, 2) if p99 is not None else None,
+        'throughput_rps': round(requests / wall_time, 1) if requests else None,
+        'queries_per_request': round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Regressions of `results` against a saved baseline, as messages: a
+    latency percentile or throughput worse by more than `tolerance`
+    (a fraction), any increase in queries per request, or new errors.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        # Runs without samples have nothing to compare
+        if None in (result['p50_ms'], previous['p50_ms']):
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f'{name}: {metric} {previous[metric]} -> {result[metric]}')
+        if result['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput_rps {previous['throughput_rps']} -> {result['throughput_rps']}"
+            )
+        if None not in (result['queries_per_request'], previous['queries_per_request']) \
+                and result['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f"{name}: queries_per_request {previous['queries_per_request']} -> {result['queries_per_request']}"
+            )
+        if result['errors'] > previous['errors']:
+            regressions.append(f"{name}: errors {previous['errors']} -> {result['errors']}")
+    return regressions
@@ -0,0 +1,101 @@
+"""
+Cache helpers shared by the jobs API.
+
+Cached job data is keyed by a global version number that is bumped on every
+Job / JobStatus write, so stale entries become unreachable without having to
+find and delete them. The version is only meaningful when every process
+shares the cache (JOB_CACHE_SHARED); callers check jobs_cache_enabled().
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+JOBS_VERSION_KEY = 'jobs:version'
+JOBS_CHANGED_AT_KEY = 'jobs:changed_at'
+STATS_REFRESHED_AT_KEY = 'jobs:stats_refreshed_at'
+
+
+def jobs_cache_enabled():
+    """True when the jobs version is shared, so writes by any process invalidate"""
+    return getattr(settings, 'JOB_CACHE_SHARED', False)
+
+
+def get_jobs_version():
+    """Current jobs data version"""
+    version = cache.get(JOBS_VERSION_KEY)
+    if version is None:
+        cache.add(JOBS_VERSION_KEY, 1, timeout=None)
+        version = cache.get(JOBS_VERSION_KEY, 1)
+    return version
+
+
+def bump_jobs_version():
+    """Invalidate everything cached under the current jobs version"""
+    cache.set(JOBS_CHANGED_AT_KEY, time.time(), timeout=None)
+    try:
+        return cache.incr(JOBS_VERSION_KEY)
+    except ValueError:
+        # Key missing (evicted or never set); any new value invalidates
+        cache.add(JOBS_VERSION_KEY, 2, timeout=None)
+        return cache.get(JOBS_VERSION_KEY)
+
+
+def get_jobs_watermark():
+    """
+    (version, changed_at) identifying the current state of the jobs data.
+    changed_at is when the version was last bumped, or first read if the
+    cache has lost it; it also tells apart a version number that repeats
+    after the counter was evicted.
+    """
+    changed_at = cache.get(JOBS_CHANGED_AT_KEY)
+    if changed_at is None:
+        cache.add(JOBS_CHANGED_AT_KEY, time.time(), timeout=None)
+        changed_at = cache.get(JOBS_CHANGED_AT_KEY, time.time())
+    return get_jobs_version(), changed_at
+
+
+def mark_stats_refreshed():
+    """Record that job_stats_view was refreshed, changing the stats validators"""
+    cache.set(STATS_REFRESHED_AT_KEY, time.time(), timeout=None)
+
+
+def get_stats_refreshed_at():
+    return cache.get(STATS_REFRESHED_AT_KEY)
+
+
+def get_validators(request, extra_timestamps=()):
+    """
+    (ETag, Last-Modified epoch seconds) for a GET of jobs data, derived from
+    the jobs watermark and the request's URL only, so a conditional request
+    can be answered without querying the database.
+    """
+    version, changed_at = get_jobs_watermark()
+    timestamps = [changed_at, *(stamp for stamp in extra_timestamps if stamp is not None)]
+    # The host is included because paginated responses carry absolute links
+    state = f'{version}:{timestamps}:{request.get_host()}{request.path}?{normalize_params(request.GET)}'
+    etag = f'W/"{hashlib.md5(state.encode()).hexdigest()}"'
+    return etag, int(max(timestamps))
+
+
+def normalize_params(params, ignore=()):
+    """Stable string for a QueryDict, ignoring the given keys and empty values"""
+    items = sorted(
+        (key, value)
+        for key, values in params.lists() if key not in ignore
+        for value in values if value != ''
+    )
+    return urlencode(items)
+
+
+def versioned_key(prefix, normalized):
+    """Cache key for `normalized` parameters under the current jobs version"""
+    digest = hashlib.md5(normalized.encode()).hexdigest()
+    return f'jobs:{prefix}:v{get_jobs_version()}:{digest}'
+
+
+def response_cache_key(action, etag):
+    """Response cache key for a view action; the ETag already encodes version and params"""
+    return f'jobs:response:{action}:{etag}'
@@ -0,0 +1,110 @@
+"""
+Database helpers that take advantage of PostgreSQL features when available
+"""
+import io
+import json
+from datetime import timedelta
+from operator import attrgetter
+
+from django.db import connection, models
+
+
+def estimate_row_count(model):
+    """
+    Planner estimate of a table's row count from pg_class.reltuples.
+    Returns None when unavailable (non-PostgreSQL, or never analyzed).
+    """
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    # reltuples is -1 (PostgreSQL 14+) or 0 before the first ANALYZE
+    if not row or row[0] <= 0:
+        return None
+    return row[0]
+
+
+def supports_copy():
+    """True when bulk loads can use PostgreSQL COPY (psycopg2 copy_expert)"""
+    if connection.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return not is_psycopg3
+
+
+def reserve_ids(model, count):
+    """Allocate `count` primary keys from the model's sequence"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def delete_where_in(model, field_name, values, batch_size=1000):
+    """
+    DELETE the model's rows whose `field_name` is in `values` with plain SQL:
+    no deletion collector, cascades or signals, so callers handle those.
+    Returns the number of rows deleted.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field_name).column)
+    values = list(values)
+    deleted = 0
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"DELETE FROM {table} WHERE {column} = ANY(%s)", [values])
+            return cursor.rowcount
+        # Batched to stay under SQLite's bound parameter limit
+        for start in range(0, len(values), batch_size):
+            batch = values[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", batch)
+            deleted += cursor.rowcount
+    return deleted
+
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(field, value):
+    """Render a Python value in COPY text format"""
+    if value is None:
+        return '\\N'
+    if value.__class__ is int:
+        return str(value)
+    if isinstance(field, models.JSONField):
+        value = json.dumps(value, cls=field.encoder)
+    elif isinstance(value, bool):
+        value = 't' if value else 'f'
+    elif isinstance(value, timedelta):
+        # str(timedelta) ("1 day, 0:10:00") isn't valid interval input
+        value = f'{value.days} days {value.seconds} seconds {value.microseconds} microseconds'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_instances(model, instances):
+    """
+    Insert unsaved model instances with COPY ... FROM STDIN. Every concrete
+    column is written as-is, so primary keys (see reserve_ids) and auto_now
+    fields must already be set; no pre_save hooks or signals run.
+    """
+    fields = model._meta.concrete_fields
+    get_values = attrgetter(*(field.attname for field in fields))
+    buffer = io.StringIO()
+    for instance in instances:
+        buffer.write('\t'.join(map(_copy_value, fields, get_values(instance))))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN", buffer)
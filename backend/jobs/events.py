@@ -0,0 +1,247 @@
+"""
+Live job events over server-sent events.
+
+Every JobStatus insert fires a NOTIFY on the jobs_events channel, from a
+statement-level trigger (migration 0013). Inserts of more than a hundred
+rows at once notify a single `reset` event instead of one per row.
+Each server process runs one JobEventListener thread that LISTENs on a
+dedicated connection and fans events out to the open streams, so the
+number of dashboards does not change the database load. The stream needs
+the ASGI server (config.asgi); a WSGI worker would be held for the whole
+life of each connection.
+
+Event ids are JobStatus ids, which are assigned at insert and not at
+commit, so a reconnecting client can be missing an event with a lower id
+than its Last-Event-ID. The replay therefore re-reads the
+JOB_EVENTS_REPLAY_OVERLAP ids before it, and an event may be delivered
+more than once; clients treat events as hints to refetch.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_http_methods
+
+from .models import STATUS_CHOICES
+
+logger = logging.getLogger('jobs.api')
+
+CHANNEL = 'jobs_events'
+
+REPLAY_SQL = """
+    SELECT jobs_status_event(id, job_id, status_type, progress, message, "timestamp")
+    FROM jobs_jobstatus
+    WHERE id > %s - %s
+    ORDER BY id
+    LIMIT %s;
+"""
+
+
+class JobEventListener:
+    """
+    Shares one LISTEN connection between all event streams of a process.
+    Subscribers are callables invoked on the listener thread with each event.
+    """
+
+    def __init__(self, reconnect_delay=5):
+        self.reconnect_delay = reconnect_delay
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name='job-event-listener', daemon=True)
+                self._thread.start()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.add(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.discard(callback)
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event)
+
+    def connect(self):
+        """A raw autocommit connection outside Django's per-thread handling"""
+        wrapper = connections['default']
+        conn = wrapper.get_new_connection(wrapper.get_connection_params())
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL};')
+        return conn
+
+    def listen(self, conn):
+        """Publish notifications until the connection fails"""
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        if is_psycopg3:
+            # Blocks until each notification arrives; a dropped connection raises
+            for notify in conn.notifies():
+                self.publish(json.loads(notify.payload))
+            return
+        while True:
+            if select.select([conn], [], [], 5) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self.publish(json.loads(notify.payload))
+
+    def run(self):
+        while True:
+            conn = None
+            try:
+                conn = self.connect()
+                self.listen(conn)
+            except Exception as e:
+                logger.error(f"Job event listener failed, reconnecting: {e}")
+                if conn is not None:
+                    conn.close()
+                time.sleep(self.reconnect_delay)
+
+
+job_event_listener = JobEventListener()
+
+
+class EventSubscription:
+    """
+    One stream's filtered, bounded queue. Events are delivered from the
+    listener thread onto the stream's event loop; a stream that falls a full
+    queue behind is flagged as overflowed instead of buffering without limit.
+    """
+
+    def __init__(self, loop, status=None, priority=None, queue_size=1000):
+        self.loop = loop
+        self.status = status
+        self.priority = priority
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def matches(self, event):
+        # Bulk-insert summaries concern every filter
+        if event['event'] == 'reset':
+            return True
+        if self.status and event['status'] != self.status:
+            return False
+        if self.priority is not None and event['priority'] != self.priority:
+            return False
+        return True
+
+    def __call__(self, event):
+        if self.matches(event):
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+def format_event(event):
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+def fetch_events_since(last_event_id, limit, overlap=0):
+    """Events after last_event_id, and the `overlap` ids before it"""
+    with connection.cursor() as cursor:
+        cursor.execute(REPLAY_SQL, [last_event_id, overlap, limit + overlap])
+        events = [row[0] for row in cursor.fetchall()]
+    return [json.loads(event) if isinstance(event, str) else event for event in events]
+
+
+async def stream_events(subscription, last_event_id):
+    """
+    Replay events after Last-Event-ID (up to JOB_EVENTS_RESUME_LIMIT), then
+    stream live ones. A `reset` event tells the client it missed events and
+    should refetch the job list.
+    """
+    heartbeat = getattr(settings, 'JOB_EVENTS_HEARTBEAT', 15)
+    resume_limit = getattr(settings, 'JOB_EVENTS_RESUME_LIMIT', 1000)
+    overlap = getattr(settings, 'JOB_EVENTS_REPLAY_OVERLAP', 100)
+    # Live notifications arrive in commit order, not id order, so only
+    # events sent by the replay are skipped
+    replayed = set()
+
+    job_event_listener.start()
+    # Subscribe before replaying so nothing committed in between is lost
+    job_event_listener.subscribe(subscription)
+    try:
+        yield 'retry: 3000\n\n'
+
+        if last_event_id is not None:
+            missed = await sync_to_async(fetch_events_since)(last_event_id, resume_limit, overlap)
+            for event in missed:
+                replayed.add(event['id'])
+                if subscription.matches(event):
+                    yield format_event(event)
+            if sum(event['id'] > last_event_id for event in missed) >= resume_limit:
+                yield 'event: reset\ndata: {}\n\n'
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield 'event: reset\ndata: {}\n\n'
+            if event['id'] in replayed:
+                replayed.discard(event['id'])
+                continue
+            yield format_event(event)
+    finally:
+        job_event_listener.unsubscribe(subscription)
+
+
+@require_http_methods(["GET"])
+@never_cache
+async def job_events(request):
+    """
+    Server-sent events for job creation and status changes.
+    Filters: ?status=RUNNING, ?priority=5 (as on /api/jobs/).
+    Resumes after the Last-Event-ID header (or ?last_event_id=).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'The event stream is only served by the ASGI server'}, status=501)
+    if connection.vendor != 'postgresql':
+        return JsonResponse({'error': 'The event stream requires PostgreSQL'}, status=501)
+
+    status_type = request.GET.get('status') or None
+    if status_type and status_type not in dict(STATUS_CHOICES):
+        return JsonResponse({'error': f'Invalid status: {status_type}'}, status=400)
+    try:
+        priority = int(request.GET['priority']) if request.GET.get('priority') else None
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse({'error': 'priority and Last-Event-ID must be integers'}, status=400)
+
+    subscription = EventSubscription(
+        asyncio.get_running_loop(),
+        status=status_type,
+        priority=priority,
+        queue_size=getattr(settings, 'JOB_EVENTS_QUEUE_SIZE', 1000),
+    )
+
+    response = StreamingHttpResponse(stream_events(subscription, last_event_id), content_type='text/event-stream')
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,61 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+
+class JobSearchFilter(SearchFilter):
+    """
+    ?search= backed by the GIN-indexed `search_vector` column on PostgreSQL
+    (see migration 0006). Every word of the search terms must match the
+    start of a word in the job's name or description, so partial input
+    from the dashboard filter box matches as the user types.
+
+    Results are annotated with `search_rank` (name matches weigh more than
+    description matches) and ordered by it unless ?ordering= is given.
+    Other databases fall back to SearchFilter's icontains lookups on
+    `search_fields`.
+    """
+    search_config = 'simple'
+    rank_annotation = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        # Letters and digits only, split like the tsvector parser splits
+        # (also on underscores); tsquery operators never reach the query
+        words = [
+            word
+            for term in self.get_search_terms(request)
+            for word in re.split(r'[\W_]+', term)
+            if word
+        ]
+        if not words:
+            return queryset
+
+        # 'word:*' is a tsquery prefix match
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            search_type='raw',
+            config=self.search_config,
+        )
+        vector = RawSQL(
+            f'{connection.ops.quote_name(queryset.model._meta.db_table)}.search_vector',
+            [],
+            output_field=SearchVectorField(),
+        )
+        queryset = queryset.alias(search_document=vector).filter(search_document=query).annotate(**{
+            # float8 so the value round-trips exactly through cursor tokens
+            self.rank_annotation: Cast(SearchRank(vector, query), output_field=FloatField()),
+        })
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+            queryset = queryset.order_by(f'-{self.rank_annotation}', *ordering)
+        return queryset
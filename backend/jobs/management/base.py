@@ -0,0 +1,55 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+logger = logging.getLogger('jobs.performance')
+
+
+class PeriodicCommand(BaseCommand, ABC):
+    """
+    Command that runs once, or every --interval seconds with --loop (the
+    background services in docker-compose.prod.yml). Subclasses implement
+    run_once(options) and name their default interval setting.
+    """
+    interval_setting = None
+    default_interval = 60
+    # Used in log and progress messages, e.g. 'job_stats_view refresh'
+    task_name = 'task'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help=f'Keep running and repeat the {self.task_name} periodically',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=getattr(settings, self.interval_setting, self.default_interval),
+            help=f'Seconds between runs with --loop (default: {self.interval_setting})',
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.run_once(options)
+            return
+
+        interval = options['interval']
+        self.stdout.write(f'Running {self.task_name} every {interval}s...')
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once(options)
+            except Exception as e:
+                # Keep the loop alive across transient database errors
+                logger.error(f"{self.task_name} failed: {e}")
+                connection.close()
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    @abstractmethod
+    def run_once(self, options):
+        """Run the task once; errors propagate, and --loop logs them and carries on"""
@@ -0,0 +1,45 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.archive import JobArchiver
+
+logger = logging.getLogger('jobs.performance')
+
+
+class Command(BaseCommand):
+    help = 'Move finished jobs older than a cutoff into compressed JSONL archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'JOB_ARCHIVE_AFTER_DAYS', 90),
+            help='Archive jobs finished more than this many days ago (default: JOB_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000),
+            help='Jobs written and deleted per transaction (default: JOB_BULK_CHUNK_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.monotonic()
+        archiver = JobArchiver(
+            cutoff=timezone.now() - timezone.timedelta(days=options['days']),
+            batch_size=options['batch_size'],
+        )
+        archived = archiver.run()
+
+        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+        if archived:
+            logger.info(f"Archived {archived} jobs to {archiver.archive_file} in {duration_ms}ms")
+            self.stdout.write(self.style.SUCCESS(
+                f'Archived {archived} jobs to {archiver.archive_file} in {duration_ms}ms'
+            ))
+        else:
+            self.stdout.write('No jobs to archive')
@@ -0,0 +1,116 @@
+import json
+import logging
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from jobs.benchmarking import (
+    HTTPTransport, InProcessTransport, build_context, compare_to_baseline, run_scenario, scenarios,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the jobs API: latency percentiles, throughput and SQL queries per request per scenario'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed-jobs',
+            type=int,
+            default=0,
+            help='First replace ALL jobs with this many generated ones (seed_test_data --bulk --clear)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated dataset and request parameters (default: 42)',
+        )
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running server (e.g. http://localhost:8000); default: in-process test client',
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=list(scenarios()),
+            help='Scenario to run; repeat for several (default: all)',
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients (default: 4)')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare against this results JSON and fail on regressions')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed slowdown against the baseline, as a fraction (default: 0.2)',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1')
+
+        if options['seed_jobs']:
+            call_command(
+                'seed_test_data', bulk=True, clear=True, count=options['seed_jobs'], seed=options['seed'],
+                stdout=self.stdout,
+            )
+
+        context = build_context(seed=options['seed'])
+        if not context['job_ids']:
+            raise CommandError('No jobs to benchmark; pass --seed-jobs or run seed_test_data first')
+
+        if options['url']:
+            transport = HTTPTransport(options['url'])
+        else:
+            transport = InProcessTransport()
+            # One INFO line per request would drown the report
+            logging.getLogger('jobs.api').setLevel(logging.WARNING)
+
+        # Measure the endpoints, not cache hits (in-process only; a server
+        # at --url runs with its own settings)
+        with override_settings(JOB_RESPONSE_CACHE_TTLS={}, JOB_COUNT_CACHE_TTL=0):
+            results = self.run_scenarios(transport, context, options)
+
+        if options['output']:
+            output = Path(options['output'])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(results, indent=2) + '\n')
+            self.stdout.write(f"Results written to {output}")
+
+        if options['baseline']:
+            baseline_path = Path(options['baseline'])
+            if not baseline_path.exists():
+                self.stdout.write(self.style.WARNING(
+                    f'No baseline at {baseline_path}; skipping the comparison (save one with --output)'
+                ))
+                return
+            baseline = json.loads(baseline_path.read_text())
+            regressions = compare_to_baseline(results, baseline, options['tolerance'])
+            if regressions:
+                raise CommandError(
+                    f'{len(regressions)} regression(s) against {baseline_path}:\n  ' + '\n  '.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
+
+    def run_scenarios(self, transport, context, options):
+        selected = scenarios()
+        names = options['scenario'] or list(selected)
+        results = {}
+        self.stdout.write(
+            f"{'scenario':20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'queries':>8} {'errors':>7}"
+        )
+        for name in names:
+            result = run_scenario(
+                selected[name], transport, context, options['requests'], options['concurrency'], options['seed'],
+            )
+            results[name] = result
+            queries = result['queries_per_request']
+            self.stdout.write(
+                f"{name:20} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} {result['p99_ms']:9.2f} "
+                f"{result['throughput_rps']:8.1f} {queries if queries is not None else '-':>8} {result['errors']:7}"
+            )
+
+        return results
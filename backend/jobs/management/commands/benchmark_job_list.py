@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from jobs.renderers import FastJSONRenderer, orjson
+from jobs.serializers import JOB_READ_VIEWS, JobReadSerializer, job_read_columns, job_rows_to_representation
+from jobs.views import JobViewSet
+
+
+class Command(BaseCommand):
+    help = 'Compare JobReadSerializer + JSONRenderer with the fast list path on one page of jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Jobs per page (default: 100)')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per variant (default: 50)')
+        parser.add_argument(
+            '--view', choices=JOB_READ_VIEWS, default='full', help='Field set to render (default: full)',
+        )
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        iterations = options['iterations']
+        fields = JOB_READ_VIEWS[options['view']]
+        queryset = JobViewSet.queryset.order_by(*JobViewSet.ordering)
+
+        if not queryset.exists():
+            raise CommandError('No jobs to benchmark; run seed_test_data first')
+
+        def serializer_page():
+            jobs = list(queryset[:page_size])
+            return JSONRenderer().render(JobReadSerializer(jobs, many=True, fields=fields).data)
+
+        def fast_page(renderer_class=FastJSONRenderer):
+            rows = list(queryset.values(*job_read_columns(fields))[:page_size])
+            return renderer_class().render(job_rows_to_representation(rows, fields))
+
+        # Byte-for-byte equality with the serializer is covered by the tests
+        self.stdout.write(f'{len(serializer_page())} bytes for {page_size} jobs')
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer uses the stdlib encoder'))
+
+        results = {
+            'serializer + JSONRenderer': self.time(serializer_page, iterations),
+            'values() + JSONRenderer': self.time(lambda: fast_page(JSONRenderer), iterations),
+            'values() + FastJSONRenderer': self.time(fast_page, iterations),
+        }
+        reference = results['serializer + JSONRenderer']
+        for name, elapsed_ms in results.items():
+            self.stdout.write(f'{name:30} {elapsed_ms:8.2f} ms/page  {reference / elapsed_ms:5.1f}x')
+
+    @staticmethod
+    def time(func, iterations):
+        func()  # warm up
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) * 1000 / iterations
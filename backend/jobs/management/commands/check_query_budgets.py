@@ -0,0 +1,41 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from jobs.models import Job
+from jobs.querystats import check_query_budgets
+
+
+class Command(BaseCommand):
+    help = 'Request each jobs API endpoint once and fail when one exceeds its SQL query budget (QUERY_BUDGETS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-queries', action='store_true', help='Print the query shapes of failures')
+
+    def handle(self, *args, **options):
+        job_id = Job.objects.order_by('-id').values_list('id', flat=True).first()
+        if job_id is None:
+            raise CommandError('No jobs to request; run seed_test_data first')
+
+        # Budgets are for uncached responses. Writes are rolled back, so run
+        # it against any database
+        client = Client(HTTP_HOST='localhost', REMOTE_ADDR='127.0.0.1')
+        logging.getLogger('jobs.api').setLevel(logging.WARNING)
+        with override_settings(JOB_RESPONSE_CACHE_TTLS={}, JOB_COUNT_CACHE_TTL=0), transaction.atomic():
+            results = check_query_budgets(client, job_id)
+            transaction.set_rollback(True)
+
+        failures = 0
+        for name, (queries, budget, failure) in results.items():
+            status = 'ok' if failure is None else 'FAIL'
+            self.stdout.write(f'{name:16} {queries:4d} / {budget:<4d} {status}')
+            if failure is not None:
+                failures += 1
+                self.stdout.write(failure if options['verbose_queries'] else failure.splitlines()[0])
+
+        if failures:
+            raise CommandError(f'{failures} endpoint(s) over their query budget')
+        self.stdout.write(self.style.SUCCESS('All endpoints within their query budgets'))
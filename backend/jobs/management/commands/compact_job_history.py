@@ -0,0 +1,65 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.partitions import is_partitioned, remove_partitions_before
+from jobs.retention import compact_job_history
+
+logger = logging.getLogger('jobs.performance')
+
+
+class Command(BaseCommand):
+    help = 'Compact old job status histories and remove expired jobs_jobstatus partitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'JOB_STATUS_COMPACT_AFTER_DAYS', 30),
+            help='Compact jobs finished more than this many days ago (default: JOB_STATUS_COMPACT_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=getattr(settings, 'JOB_STATUS_RETENTION_DAYS', 0),
+            help=(
+                'Remove partitions entirely older than this many days; 0 keeps them '
+                '(default: JOB_STATUS_RETENTION_DAYS)'
+            ),
+        )
+        parser.add_argument(
+            '--detach',
+            action='store_true',
+            help='Detach expired partitions instead of dropping them',
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.monotonic()
+        now = timezone.now()
+
+        deleted = compact_job_history(
+            now - timezone.timedelta(days=options['days']),
+            batch_size=getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000),
+        )
+        self.stdout.write(f'Deleted {deleted} intermediate status entries')
+
+        removed = []
+        if options['retention_days']:
+            if is_partitioned():
+                removed = remove_partitions_before(
+                    now - timezone.timedelta(days=options['retention_days']),
+                    detach_only=options['detach'],
+                )
+                verb = 'Detached' if options['detach'] else 'Dropped'
+                self.stdout.write(f"{verb} {len(removed)} partitions {', '.join(removed)}".rstrip())
+            else:
+                self.stdout.write('Skipping partition retention: jobs_jobstatus is not partitioned')
+
+        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+        logger.info(
+            f"Compacted job history: {deleted} entries deleted, {len(removed)} partitions removed in {duration_ms}ms"
+        )
+        self.stdout.write(self.style.SUCCESS(f'Compaction finished in {duration_ms}ms'))
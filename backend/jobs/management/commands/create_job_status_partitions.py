@@ -0,0 +1,31 @@
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.partitions import ensure_partitions, is_partitioned
+
+logger = logging.getLogger('jobs.performance')
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions of jobs_jobstatus ahead of time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=getattr(settings, 'JOB_STATUS_PARTITIONS_AHEAD', 3),
+            help='Months past the current one to create (default: JOB_STATUS_PARTITIONS_AHEAD)',
+        )
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError('jobs_jobstatus is only partitioned on PostgreSQL')
+
+        created = ensure_partitions(options['months_ahead'])
+        if created:
+            logger.info(f"Created jobs_jobstatus partitions: {', '.join(created)}")
+            self.stdout.write(self.style.SUCCESS(f"Created {', '.join(created)}"))
+        else:
+            self.stdout.write('All partitions already exist')
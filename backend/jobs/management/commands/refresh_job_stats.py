@@ -0,0 +1,30 @@
+import logging
+import time
+
+from django.core.management.base import CommandError
+from django.db import connection
+
+from jobs.caching import mark_stats_refreshed
+from jobs.management.base import PeriodicCommand
+
+logger = logging.getLogger('jobs.performance')
+
+
+class Command(PeriodicCommand):
+    help = 'Refresh the job_stats_view materialized view used by /api/jobs/stats/'
+    interval_setting = 'JOB_STATS_REFRESH_INTERVAL'
+    task_name = 'job_stats_view refresh'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('job_stats_view is only available on PostgreSQL')
+        super().handle(*args, **options)
+
+    def run_once(self, options):
+        start_time = time.monotonic()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT refresh_job_stats();")
+        mark_stats_refreshed()
+        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+        logger.info(f"Refreshed job_stats_view in {duration_ms}ms")
+        self.stdout.write(self.style.SUCCESS(f'Refreshed job_stats_view in {duration_ms}ms'))
@@ -1,7 +1,13 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
 from django.utils import timezone
+from jobs.caching import bump_jobs_version
 from jobs.models import Job, JobStatus
+from jobs.seeding import DEFAULT_STATUS_MIX, SeedOptions, clear_jobs, parse_status_mix, seed_chunk
+from multiprocessing import Pool
+import django
 import random
+import time
 from datetime import timedelta
 
 
@@ -20,10 +26,57 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for a reproducible dataset',
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Generate jobs in chunks and insert them with COPY / bulk_create (for large datasets)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes inserting chunks with --bulk (PostgreSQL only; default: 1)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Jobs generated and inserted per transaction with --bulk (default: 10000)',
+        )
+        parser.add_argument(
+            '--status-mix',
+            default=','.join(f'{status}={weight}' for status, weight in DEFAULT_STATUS_MIX.items()),
+            help='Relative weights of final statuses with --bulk, e.g. COMPLETED=60,FAILED=20,RUNNING=20',
+        )
+        parser.add_argument(
+            '--history-depth',
+            type=int,
+            default=3,
+            help='Maximum RUNNING progress updates per job with --bulk (default: 3)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Spread job creation over this many past days with --bulk (default: 30)',
+        )
 
     def handle(self, *args, **options):
         count = options['count']
-        
+
+        if options['bulk']:
+            self.handle_bulk(options)
+            return
+
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+
         if options['clear']:
             self.stdout.write('Clearing existing data...')
             Job.objects.all().delete()
@@ -69,11 +122,15 @@ class Command(BaseCommand):
                 priority=random.randint(1, 10),
             )
             
+            # Backdate the job so its whole status progression (at most
+            # 150 minutes) lies in the past; created_at is auto_now_add
+            initial_timestamp = job.created_at - timedelta(minutes=random.randint(150, 24 * 60))
+            Job.objects.filter(pk=job.pk).update(created_at=initial_timestamp)
+            job.created_at = initial_timestamp
+
             # Create initial PENDING status
-            initial_timestamp = job.created_at
-            JobStatus.objects.create(
-                job=job,
-                status_type='PENDING',
+            job.record_status(
+                'PENDING',
                 message='Job created and queued',
                 timestamp=initial_timestamp
             )
@@ -87,9 +144,8 @@ class Command(BaseCommand):
                 current_status = 'RUNNING'
                 current_timestamp += timedelta(minutes=random.randint(1, 30))
                 progress = random.randint(10, 90) if current_status == 'RUNNING' else None
-                JobStatus.objects.create(
-                    job=job,
-                    status_type=current_status,
+                job.record_status(
+                    current_status,
                     message=random.choice(status_messages[current_status]),
                     progress=progress,
                     timestamp=current_timestamp
@@ -100,22 +156,86 @@ class Command(BaseCommand):
                     current_timestamp += timedelta(minutes=random.randint(5, 120))
                     final_progress = 100 if final_status == 'COMPLETED' else None
                     
-                    JobStatus.objects.create(
-                        job=job,
-                        status_type=final_status,
+                    # Terminal statuses also set the job's completion time
+                    job.record_status(
+                        final_status,
                         message=random.choice(status_messages[final_status]),
                         progress=final_progress,
                         timestamp=current_timestamp
                     )
-                    
-                    # Update job completion time for terminal statuses
-                    if final_status in ['COMPLETED', 'FAILED', 'CANCELLED']:
-                        job.completed_at = current_timestamp
-                        job.save()
             
             created_jobs.append(job)
 
         # Create some specific test jobs with known data for reliable testing
+        test_jobs = self.create_test_jobs()
+
+        total_created = len(created_jobs) + len(test_jobs)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully created {total_created} test jobs')
+        )
+        
+        self.print_status_distribution()
+
+    def handle_bulk(self, options):
+        try:
+            status_mix = parse_status_mix(options['status_mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        workers = options['workers']
+        if workers > 1 and connection.vendor != 'postgresql':
+            raise CommandError('--workers needs PostgreSQL; other databases take one writer at a time')
+
+        seed_options = SeedOptions(
+            seed=options['seed'] or 0,
+            chunk_size=options['chunk_size'],
+            status_mix=status_mix,
+            history_depth=options['history_depth'],
+            days=options['days'],
+        )
+        if options['clear']:
+            self.stdout.write('Clearing existing data...')
+            clear_jobs()
+
+        count = options['count']
+        now = timezone.now()
+        chunks = [
+            (seed_options, number, min(seed_options.chunk_size, count - start), now)
+            for number, start in enumerate(range(0, count, seed_options.chunk_size))
+        ]
+        self.stdout.write(f'Creating {count} jobs in {len(chunks)} chunks with {workers} worker(s)...')
+
+        start_time = time.monotonic()
+        total_jobs = total_statuses = 0
+        if workers > 1:
+            # Children must open their own database connections
+            connections.close_all()
+            with Pool(workers, initializer=init_seed_worker) as pool:
+                for jobs, statuses in pool.imap_unordered(run_seed_chunk, chunks):
+                    total_jobs += jobs
+                    total_statuses += statuses
+                    self.report_progress(total_jobs, total_statuses, start_time)
+        else:
+            for chunk in chunks:
+                jobs, statuses = seed_chunk(*chunk)
+                total_jobs += jobs
+                total_statuses += statuses
+                self.report_progress(total_jobs, total_statuses, start_time)
+
+        self.create_test_jobs()
+        # COPY and bulk_create() don't send model signals
+        bump_jobs_version()
+        elapsed = time.monotonic() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {total_jobs} jobs and {total_statuses} status rows in {elapsed:.1f}s '
+            f'({total_statuses / max(elapsed, 0.001):,.0f} status rows/s)'
+        ))
+
+    def report_progress(self, jobs, statuses, start_time):
+        elapsed = time.monotonic() - start_time
+        self.stdout.write(f'  {jobs} jobs, {statuses} status rows ({elapsed:.1f}s)')
+
+    def create_test_jobs(self):
+        """Jobs with known data that the E2E tests rely on"""
         test_jobs = [
             {
                 'name': 'Test Job for Automation',
@@ -146,42 +266,31 @@ class Command(BaseCommand):
                 priority=test_job_data['priority'],
             )
             
-            status_data = {
-                'job': job,
-                'status_type': test_job_data['status'],
-                'message': f"Test job in {test_job_data['status'].lower()} state",
-                'timestamp': timezone.now()
-            }
-            
-            if 'progress' in test_job_data:
-                status_data['progress'] = test_job_data['progress']
-                
-            JobStatus.objects.create(**status_data)
-            
-            if test_job_data['status'] in ['COMPLETED', 'FAILED', 'CANCELLED']:
-                job.completed_at = timezone.now()
-                job.save()
+            job.record_status(
+                test_job_data['status'],
+                message=f"Test job in {test_job_data['status'].lower()} state",
+                progress=test_job_data.get('progress'),
+                timestamp=timezone.now()
+            )
+        return test_jobs
 
-        total_created = len(created_jobs) + len(test_jobs)
-        self.stdout.write(
-            self.style.SUCCESS(f'Successfully created {total_created} test jobs')
-        )
-        
-        # Print statistics
-        status_counts = {}
-        for status, _ in JobStatus.STATUS_CHOICES:
-            count = Job.objects.filter(
-                statuses__status_type=status,
-                statuses__timestamp=Job.objects.filter(pk=job.pk).aggregate(
-                    latest=models.Max('statuses__timestamp')
-                )['latest']
-            ).distinct().count()
-            if count > 0:
-                status_counts[status] = count
+    def print_status_distribution(self):
+        # Print statistics (current status of every job)
+        status_counts = Job.objects.values('current_status').annotate(
+            count=models.Count('id')
+        ).order_by('current_status')
         
         self.stdout.write('\nStatus distribution:')
-        for status, count in status_counts.items():
-            self.stdout.write(f'  {status}: {count} jobs')
+        for row in status_counts:
+            self.stdout.write(f"  {row['current_status']}: {row['count']} jobs")
+
+
+def init_seed_worker():
+    django.setup()
+
+
+def run_seed_chunk(chunk):
+    return seed_chunk(*chunk)
 
 
 # Import models at the end to avoid circular import issues
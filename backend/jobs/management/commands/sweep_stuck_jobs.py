@@ -0,0 +1,30 @@
+from jobs.management.base import PeriodicCommand
+from jobs.sweeper import StuckJobSweeper
+
+
+class Command(PeriodicCommand):
+    help = 'Fail RUNNING jobs that have not reported a status update within their timeout'
+    interval_setting = 'JOB_SWEEP_INTERVAL'
+    default_interval = 300
+    task_name = 'stuck job sweep'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report stuck jobs without changing them',
+        )
+
+    def handle(self, *args, **options):
+        self.sweeper = StuckJobSweeper()
+        super().handle(*args, **options)
+
+    def run_once(self, options):
+        dry_run = options['dry_run']
+        summary = self.sweeper.sweep(dry_run=dry_run)
+        verb = 'Found' if dry_run else 'Failed'
+        count = summary['found'] if dry_run else summary['failed']
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {count} stuck jobs in {summary['duration_ms']}ms"
+        ))
@@ -0,0 +1,101 @@
+"""
+Prometheus metrics for the jobs API.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) every worker
+writes its samples to mmap-backed files in that directory and the
+exposition view merges them, so scrapes see totals across all workers
+rather than whichever worker happened to answer. The variable must be set
+before prometheus_client is first imported.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+
+# Buckets in seconds; finer at the low end where most API requests land
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'jobs_http_request_duration_seconds',
+    'HTTP request latency by resolved route',
+    ['route', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_TOTAL = Counter(
+    'jobs_http_requests',
+    'HTTP requests by resolved route',
+    ['route', 'method', 'status'],
+)
+DB_QUERY_TIME = Histogram(
+    'jobs_db_query_duration_seconds',
+    'Total time spent in database queries per request',
+    ['route'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES_TOTAL = Counter(
+    'jobs_db_queries',
+    'Database queries executed by resolved route',
+    ['route'],
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    'jobs_cache_requests',
+    'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper() hook that accumulates the number of
+    queries and the time spent executing them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start_time = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start_time
+            self.count += 1
+
+
+def get_route(request):
+    """
+    Low-cardinality label for the request: the URL pattern name it resolved
+    to (e.g. job-list, job-detail), never the raw path.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unnamed'
+
+
+def observe_request(route, method, status, duration, query_timer=None):
+    labels = {'route': route, 'method': method, 'status': str(status)}
+    REQUEST_LATENCY.labels(**labels).observe(duration)
+    REQUESTS_TOTAL.labels(**labels).inc()
+    if query_timer is not None:
+        DB_QUERY_TIME.labels(route=route).observe(query_timer.duration)
+        DB_QUERIES_TOTAL.labels(route=route).inc(query_timer.count)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_REQUESTS_TOTAL.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+def render_metrics():
+    """Return (payload, content_type) in the Prometheus text format"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
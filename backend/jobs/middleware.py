@@ -1,15 +1,33 @@
 import time
-from collections import defaultdict, deque
+from collections import namedtuple
 from django.http import JsonResponse
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import connection
 import hashlib
 import ipaddress
+import redis
+
+from .metrics import QueryTimer, get_route, observe_request
+from .querystats import QueryStats
+
+
+RateLimitState = namedtuple('RateLimitState', ['allowed', 'limit', 'remaining', 'reset', 'window'])
 
 
 class RateLimitMiddleware:
     """
-    Simple rate limiting middleware using Django cache
+    Sliding-window-counter rate limiting on the Django cache.
+
+    Each client keeps one counter per fixed window. The request rate is
+    estimated as the current window's count plus the previous window's
+    count weighted by how much of it still overlaps the sliding window.
+    Counters are bumped with an atomic incr, so the limit is shared by every
+    worker when the cache is shared (Redis). On the Redis backend the
+    increment and the read of the previous window go out in one pipelined
+    round trip. Other backends usually take one: the incr, with the closed
+    previous window's count read once per process and remembered.
     """
     
     def __init__(self, get_response):
@@ -24,6 +42,12 @@ class RateLimitMiddleware:
         
         # Exempt IPs (can be configured via settings)
         self.exempt_ips = getattr(settings, 'RATE_LIMIT_EXEMPT_IPS', ['127.0.0.1', '::1'])
+        
+        # Created on first use when the default cache is Redis
+        self.redis_client = None
+        
+        # window length -> (window index, {previous window key: count})
+        self.previous_counts = {}
 
     def __call__(self, request):
         # Skip rate limiting for exempt IPs
@@ -42,13 +66,14 @@ class RateLimitMiddleware:
         limit_config = self.rate_limits.get(rate_limit_key, self.rate_limits['read'])
         
         # Check rate limit
-        if not self.is_allowed(client_ip, rate_limit_key, limit_config):
-            return self.rate_limit_response(limit_config)
+        state = self.is_allowed(client_ip, rate_limit_key, limit_config)
+        if not state.allowed:
+            return self.add_rate_limit_headers(self.rate_limit_response(limit_config, state), state)
         
         response = self.get_response(request)
         
-        # Add rate limit headers to response
-        self.add_rate_limit_headers(response, client_ip, rate_limit_key, limit_config)
+        # Add rate limit headers from the same state that allowed the request
+        self.add_rate_limit_headers(response, state)
         
         return response
     
@@ -81,61 +106,106 @@ class RateLimitMiddleware:
         else:
             return 'read'
     
-    def get_cache_key(self, client_ip, category):
-        """Generate cache key for rate limiting"""
+    def get_cache_key(self, client_ip, category, window_index):
+        """Generate cache key for one client's counter in one fixed window"""
         key_data = f"rate_limit:{client_ip}:{category}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return f"{hashlib.md5(key_data.encode()).hexdigest()}:{window_index}"
     
     def is_allowed(self, client_ip, category, limit_config):
-        """Check if request is allowed based on rate limit"""
-        cache_key = self.get_cache_key(client_ip, category)
-        current_time = int(time.time())
-        window_start = current_time - limit_config['window']
-        
-        # Get current request timestamps from cache
-        request_times = cache.get(cache_key, [])
-        
-        # Remove old requests outside the window
-        request_times = [t for t in request_times if t > window_start]
+        """Count this request and decide whether it is within the rate limit"""
+        window = limit_config['window']
+        now = time.time()
+        window_index = int(now // window)
+        current_key = self.get_cache_key(client_ip, category, window_index)
+        previous_key = self.get_cache_key(client_ip, category, window_index - 1)
         
-        # Check if we're under the limit
-        if len(request_times) >= limit_config['requests']:
-            return False
+        current_count, previous_count = self.increment(current_key, previous_key, window, window_index)
         
-        # Add current request time
-        request_times.append(current_time)
+        elapsed_fraction = (now - window_index * window) / window
+        estimated = previous_count * (1 - elapsed_fraction) + current_count
         
-        # Update cache with new timestamps
-        cache.set(cache_key, request_times, limit_config['window'] + 10)  # Small buffer
+        return RateLimitState(
+            allowed=estimated <= limit_config['requests'],
+            limit=limit_config['requests'],
+            remaining=max(0, int(limit_config['requests'] - estimated)),
+            reset=(window_index + 1) * window,
+            window=window,
+        )
+    
+    def increment(self, current_key, previous_key, window, window_index):
+        """Atomically increment the current counter and read the previous one"""
+        # Counters must outlive the following window, where they are read as "previous"
+        timeout = window * 2
+        client = self.get_redis_client()
+        if client is not None:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.incr(cache.make_and_validate_key(current_key))
+            pipeline.expire(cache.make_and_validate_key(current_key), timeout)
+            pipeline.get(cache.make_and_validate_key(previous_key))
+            current_count, _, previous_count = pipeline.execute()
+            return int(current_count), int(previous_count or 0)
         
-        return True
+        # Generic cache backends: incr() is atomic but fails on a missing key,
+        # which only happens on the client's first request in the window
+        try:
+            current_count = cache.incr(current_key)
+        except ValueError:
+            if cache.add(current_key, 1, timeout):
+                current_count = 1
+            else:
+                # Another worker created it first
+                current_count = cache.incr(current_key)
+        return current_count, self.get_previous_count(previous_key, window, window_index)
+    
+    def get_previous_count(self, previous_key, window, window_index):
+        """
+        Count of the client's previous window. Nothing increments a closed
+        window any more, so each process reads it from the cache once and
+        keeps it until the window moves on.
+        """
+        current_window, counts = self.previous_counts.get(window, (None, None))
+        if current_window != window_index:
+            counts = {}
+            self.previous_counts[window] = (window_index, counts)
+        if previous_key not in counts:
+            counts[previous_key] = cache.get(previous_key, 0)
+        return counts[previous_key]
     
-    def add_rate_limit_headers(self, response, client_ip, category, limit_config):
+    def get_redis_client(self):
+        """
+        redis-py client for the default cache's Redis server, or None for
+        other backends (which take the generic cache path). Built from the
+        cache's configured location, not from RedisCache internals.
+        """
+        if not isinstance(caches['default'], RedisCache):
+            return None
+        if self.redis_client is None:
+            location = settings.CACHES['default']['LOCATION']
+            # RedisCache accepts a list or comma-separated servers; the first is the writer
+            if isinstance(location, str):
+                location = location.split(',')
+            self.redis_client = redis.Redis.from_url(location[0])
+        return self.redis_client
+    
+    def add_rate_limit_headers(self, response, state):
         """Add rate limit information to response headers"""
-        cache_key = self.get_cache_key(client_ip, category)
-        current_time = int(time.time())
-        window_start = current_time - limit_config['window']
-        
-        request_times = cache.get(cache_key, [])
-        request_times = [t for t in request_times if t > window_start]
-        
-        remaining = max(0, limit_config['requests'] - len(request_times))
-        reset_time = window_start + limit_config['window']
-        
-        response['X-RateLimit-Limit'] = str(limit_config['requests'])
-        response['X-RateLimit-Remaining'] = str(remaining)
-        response['X-RateLimit-Reset'] = str(reset_time)
-        response['X-RateLimit-Window'] = str(limit_config['window'])
+        response['X-RateLimit-Limit'] = str(state.limit)
+        response['X-RateLimit-Remaining'] = str(state.remaining)
+        response['X-RateLimit-Reset'] = str(state.reset)
+        response['X-RateLimit-Window'] = str(state.window)
         
         return response
     
-    def rate_limit_response(self, limit_config):
+    def rate_limit_response(self, limit_config, state):
         """Return rate limit exceeded response"""
-        return JsonResponse({
+        retry_after = max(1, int(state.reset - time.time()))
+        response = JsonResponse({
             'error': 'Rate limit exceeded',
             'message': f'Too many requests. Limit: {limit_config["requests"]} per {limit_config["window"]} seconds',
-            'retry_after': limit_config['window']
+            'retry_after': retry_after
         }, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
 
 
 class RequestLoggingMiddleware:
@@ -145,29 +215,43 @@ class RequestLoggingMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        # Opt-in: per-shape query counts, X-DB-* headers and N+1 warnings
+        self.sql_instrumentation = getattr(settings, 'JOB_SQL_INSTRUMENTATION', False)
+        self.repeat_threshold = getattr(settings, 'JOB_SQL_REPEAT_THRESHOLD', 5)
 
     def __call__(self, request):
-        # Skip logging for non-API endpoints
-        if not request.path.startswith('/api/'):
-            return self.get_response(request)
-            
         start_time = time.time()
         
-        # Process request
-        response = self.get_response(request)
+        # Process request, timing every query it runs
+        query_timer = QueryStats() if self.sql_instrumentation else QueryTimer()
+        with connection.execute_wrapper(query_timer):
+            response = self.get_response(request)
         
         # Calculate request duration
         duration = time.time() - start_time
         
+        # Record Prometheus metrics for every route except the scrape itself
+        route = get_route(request)
+        if route != 'prometheus_metrics':
+            observe_request(route, request.method, response.status_code, duration, query_timer)
+        
+        # Skip logging for non-API endpoints
+        if not request.path.startswith('/api/'):
+            return response
+        
         # Log request details
-        self.log_request(request, response, duration)
+        self.log_request(request, response, duration, query_timer)
         
         # Add performance headers
         response['X-Response-Time'] = f"{duration:.3f}s"
+        if self.sql_instrumentation:
+            response['X-DB-Queries'] = str(query_timer.count)
+            response['X-DB-Time'] = f"{query_timer.duration * 1000:.2f}ms"
+            self.warn_repeated_queries(request, query_timer)
         
         return response
     
-    def log_request(self, request, response, duration):
+    def log_request(self, request, response, duration, query_timer):
         """Log request details"""
         import logging
         
@@ -181,6 +265,8 @@ class RequestLoggingMiddleware:
             'path': request.path,
             'status_code': response.status_code,
             'duration_ms': round(duration * 1000, 2),
+            'db_queries': query_timer.count,
+            'db_time_ms': round(query_timer.duration * 1000, 2),
             'client_ip': client_ip,
             'user_agent': user_agent[:100],  # Truncate user agent
             'query_params': dict(request.GET),
@@ -192,6 +278,18 @@ class RequestLoggingMiddleware:
         else:
             logger.info(f"API Request: {log_data}")
     
+    def warn_repeated_queries(self, request, query_stats):
+        """Warn about query shapes repeated often enough to be an N+1"""
+        import logging
+        
+        logger = logging.getLogger('jobs.performance')
+        
+        for shape, count, shape_duration in query_stats.repeated_shapes(self.repeat_threshold):
+            logger.warning(
+                f"Repeated query: {count} x in {request.method} {request.path} "
+                f"({shape_duration * 1000:.1f}ms): {shape[:300]}"
+            )
+    
     def get_client_ip(self, request):
         """Get client IP address from request"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_completed_at_job_description_job_error_message_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='current_message',
+            field=models.TextField(blank=True, help_text='Latest status message'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='current_progress',
+            field=models.IntegerField(blank=True, help_text='Latest progress percentage', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='current_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], help_text='Latest status type', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='current_status_entry_id',
+            field=models.BigIntegerField(blank=True, help_text='ID of the latest JobStatus row', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, help_text='When the latest status was recorded', null=True),
+        ),
+        migrations.AlterField(
+            model_name='jobstatus',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['current_status', 'status_changed_at'], name='jobs_job_current_a50a79_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+BACKFILL_SQL = """
+    UPDATE jobs_job AS j
+    SET current_status = s.status_type,
+        current_progress = s.progress,
+        current_message = s.message,
+        current_status_entry_id = s.id,
+        status_changed_at = s.timestamp
+    FROM (
+        SELECT DISTINCT ON (job_id) id, job_id, status_type, progress, message, timestamp
+        FROM jobs_jobstatus
+        ORDER BY job_id, timestamp DESC, id DESC
+    ) AS s
+    WHERE s.job_id = j.id;
+"""
+
+
+def backfill_current_status(apps, schema_editor):
+    """Copy each job's latest JobStatus onto its current_* columns"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(BACKFILL_SQL)
+        return
+
+    Job = apps.get_model('jobs', 'Job')
+    JobStatus = apps.get_model('jobs', 'JobStatus')
+    for job in Job.objects.iterator(chunk_size=1000):
+        latest = JobStatus.objects.filter(job=job).order_by('-timestamp', '-id').first()
+        if latest:
+            Job.objects.filter(pk=job.pk).update(
+                current_status=latest.status_type,
+                current_progress=latest.progress,
+                current_message=latest.message,
+                current_status_entry_id=latest.pk,
+                status_changed_at=latest.timestamp,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_current_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_current_status, migrations.RunPython.noop),
+    ]
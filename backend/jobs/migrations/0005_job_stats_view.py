@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+CREATE_SQL = """
+    CREATE MATERIALIZED VIEW job_stats_view AS
+    SELECT
+        1 AS id,
+        NOW() AS last_updated,
+        COUNT(*) AS total_jobs,
+        COUNT(*) FILTER (WHERE current_status = 'PENDING') AS pending_jobs,
+        COUNT(*) FILTER (WHERE current_status = 'RUNNING') AS running_jobs,
+        COUNT(*) FILTER (WHERE current_status = 'COMPLETED') AS completed_jobs,
+        COUNT(*) FILTER (WHERE current_status = 'FAILED') AS failed_jobs,
+        COUNT(*) FILTER (WHERE current_status = 'CANCELLED') AS cancelled_jobs,
+        COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') AS recent_jobs,
+        ROUND((AVG(EXTRACT(EPOCH FROM (completed_at - created_at))) FILTER (
+            WHERE completed_at IS NOT NULL
+        ) / 60)::numeric, 2) AS avg_completion_time_minutes,
+        (
+            SELECT COALESCE(jsonb_object_agg(priority, priority_count), '{}'::jsonb)
+            FROM (
+                SELECT priority, COUNT(*) AS priority_count
+                FROM jobs_job
+                GROUP BY priority
+            ) AS priorities
+        ) AS priority_distribution
+    FROM jobs_job;
+
+    -- A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    CREATE UNIQUE INDEX job_stats_view_id_idx ON job_stats_view (id);
+
+    CREATE OR REPLACE FUNCTION refresh_job_stats() RETURNS void
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        REFRESH MATERIALIZED VIEW CONCURRENTLY job_stats_view;
+    END;
+    $$;
+"""
+
+DROP_SQL = """
+    DROP FUNCTION IF EXISTS refresh_job_stats();
+    DROP MATERIALIZED VIEW IF EXISTS job_stats_view;
+"""
+
+
+def create_job_stats_view(apps, schema_editor):
+    # Materialized views are PostgreSQL-only; other backends use the
+    # fallback queries in JobViewSet.stats
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_job_stats_view(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_backfill_job_current_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_job_stats_view, drop_job_stats_view),
+    ]
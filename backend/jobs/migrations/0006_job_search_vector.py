@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+CREATE_SQL = """
+    ALTER TABLE jobs_job ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED;
+
+    CREATE INDEX jobs_job_search_vector_idx ON jobs_job USING GIN (search_vector);
+"""
+
+DROP_SQL = """
+    DROP INDEX IF EXISTS jobs_job_search_vector_idx;
+    ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+def create_search_vector(apps, schema_editor):
+    # Generated tsvector column used by JobSearchFilter; other databases fall
+    # back to SearchFilter's icontains lookups
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_stats_view'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,157 @@
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+
+# Monthly partitions created past the newest existing row; the
+# create_job_status_partitions command keeps this horizon moving.
+MONTHS_AHEAD = 3
+
+
+def month_starts(first, last):
+    """First instant (UTC) of every month from first to last inclusive"""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield datetime(year, month, 1, tzinfo=timezone.utc)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def get_secondary_indexes(cursor, table):
+    """(name, CREATE INDEX statement) for every index except the primary key"""
+    cursor.execute("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = %s::regclass AND NOT x.indisprimary
+    """, [table])
+    return [(name, definition.replace(' ON ONLY ', ' ON ')) for name, definition in cursor.fetchall()]
+
+
+def get_foreign_key(cursor, table):
+    cursor.execute("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+    """, [table])
+    return cursor.fetchone()
+
+
+def add_foreign_key_after_load(schema_editor, fk_name, fk_definition):
+    """
+    Added after the load: inserting under a deferred FK leaves pending
+    trigger events, and PostgreSQL refuses CREATE INDEX while any exist
+    """
+    schema_editor.execute(f"ALTER TABLE jobs_jobstatus ADD CONSTRAINT {fk_name} {fk_definition}")
+
+
+def partition_jobstatus(apps, schema_editor):
+    """
+    Rebuild jobs_jobstatus as a table range-partitioned by month on
+    timestamp. PostgreSQL requires the partition key in the primary key, so
+    it becomes (id, timestamp); ids still come from one sequence and stay
+    unique. Rows outside every monthly range land in jobs_jobstatus_default.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        indexes = get_secondary_indexes(cursor, 'jobs_jobstatus')
+        fk_name, fk_definition = get_foreign_key(cursor, 'jobs_jobstatus')
+        cursor.execute("SELECT min(timestamp), max(timestamp), max(id) FROM jobs_jobstatus")
+        oldest, newest, max_id = cursor.fetchone()
+
+    now = datetime.now(timezone.utc)
+    first = min(oldest or now, now)
+    last = add_months(max(newest or now, now), MONTHS_AHEAD)
+
+    schema_editor.execute("ALTER TABLE jobs_jobstatus RENAME TO jobs_jobstatus_old")
+    schema_editor.execute("ALTER TABLE jobs_jobstatus_old RENAME CONSTRAINT jobs_jobstatus_pkey TO jobs_jobstatus_old_pkey")
+    # Identity columns aren't allowed on partitioned tables before PostgreSQL 17
+    schema_editor.execute("ALTER TABLE jobs_jobstatus_old ALTER COLUMN id DROP IDENTITY IF EXISTS")
+    schema_editor.execute("DROP SEQUENCE IF EXISTS jobs_jobstatus_id_seq")
+    schema_editor.execute("CREATE SEQUENCE jobs_jobstatus_id_seq")
+    schema_editor.execute("""
+        CREATE TABLE jobs_jobstatus (
+            id bigint NOT NULL DEFAULT nextval('jobs_jobstatus_id_seq'),
+            status_type varchar(20) NOT NULL,
+            "timestamp" timestamp with time zone NOT NULL,
+            job_id bigint NOT NULL,
+            message text NOT NULL,
+            progress integer NULL,
+            CONSTRAINT jobs_jobstatus_pkey PRIMARY KEY (id, "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    schema_editor.execute("ALTER SEQUENCE jobs_jobstatus_id_seq OWNED BY jobs_jobstatus.id")
+
+    for start in month_starts(first, last):
+        schema_editor.execute(
+            f"CREATE TABLE jobs_jobstatus_p{start:%Y_%m} PARTITION OF jobs_jobstatus "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+        )
+    schema_editor.execute("CREATE TABLE jobs_jobstatus_default PARTITION OF jobs_jobstatus DEFAULT")
+
+    schema_editor.execute("""
+        INSERT INTO jobs_jobstatus (id, status_type, "timestamp", job_id, message, progress)
+        SELECT id, status_type, "timestamp", job_id, message, progress FROM jobs_jobstatus_old
+    """)
+    schema_editor.execute("SELECT setval('jobs_jobstatus_id_seq', %s, false)", [(max_id or 0) + 1])
+    schema_editor.execute("DROP TABLE jobs_jobstatus_old")
+
+    for _, definition in indexes:
+        schema_editor.execute(definition)
+
+    add_foreign_key_after_load(schema_editor, fk_name, fk_definition)
+
+
+def unpartition_jobstatus(apps, schema_editor):
+    """Rebuild jobs_jobstatus as a plain table with an identity primary key"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        indexes = get_secondary_indexes(cursor, 'jobs_jobstatus')
+        fk_name, fk_definition = get_foreign_key(cursor, 'jobs_jobstatus')
+
+    schema_editor.execute("ALTER TABLE jobs_jobstatus RENAME TO jobs_jobstatus_partitioned")
+    schema_editor.execute("ALTER TABLE jobs_jobstatus_partitioned RENAME CONSTRAINT jobs_jobstatus_pkey TO jobs_jobstatus_partitioned_pkey")
+    schema_editor.execute("ALTER SEQUENCE jobs_jobstatus_id_seq RENAME TO jobs_jobstatus_partitioned_id_seq")
+    schema_editor.execute("""
+        CREATE TABLE jobs_jobstatus (
+            id bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            status_type varchar(20) NOT NULL,
+            "timestamp" timestamp with time zone NOT NULL,
+            job_id bigint NOT NULL,
+            message text NOT NULL,
+            progress integer NULL
+        )
+    """)
+    schema_editor.execute("""
+        INSERT INTO jobs_jobstatus (id, status_type, "timestamp", job_id, message, progress)
+        SELECT id, status_type, "timestamp", job_id, message, progress FROM jobs_jobstatus_partitioned
+    """)
+    schema_editor.execute("""
+        SELECT setval(pg_get_serial_sequence('jobs_jobstatus', 'id'),
+                      COALESCE((SELECT max(id) FROM jobs_jobstatus), 0) + 1, false)
+    """)
+    schema_editor.execute("DROP TABLE jobs_jobstatus_partitioned CASCADE")
+
+    for _, definition in indexes:
+        schema_editor.execute(definition)
+
+    add_foreign_key_after_load(schema_editor, fk_name, fk_definition)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_jobstatus, unpartition_jobstatus),
+    ]
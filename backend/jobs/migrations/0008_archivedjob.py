@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:42
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_partition_jobstatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('job_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archive_file', models.CharField(help_text='Archive file path relative to JOB_ARCHIVE_DIR', max_length=255)),
+                ('offset', models.BigIntegerField(help_text='Byte offset of the gzip block holding the job')),
+                ('length', models.IntegerField(help_text='Compressed length of the block in bytes')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
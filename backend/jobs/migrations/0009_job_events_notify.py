@@ -0,0 +1,74 @@
+from django.db import migrations
+
+
+# One event per JobStatus row. A job's first status is its creation, so the
+# PENDING entry written with every new job is reported as job_created. The
+# same function builds live NOTIFY payloads and Last-Event-ID replays.
+CREATE_EVENTS_SQL = """
+    CREATE OR REPLACE FUNCTION jobs_status_event(
+        p_id bigint, p_job_id bigint, p_status varchar, p_progress integer,
+        p_message text, p_timestamp timestamp with time zone
+    ) RETURNS jsonb AS $$
+        SELECT jsonb_build_object(
+            'id', p_id,
+            'event', CASE
+                WHEN p_status = 'PENDING' AND NOT EXISTS (
+                    SELECT 1 FROM jobs_jobstatus e WHERE e.job_id = p_job_id AND e.id < p_id
+                ) THEN 'job_created'
+                ELSE 'status_changed'
+            END,
+            'job_id', p_job_id,
+            'name', j.name,
+            'priority', j.priority,
+            'status', p_status,
+            'progress', p_progress,
+            'message', left(p_message, 500),
+            'timestamp', p_timestamp
+        )
+        FROM jobs_job j
+        WHERE j.id = p_job_id;
+    $$ LANGUAGE sql STABLE;
+
+    CREATE OR REPLACE FUNCTION jobs_notify_status_event() RETURNS trigger AS $$
+    DECLARE
+        payload jsonb;
+    BEGIN
+        payload := jobs_status_event(NEW.id, NEW.job_id, NEW.status_type, NEW.progress, NEW.message, NEW."timestamp");
+        IF payload IS NOT NULL THEN
+            PERFORM pg_notify('jobs_events', payload::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER jobs_jobstatus_notify
+        AFTER INSERT ON jobs_jobstatus
+        FOR EACH ROW EXECUTE FUNCTION jobs_notify_status_event();
+"""
+
+DROP_EVENTS_SQL = """
+    DROP TRIGGER IF EXISTS jobs_jobstatus_notify ON jobs_jobstatus;
+    DROP FUNCTION IF EXISTS jobs_notify_status_event();
+    DROP FUNCTION IF EXISTS jobs_status_event(bigint, bigint, varchar, integer, text, timestamp with time zone);
+"""
+
+
+def create_job_events(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_EVENTS_SQL)
+
+
+def drop_job_events(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_EVENTS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_archivedjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_job_events, drop_job_events),
+    ]
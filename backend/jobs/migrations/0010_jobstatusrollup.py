@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_events_notify'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('status_type', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('priority', models.IntegerField()),
+                ('count', models.IntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobstatus',
+            index=models.Index(fields=['timestamp'], name='jobs_jobsta_timesta_baafa8_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobstatusrollup',
+            constraint=models.UniqueConstraint(fields=('bucket_start', 'status_type', 'priority'), name='jobs_rollup_bucket_unique'),
+        ),
+    ]
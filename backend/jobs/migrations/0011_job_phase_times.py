@@ -0,0 +1,78 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:54
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+# Each status lasts until the job's next one (LEAD over its history); sum
+# those spans per phase. The current status is still open and not counted.
+BACKFILL_SQL = """
+    UPDATE jobs_job AS j
+    SET queue_time = p.queue_time,
+        run_time = p.run_time,
+        retry_gap_time = p.retry_gap_time
+    FROM (
+        SELECT job_id,
+               SUM(next_timestamp - timestamp) FILTER (WHERE status_type = 'PENDING') AS queue_time,
+               SUM(next_timestamp - timestamp) FILTER (WHERE status_type = 'RUNNING') AS run_time,
+               SUM(next_timestamp - timestamp) FILTER (WHERE status_type = 'FAILED') AS retry_gap_time
+        FROM (
+            SELECT job_id, status_type, timestamp,
+                   LEAD(timestamp) OVER (PARTITION BY job_id ORDER BY timestamp, id) AS next_timestamp
+            FROM jobs_jobstatus
+        ) AS s
+        WHERE next_timestamp IS NOT NULL
+        GROUP BY job_id
+    ) AS p
+    WHERE p.job_id = j.id;
+"""
+
+PHASE_FIELDS = {'PENDING': 'queue_time', 'RUNNING': 'run_time', 'FAILED': 'retry_gap_time'}
+
+
+def backfill_phase_times(apps, schema_editor):
+    """Derive the phase columns from each job's existing status history"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(BACKFILL_SQL)
+        return
+
+    Job = apps.get_model('jobs', 'Job')
+    JobStatus = apps.get_model('jobs', 'JobStatus')
+    for job_id in Job.objects.values_list('id', flat=True).iterator(chunk_size=1000):
+        history = list(
+            JobStatus.objects.filter(job_id=job_id).order_by('timestamp', 'id').values_list('status_type', 'timestamp')
+        )
+        totals = {}
+        for (status_type, started), (_, ended) in zip(history, history[1:]):
+            if status_type in PHASE_FIELDS:
+                field = PHASE_FIELDS[status_type]
+                totals[field] = totals.get(field, timedelta(0)) + (ended - started)
+        if totals:
+            Job.objects.filter(pk=job_id).update(**totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_jobstatusrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='queue_time',
+            field=models.DurationField(blank=True, help_text='Total time spent PENDING', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='retry_gap_time',
+            field=models.DurationField(blank=True, help_text='Total time between failing and being retried', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='run_time',
+            field=models.DurationField(blank=True, help_text='Total time spent RUNNING', null=True),
+        ),
+        migrations.RunPython(backfill_phase_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+# Bulk loads (seed_test_data --bulk) run SET LOCAL jobs.suppress_events = 'on'
+# so that millions of rows don't each queue a NOTIFY
+NOTIFY_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION jobs_notify_status_event() RETURNS trigger AS $$
+    DECLARE
+        payload jsonb;
+    BEGIN
+        {guard}
+        payload := jobs_status_event(NEW.id, NEW.job_id, NEW.status_type, NEW.progress, NEW.message, NEW."timestamp");
+        IF payload IS NOT NULL THEN
+            PERFORM pg_notify('jobs_events', payload::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+SUPPRESS_GUARD = """IF current_setting('jobs.suppress_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;"""
+
+
+def add_suppress_guard(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(NOTIFY_FUNCTION_SQL.replace('{guard}', SUPPRESS_GUARD))
+
+
+def remove_suppress_guard(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(NOTIFY_FUNCTION_SQL.replace('{guard}', ''))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_phase_times'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_suppress_guard, remove_suppress_guard),
+    ]
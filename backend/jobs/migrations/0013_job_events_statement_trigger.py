@@ -0,0 +1,111 @@
+from django.db import migrations
+
+
+# One trigger call per INSERT (or COPY) statement instead of per row. The
+# statement's rows are read from the `inserted` transition table in a single
+# set-based query. Statements of up to BULK_EVENT_THRESHOLD rows notify one
+# event per row as before; larger ones (bulk creates, bulk status updates)
+# notify a single `reset` event telling clients to refetch.
+BULK_EVENT_THRESHOLD = 100
+
+CREATE_TRIGGER_SQL = f"""
+    CREATE OR REPLACE FUNCTION jobs_notify_status_events() RETURNS trigger AS $$
+    DECLARE
+        inserted_count integer;
+    BEGIN
+        IF current_setting('jobs.suppress_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+
+        SELECT count(*) INTO inserted_count FROM inserted;
+        IF inserted_count = 0 THEN
+            RETURN NULL;
+        END IF;
+
+        IF inserted_count > {BULK_EVENT_THRESHOLD} THEN
+            PERFORM pg_notify('jobs_events', jsonb_build_object(
+                'id', max(id),
+                'event', 'reset',
+                'count', count(*),
+                'timestamp', max("timestamp")
+            )::text)
+            FROM inserted;
+            RETURN NULL;
+        END IF;
+
+        PERFORM pg_notify('jobs_events', jsonb_build_object(
+            'id', n.id,
+            'event', CASE
+                WHEN n.status_type = 'PENDING' AND NOT EXISTS (
+                    SELECT 1 FROM jobs_jobstatus e WHERE e.job_id = n.job_id AND e.id < n.id
+                ) THEN 'job_created'
+                ELSE 'status_changed'
+            END,
+            'job_id', n.job_id,
+            'name', j.name,
+            'priority', j.priority,
+            'status', n.status_type,
+            'progress', n.progress,
+            'message', left(n.message, 500),
+            'timestamp', n."timestamp"
+        )::text)
+        FROM (SELECT * FROM inserted ORDER BY id) AS n
+        JOIN jobs_job j ON j.id = n.job_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS jobs_jobstatus_notify ON jobs_jobstatus;
+    DROP FUNCTION IF EXISTS jobs_notify_status_event();
+
+    CREATE TRIGGER jobs_jobstatus_notify
+        AFTER INSERT ON jobs_jobstatus
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION jobs_notify_status_events();
+"""
+
+# The per-row trigger as left by migration 0012
+DROP_TRIGGER_SQL = """
+    DROP TRIGGER IF EXISTS jobs_jobstatus_notify ON jobs_jobstatus;
+    DROP FUNCTION IF EXISTS jobs_notify_status_events();
+
+    CREATE OR REPLACE FUNCTION jobs_notify_status_event() RETURNS trigger AS $$
+    DECLARE
+        payload jsonb;
+    BEGIN
+        IF current_setting('jobs.suppress_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        payload := jobs_status_event(NEW.id, NEW.job_id, NEW.status_type, NEW.progress, NEW.message, NEW."timestamp");
+        IF payload IS NOT NULL THEN
+            PERFORM pg_notify('jobs_events', payload::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER jobs_jobstatus_notify
+        AFTER INSERT ON jobs_jobstatus
+        FOR EACH ROW EXECUTE FUNCTION jobs_notify_status_event();
+"""
+
+
+def create_statement_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def restore_row_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_events_suppress'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_statement_trigger, restore_row_trigger),
+    ]
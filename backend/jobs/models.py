@@ -1,4 +1,139 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Case, ExpressionWrapper, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import bump_jobs_version
+from .db import copy_instances, reserve_ids, supports_copy
+
+
+STATUS_CHOICES = [
+    ('PENDING', 'Pending'),
+    ('RUNNING', 'Running'),
+    ('COMPLETED', 'Completed'),
+    ('FAILED', 'Failed'),
+    ('CANCELLED', 'Cancelled'),
+]
+
+TERMINAL_STATUSES = ['COMPLETED', 'FAILED', 'CANCELLED']
+
+# Job column accumulating the time spent in each status, added when the job
+# leaves it. Time in FAILED that ends with another status is a retry gap.
+PHASE_TIME_FIELDS = {
+    'PENDING': 'queue_time',
+    'RUNNING': 'run_time',
+    'FAILED': 'retry_gap_time',
+}
+
+
+def phase_time_updates(now):
+    """
+    UPDATE expressions adding the time since status_changed_at to the phase
+    column of the job's current status. They read the row's values from
+    before the UPDATE, so they go in the same statement that moves
+    current_status on.
+    """
+    elapsed = ExpressionWrapper(
+        Value(now, output_field=models.DateTimeField()) - F('status_changed_at'),
+        output_field=models.DurationField(),
+    )
+    return {
+        field: Case(
+            When(
+                current_status=status_type, status_changed_at__isnull=False,
+                then=Coalesce(F(field), Value(timedelta(0))) + elapsed,
+            ),
+            default=F(field),
+            output_field=models.DurationField(),
+        )
+        for status_type, field in PHASE_TIME_FIELDS.items()
+    }
+
+
+class JobQuerySet(models.QuerySet):
+    def record_status(self, status_type, message='', progress=None):
+        """
+        Set-based Job.record_status() for every job in the queryset: one
+        batched JobStatus insert and one UPDATE of jobs_job, in a single
+        transaction. Returns the IDs of the jobs that were updated.
+        Callers are expected to keep the queryset to a bounded chunk.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            job_ids = list(self.order_by().values_list('id', flat=True))
+            if not job_ids:
+                return []
+
+            JobStatus.objects.bulk_create([
+                JobStatus(job_id=job_id, status_type=status_type, message=message,
+                          progress=progress, timestamp=now)
+                for job_id in job_ids
+            ])
+
+            latest_entry = JobStatus.objects.filter(
+                job=OuterRef('pk'), timestamp=now
+            ).order_by('-id').values('id')[:1]
+            updates = {
+                **phase_time_updates(now),
+                'current_status': status_type,
+                'current_progress': progress,
+                'current_message': message,
+                'current_status_entry_id': Subquery(latest_entry),
+                'status_changed_at': now,
+                'updated_at': now,
+            }
+            if status_type in TERMINAL_STATUSES:
+                updates['completed_at'] = now
+
+            Job.objects.filter(id__in=job_ids).update(**updates)
+
+            # bulk_create() and update() don't send model signals
+            transaction.on_commit(bump_jobs_version)
+
+        return job_ids
+
+    def bulk_create_pending(self, jobs):
+        """
+        Insert unsaved Job instances together with their initial PENDING
+        JobStatus rows in one transaction. On PostgreSQL both tables are
+        loaded with COPY using pre-reserved IDs; elsewhere bulk_create is
+        used. Returns the new job IDs in input order.
+        """
+        if not jobs:
+            return []
+
+        now = timezone.now()
+        for job in jobs:
+            job.created_at = job.updated_at = now
+            job.current_status = 'PENDING'
+            job.status_changed_at = now
+
+        with transaction.atomic():
+            if supports_copy():
+                job_ids = reserve_ids(Job, len(jobs))
+                status_ids = reserve_ids(JobStatus, len(jobs))
+                statuses = []
+                for job, job_id, status_id in zip(jobs, job_ids, status_ids):
+                    job.id = job_id
+                    job.current_status_entry_id = status_id
+                    statuses.append(JobStatus(id=status_id, job_id=job_id, status_type='PENDING', timestamp=now))
+                copy_instances(Job, jobs)
+                copy_instances(JobStatus, statuses)
+            else:
+                self.bulk_create(jobs)
+                statuses = JobStatus.objects.bulk_create([
+                    JobStatus(job_id=job.id, status_type='PENDING', timestamp=now) for job in jobs
+                ])
+                for job, entry in zip(jobs, statuses):
+                    job.current_status_entry_id = entry.id
+                self.bulk_update(jobs, ['current_status_entry_id'])
+
+            # COPY and bulk_create() don't send model signals
+            transaction.on_commit(bump_jobs_version)
+
+        return [job.id for job in jobs]
 
 
 class Job(models.Model):
@@ -6,7 +141,7 @@ class Job(models.Model):
     name = models.CharField(max_length=255, help_text="Human-readable job name")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     # Extended fields for production use
     description = models.TextField(blank=True, help_text="Optional job details")
     priority = models.IntegerField(default=5, help_text="Job priority (1-10, higher is more important)")
@@ -16,12 +151,29 @@ class Job(models.Model):
     result_data = models.JSONField(null=True, blank=True, help_text="Job output data")
     resource_requirements = models.JSONField(null=True, blank=True, help_text="CPU/Memory requirements")
 
+    # Denormalized copy of the latest JobStatus, kept in sync by record_status()
+    current_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, help_text="Latest status type")
+    current_progress = models.IntegerField(null=True, blank=True, help_text="Latest progress percentage")
+    current_message = models.TextField(blank=True, help_text="Latest status message")
+    current_status_entry_id = models.BigIntegerField(null=True, blank=True, help_text="ID of the latest JobStatus row")
+    status_changed_at = models.DateTimeField(null=True, blank=True, help_text="When the latest status was recorded")
+
+    # Time spent per phase (see PHASE_TIME_FIELDS); null until the job first leaves it
+    queue_time = models.DurationField(null=True, blank=True, help_text="Total time spent PENDING")
+    run_time = models.DurationField(null=True, blank=True, help_text="Total time spent RUNNING")
+    retry_gap_time = models.DurationField(
+        null=True, blank=True, help_text="Total time between failing and being retried",
+    )
+
+    objects = JobQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['created_at']),
             models.Index(fields=['priority']),
             models.Index(fields=['priority', 'created_at']),
+            models.Index(fields=['current_status', 'status_changed_at']),
         ]
 
     def __str__(self):
@@ -32,20 +184,57 @@ class Job(models.Model):
         """Get the most recent status for this job"""
         return self.statuses.first()
 
+    def record_status(self, status_type, message='', progress=None, timestamp=None):
+        """
+        Append a JobStatus entry and mirror it onto the current_* columns
+        in the same transaction. Terminal statuses also set completed_at.
+        The time since the previous status is added to its phase column.
+        """
+        with transaction.atomic():
+            entry = JobStatus.objects.create(
+                job=self,
+                status_type=status_type,
+                message=message,
+                progress=progress,
+                timestamp=timestamp or timezone.now(),
+            )
+
+            # Computed in the UPDATE from the stored current_status, which
+            # this instance may hold a stale copy of
+            for field, expression in phase_time_updates(entry.timestamp).items():
+                setattr(self, field, expression)
+            self.current_status = entry.status_type
+            self.current_progress = entry.progress
+            self.current_message = entry.message
+            self.current_status_entry_id = entry.pk
+            self.status_changed_at = entry.timestamp
+            update_fields = [
+                *PHASE_TIME_FIELDS.values(), 'current_status', 'current_progress', 'current_message',
+                'current_status_entry_id', 'status_changed_at', 'updated_at',
+            ]
+
+            if status_type in TERMINAL_STATUSES:
+                self.completed_at = entry.timestamp
+                update_fields.append('completed_at')
+
+            self.save(update_fields=update_fields)
+            self.refresh_from_db(fields=list(PHASE_TIME_FIELDS.values()))
+
+        return entry
+
 
 class JobStatus(models.Model):
-    STATUS_CHOICES = [
-        ('PENDING', 'Pending'),
-        ('RUNNING', 'Running'), 
-        ('COMPLETED', 'Completed'),
-        ('FAILED', 'Failed'),
-        ('CANCELLED', 'Cancelled'),
-    ]
+    """
+    Append-only status history. On PostgreSQL the table is range-partitioned
+    by month on timestamp (see migration 0007 and jobs.partitions), with a
+    primary key of (id, timestamp) in the database.
+    """
+    STATUS_CHOICES = STATUS_CHOICES
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='statuses')
     status_type = models.CharField(max_length=20, choices=STATUS_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
-    
+    timestamp = models.DateTimeField(default=timezone.now)
+
     # Optional fields
     message = models.TextField(blank=True, help_text="Status details or notes")
     progress = models.IntegerField(null=True, blank=True, help_text="Progress percentage (0-100)")
@@ -55,7 +244,55 @@ class JobStatus(models.Model):
         indexes = [
             models.Index(fields=['job', 'timestamp']),
             models.Index(fields=['status_type']),
+            # Time-range scans by the rollup job and the timeseries open bucket
+            models.Index(fields=['timestamp']),
         ]
 
     def __str__(self):
         return f"{self.job.name} - {self.status_type} at {self.timestamp}"
+
+
+class ArchivedJob(models.Model):
+    """
+    Offset index into the compressed cold-storage archive (jobs.archive).
+    Each row locates the gzip block in an archive file that holds the job.
+    """
+    job_id = models.BigIntegerField(primary_key=True)
+    archive_file = models.CharField(max_length=255, help_text="Archive file path relative to JOB_ARCHIVE_DIR")
+    offset = models.BigIntegerField(help_text="Byte offset of the gzip block holding the job")
+    length = models.IntegerField(help_text="Compressed length of the block in bytes")
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Job {self.job_id} in {self.archive_file}"
+
+
+class JobStatusRollup(models.Model):
+    """
+    Per-minute counts of status transitions by status and job priority,
+    written by jobs.rollups for buckets that have closed. Rollups outlive
+    the JobStatus rows they count (compaction, archiving).
+    """
+    bucket_start = models.DateTimeField()
+    status_type = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    priority = models.IntegerField()
+    count = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket_start', 'status_type', 'priority'], name='jobs_rollup_bucket_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.status_type} x{self.count} at {self.bucket_start} (priority {self.priority})"
+
+
+class RollupWatermark(models.Model):
+    """How far a rollup has been computed: everything before `value` is rolled up"""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} rolled up to {self.value}"
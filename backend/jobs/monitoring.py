@@ -1,24 +1,126 @@
 import time
+import threading
 import psutil
 import logging
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.db import connections, connection
+from django.db.models import Count, Q
 from django.core.cache import cache
 from django.conf import settings
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache
 from .models import Job, JobStatus
+from .db import estimate_row_count
+from .metrics import record_cache_lookup, render_metrics
 
 logger = logging.getLogger('jobs.performance')
 
 
+_cpu_primed = False
+
+
+def read_cpu_percent():
+    """
+    CPU usage since the previous call, without blocking. The first call in
+    a process has no previous reading, so it measures over a short interval.
+    """
+    global _cpu_primed
+    if not _cpu_primed:
+        _cpu_primed = True
+        return psutil.cpu_percent(interval=0.1)
+    return psutil.cpu_percent(interval=None)
+
+
+class HealthSampler:
+    """
+    Runs the health checks on a background thread and keeps the latest
+    result of each, stamped with when it was taken, so health requests
+    never run them inline. One sampler runs per worker process; it is
+    started lazily by the first diagnostics request (i.e. after fork),
+    which takes the first sample itself rather than report no results.
+    """
+
+    def __init__(self, checks, interval):
+        self.checks = checks
+        self.interval = interval
+        self._results = {}
+        self._lock = threading.Lock()
+        self._first_sample_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name='health-sampler', daemon=True)
+                self._thread.start()
+
+    def run(self):
+        # The first sample is taken inline by ensure_sampled()
+        while True:
+            time.sleep(self.interval)
+            self.sample()
+
+    def ensure_sampled(self):
+        """Take a sample inline if none has completed yet (e.g. a fresh worker's first probe)"""
+        with self._first_sample_lock:
+            if not self.snapshot():
+                self.sample(close_connection=False)
+
+    def sample(self, close_connection=True):
+        try:
+            for name, check in self.checks.items():
+                start_time = time.time()
+                result = check()
+                result['checked_at'] = timezone.now().isoformat()
+                result['check_duration_ms'] = round((time.time() - start_time) * 1000, 2)
+                with self._lock:
+                    self._results[name] = (time.time(), result)
+        except Exception as e:
+            logger.error(f"Health sampling failed: {e}")
+        finally:
+            # The sampler thread owns its own connection; don't hold it between samples
+            if close_connection:
+                connection.close()
+
+    def snapshot(self):
+        """Return {name: (sampled_at_epoch, result)} for the latest samples"""
+        with self._lock:
+            return dict(self._results)
+
+
+@require_http_methods(["GET"])
+@never_cache
+def liveness_check(request):
+    """Liveness probe: the process is up and serving requests. No I/O."""
+    return JsonResponse({'status': 'alive', 'timestamp': timezone.now().isoformat()})
+
+
+@require_http_methods(["GET"])
+@never_cache
+def readiness_check(request):
+    """Readiness probe: the database answers a trivial query"""
+    start_time = time.time()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        return JsonResponse({'status': 'not_ready', 'error': str(e)}, status=503)
+
+    return JsonResponse({
+        'status': 'ready',
+        'response_time_ms': round((time.time() - start_time) * 1000, 2),
+    })
+
+
 @require_http_methods(["GET"])
 @never_cache
 def health_check(request):
     """
-    Comprehensive health check endpoint
-    Returns system health status with detailed diagnostics
+    Detailed diagnostics endpoint
+    Serves the latest results collected by the background health sampler
     """
     start_time = time.time()
     health_status = {
@@ -28,31 +130,29 @@ def health_check(request):
         'response_time_ms': 0
     }
     
-    try:
-        # Database connectivity check
-        health_status['checks']['database'] = check_database_health()
-        
-        # Cache connectivity check  
-        health_status['checks']['cache'] = check_cache_health()
-        
-        # Application-specific checks
-        health_status['checks']['jobs'] = check_jobs_health()
-        
-        # System resources check
-        health_status['checks']['system'] = check_system_health()
-        
-        # Determine overall status
-        failed_checks = [check for check, status in health_status['checks'].items() 
-                        if status.get('status') != 'healthy']
-        
-        if failed_checks:
-            health_status['status'] = 'degraded' if len(failed_checks) == 1 else 'unhealthy'
-            health_status['failed_checks'] = failed_checks
-            
-    except Exception as e:
+    health_sampler.ensure_sampled()
+    health_sampler.start()
+    snapshot = health_sampler.snapshot()
+    if not snapshot:
         health_status['status'] = 'unhealthy'
-        health_status['error'] = str(e)
-        logger.error(f"Health check failed: {e}")
+        health_status['message'] = 'Health sampling failed'
+        return JsonResponse(health_status, status=503)
+    
+    # Samples older than a few intervals mean the sampler is stuck
+    max_age = health_sampler.interval * 3
+    for name, (sampled_at, result) in snapshot.items():
+        result = dict(result, age_seconds=round(time.time() - sampled_at, 1))
+        if result['age_seconds'] > max_age:
+            result['status'] = 'stale'
+        health_status['checks'][name] = result
+    
+    # Determine overall status
+    failed_checks = [check for check, status in health_status['checks'].items() 
+                    if status.get('status') != 'healthy']
+    
+    if failed_checks:
+        health_status['status'] = 'degraded' if len(failed_checks) == 1 else 'unhealthy'
+        health_status['failed_checks'] = failed_checks
     
     # Calculate response time
     health_status['response_time_ms'] = round((time.time() - start_time) * 1000, 2)
@@ -73,15 +173,13 @@ def check_database_health():
             cursor.execute("SELECT 1")
             cursor.fetchone()
         
-        # Test query performance on jobs table
-        job_count = Job.objects.count()
-        
         db_response_time = round((time.time() - start_time) * 1000, 2)
         
         return {
             'status': 'healthy',
             'response_time_ms': db_response_time,
-            'job_count': job_count,
+            # Planner estimate rather than a COUNT(*) scan
+            'job_count_estimate': estimate_row_count(Job),
             'connection_status': 'connected'
         }
     except Exception as e:
@@ -137,19 +235,21 @@ def check_jobs_health():
             created_at__gte=timezone.now() - timezone.timedelta(hours=24)
         ).count()
         
-        # Check for stuck running jobs (running for more than 2 hours)
+        # Check for stuck running jobs (currently running with no update within the default timeout)
+        stuck_timeout = getattr(settings, 'JOB_STUCK_TIMEOUT', 7200)
         stuck_jobs = Job.objects.filter(
-            statuses__status_type='RUNNING',
-            statuses__timestamp__lt=timezone.now() - timezone.timedelta(hours=2)
-        ).distinct().count()
+            current_status='RUNNING',
+            status_changed_at__lt=timezone.now() - timezone.timedelta(seconds=stuck_timeout)
+        ).count()
         
         # Check for high error rate (more than 50% failed in last hour)
         recent_hour = timezone.now() - timezone.timedelta(hours=1)
-        recent_jobs_hour = Job.objects.filter(created_at__gte=recent_hour).count()
-        failed_jobs_hour = Job.objects.filter(
-            created_at__gte=recent_hour,
-            statuses__status_type='FAILED'
-        ).distinct().count()
+        recent_counts = Job.objects.filter(created_at__gte=recent_hour).aggregate(
+            total=Count('id'),
+            failed=Count('id', filter=Q(current_status='FAILED'))
+        )
+        recent_jobs_hour = recent_counts['total']
+        failed_jobs_hour = recent_counts['failed']
         
         error_rate = (failed_jobs_hour / recent_jobs_hour * 100) if recent_jobs_hour > 0 else 0
         
@@ -183,7 +283,7 @@ def check_system_health():
         # Get system metrics
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = read_cpu_percent()
         
         # Determine status based on thresholds
         status = 'healthy'
@@ -215,6 +315,17 @@ def check_system_health():
         }
 
 
+health_sampler = HealthSampler(
+    checks={
+        'database': check_database_health,
+        'cache': check_cache_health,
+        'jobs': check_jobs_health,
+        'system': check_system_health,
+    },
+    interval=getattr(settings, 'HEALTH_SAMPLE_INTERVAL', 15),
+)
+
+
 @require_http_methods(["GET"])
 @never_cache
 def performance_metrics(request):
@@ -246,47 +357,118 @@ def performance_metrics(request):
         }, status=500)
 
 
+@require_http_methods(["GET"])
+@never_cache
+def prometheus_metrics(request):
+    """
+    Prometheus text exposition of the request, database and cache metrics,
+    merged across all gunicorn workers
+    """
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)
+
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+COMPLETION_PERCENTILES_SQL = """
+    SELECT percentile_cont(%s::float8[]) WITHIN GROUP (
+               ORDER BY EXTRACT(EPOCH FROM (completed_at - created_at))
+           )
+    FROM jobs_job
+    WHERE completed_at IS NOT NULL;
+"""
+
+# Queue wait: total time spent PENDING, accumulated by record_status()
+QUEUE_WAIT_PERCENTILES_SQL = """
+    SELECT percentile_cont(%s::float8[]) WITHIN GROUP (
+               ORDER BY EXTRACT(EPOCH FROM queue_time)
+           )
+    FROM jobs_job
+    WHERE queue_time IS NOT NULL;
+"""
+
+
 def get_application_metrics():
-    """Get application-specific metrics"""
+    """
+    Get application-specific metrics. Cached for APP_METRICS_CACHE_TTL
+    seconds so frequent scrapes don't each hit the database.
+    """
+    cache_key = 'jobs:app_metrics'
+    metrics = cache.get(cache_key)
+    record_cache_lookup('app_metrics', metrics is not None)
+    if metrics is not None:
+        return metrics
+
     try:
-        # Job statistics
-        total_jobs = Job.objects.count()
-        
-        # Status distribution
-        status_counts = {}
-        for status_type, _ in JobStatus.STATUS_CHOICES:
-            count = Job.objects.filter(
-                statuses__status_type=status_type
-            ).distinct().count()
-            status_counts[status_type.lower()] = count
-        
-        # Performance metrics
-        avg_completion_time = Job.objects.filter(
-            completed_at__isnull=False
-        ).extra(
-            select={'duration': 'EXTRACT(EPOCH FROM (completed_at - created_at))'}
-        ).aggregate(
-            avg_duration=models.Avg('duration')
-        )['avg_duration']
-        
-        return {
-            'total_jobs': total_jobs,
-            'status_distribution': status_counts,
-            'avg_completion_time_seconds': round(avg_completion_time or 0, 2),
-        }
+        metrics = compute_application_metrics()
     except Exception as e:
         return {'error': str(e)}
 
+    cache.set(cache_key, metrics, getattr(settings, 'APP_METRICS_CACHE_TTL', 10))
+    return metrics
+
+
+def compute_application_metrics():
+    """Job counts by current status and duration percentiles, in one pass each"""
+    # Status distribution
+    status_counts = {status_type.lower(): 0 for status_type, _ in JobStatus.STATUS_CHOICES}
+    total_jobs = 0
+    for row in Job.objects.order_by().values('current_status').annotate(count=Count('id')):
+        total_jobs += row['count']
+        if row['current_status']:
+            status_counts[row['current_status'].lower()] = row['count']
+
+    # Performance metrics
+    avg_completion_time = Job.objects.filter(completed_at__isnull=False).aggregate(
+        avg_duration=models.Avg(
+            models.ExpressionWrapper(
+                models.F('completed_at') - models.F('created_at'),
+                output_field=models.DurationField()
+            )
+        )
+    )['avg_duration']
+
+    return {
+        'total_jobs': total_jobs,
+        'status_distribution': status_counts,
+        'avg_completion_time_seconds': round(avg_completion_time.total_seconds() if avg_completion_time else 0, 2),
+        'completion_time_seconds': get_duration_percentiles(COMPLETION_PERCENTILES_SQL),
+        'queue_wait_seconds': get_duration_percentiles(QUEUE_WAIT_PERCENTILES_SQL),
+    }
+
+
+def get_duration_percentiles(sql):
+    """
+    Return {'p50': ..., 'p90': ..., 'p99': ...} in seconds, computed in the
+    database with percentile_cont. Values are None when there is no data
+    or the database isn't PostgreSQL.
+    """
+    keys = [f'p{int(fraction * 100)}' for fraction in PERCENTILES]
+    if connection.vendor != 'postgresql':
+        return dict.fromkeys(keys)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [list(PERCENTILES)])
+        values = cursor.fetchone()[0] or [None] * len(keys)
+
+    return {
+        key: round(float(value), 2) if value is not None else None
+        for key, value in zip(keys, values)
+    }
+
 
 def get_database_metrics():
-    """Get database performance metrics"""
+    """Get database performance metrics (table statistics need PostgreSQL)"""
+    if connection.vendor != 'postgresql':
+        return {'connection_count': len(connections.all())}
+
     try:
         with connection.cursor() as cursor:
             # Query performance
             cursor.execute("""
                 SELECT 
                     schemaname,
-                    tablename,
+                    relname,
                     seq_scan,
                     seq_tup_read,
                     idx_scan,
@@ -295,7 +477,7 @@ def get_database_metrics():
                     n_tup_upd,
                     n_tup_del
                 FROM pg_stat_user_tables 
-                WHERE tablename LIKE 'jobs_%';
+                WHERE relname LIKE 'jobs_%';
             """)
             
             table_stats = []
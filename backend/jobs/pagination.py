@@ -1,14 +1,116 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage, Paginator
+from django.db import models
+from django.db.models import F, Func, Q, Value
+from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .caching import jobs_cache_enabled, normalize_params, versioned_key
+from .db import estimate_row_count
+from .metrics import record_cache_lookup
+
+
+class JobPaginator(Paginator):
+    """
+    Django paginator whose count comes from a pluggable strategy returning
+    (count, exact). When the count is an estimate, page bounds are not
+    enforced against it, since the real number of rows may be larger.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.count_exact = True
+
+    @cached_property
+    def count(self):
+        count, self.count_exact = self.count_strategy(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        self.count  # resolves count_exact
+        if self.count_exact:
+            return super().validate_number(number)
+        number = int(number)
+        if number < 1:
+            raise InvalidPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
 
 
 class JobPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
+    cursor_query_param = 'cursor'
+
+    # Query params that don't change which rows match, so don't affect the count
+    count_ignored_params = ('page', 'page_size', 'ordering', 'cursor', 'format', 'fields', 'view')
+
+    def django_paginator_class(self, object_list, per_page):
+        return JobPaginator(object_list, per_page, count_strategy=self.get_count)
+
+    def get_count(self, queryset):
+        """
+        Return (count, exact) for the filtered queryset.
+
+        Unfiltered lists on large tables use the planner's row estimate;
+        everything else is an exact COUNT(*) cached per normalized filter
+        set until the next job write or the TTL expires (only with a shared
+        cache, which every writer's version bump reaches).
+        """
+        normalized = normalize_params(self.request.query_params, ignore=self.count_ignored_params)
+
+        if not normalized:
+            estimate = estimate_row_count(queryset.model)
+            threshold = getattr(settings, 'JOB_COUNT_ESTIMATE_THRESHOLD', 100000)
+            if estimate is not None and estimate >= threshold:
+                return estimate, False
+
+        if not jobs_cache_enabled():
+            return queryset.count(), True
+
+        cache_key = versioned_key('count', normalized)
+        count = cache.get(cache_key)
+        record_cache_lookup('job_count', count is not None)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, getattr(settings, 'JOB_COUNT_CACHE_TTL', 60))
+        return count, True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        # ?cursor= switches this request to keyset pagination
+        self.cursor_paginator = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = JobCursorPagination(
+                page_size=self.get_page_size(request),
+                cursor_query_param=self.cursor_query_param,
+            )
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
         return Response({
             'count': self.page.paginator.count,
+            'count_exact': self.page.paginator.count_exact,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'total_pages': self.page.paginator.num_pages,
@@ -18,5 +120,175 @@ class JobPagination(PageNumberPagination):
         })
 
 
+class RowValue(Func):
+    """SQL row constructor, e.g. (priority, created_at), for row comparisons"""
+    function = ''
+    output_field = models.Field()
+
+
+class JobCursorPagination(BasePagination):
+    """
+    Keyset pagination over the queryset's effective ordering.
+
+    The cursor is an opaque token holding the ordering values of the row at
+    the page boundary, so every page is an index range scan with no OFFSET
+    and no COUNT(*). An `id` tie-breaker is appended to the ordering when
+    missing so that positions are unique.
+    """
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, page_size, cursor_query_param='cursor'):
+        self.page_size = page_size
+        self.cursor_query_param = cursor_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        self.ordering = self.get_ordering(queryset)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(queryset.model, ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size,
+            'results': data
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, instance, reverse):
+        position = [self.get_position_value(instance, name) for name in self.ordering]
+        token = self.encode_cursor(position, reverse)
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_ordering(self, queryset):
+        """Effective ordering of the filtered queryset plus an id tie-breaker"""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if any(not isinstance(item, str) or '__' in item for item in ordering):
+            raise NotFound('Cursor pagination is not supported for this ordering')
+        if not any(item.lstrip('-') in ('id', 'pk') for item in ordering):
+            ordering.append('id')
+        return ordering
+
+    @staticmethod
+    def reverse_ordering(ordering):
+        return [item[1:] if item.startswith('-') else f'-{item}' for item in ordering]
+
+    @staticmethod
+    def get_position_value(instance, name):
+        name = name.lstrip('-')
+        # Rows may be model instances or values() dicts
+        value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'o': self.ordering, 'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """Return (position, reverse) for the request's cursor, (None, False) for the first page"""
+        token = request.query_params.get(self.cursor_query_param, '')
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            ordering, position, reverse = payload['o'], payload['p'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only meaningful for the ordering it was issued under
+        if ordering != self.ordering or not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def keyset_filter(self, model, ordering, position):
+        """
+        Rows strictly after `position` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        with > / < chosen per column direction.
+        """
+        columns = []
+        for item, raw in zip(ordering, position):
+            name = item.lstrip('-')
+            columns.append((name, item.startswith('-'), self.to_python(model, name, raw)))
+
+        condition = Q()
+        equal = Q()
+        for name, descending, value in columns:
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        return self.leading_bound(columns) & condition
+
+    @staticmethod
+    def leading_bound(columns):
+        """
+        Inclusive bound on the leading run of columns sharing one direction,
+        expressed as a row comparison the database can use as an index
+        range condition. The OR-expanded keyset condition alone would make
+        the planner scan from the start of the index.
+        """
+        descending = columns[0][1]
+        run = []
+        for name, column_descending, value in columns:
+            if column_descending != descending:
+                break
+            run.append((name, value))
+
+        if len(run) == 1:
+            name, value = run[0]
+            return Q(**{f"{name}__{'lte' if descending else 'gte'}": value})
+
+        lookup = LessThanOrEqual if descending else GreaterThanOrEqual
+        return lookup(
+            RowValue(*[F(name) for name, _ in run]),
+            RowValue(*[Value(value) for _, value in run]),
+        )
+
+    def to_python(self, model, name, raw):
+        try:
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotated ordering values (e.g. search rank) are stored as-is
+            return raw
+        try:
+            return field.to_python(raw)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+
 # Import Response here to avoid circular imports
-from rest_framework.response import Response
\ No newline at end of file
+from rest_framework.response import Response
@@ -0,0 +1,110 @@
+"""
+Monthly range partitions of jobs_jobstatus on PostgreSQL.
+
+Partitions are named jobs_jobstatus_pYYYY_MM and cover one UTC calendar
+month of timestamp. Rows outside every monthly partition go to
+jobs_jobstatus_default, and are moved out when their month is created.
+"""
+import re
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+
+PARENT_TABLE = 'jobs_jobstatus'
+DEFAULT_PARTITION = 'jobs_jobstatus_default'
+PARTITION_NAME_RE = re.compile(r'^jobs_jobstatus_p(\d{4})_(\d{2})$')
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(start):
+    return f'{PARENT_TABLE}_p{start:%Y_%m}'
+
+
+def is_partitioned():
+    """True when jobs_jobstatus is a partitioned table (PostgreSQL after migration 0007)"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [PARENT_TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def list_partitions():
+    """{month_start: table name} for every attached monthly partition"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+        """, [PARENT_TABLE])
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)] = name
+    return partitions
+
+
+def create_partition(start):
+    """
+    Create and attach the partition for the month beginning at `start`,
+    moving any of its rows out of the default partition first.
+    """
+    name = partition_name(start)
+    lower, upper = start.isoformat(), add_months(start, 1).isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)")
+        cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE "timestamp" >= %s AND "timestamp" < %s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """, [lower, upper])
+        cursor.execute(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    return name
+
+
+def ensure_partitions(months_ahead, now=None):
+    """Create any missing partitions from the current month to `months_ahead` months out"""
+    first = month_start(now or datetime.now(timezone.utc))
+    existing = list_partitions()
+    created = []
+    for offset in range(months_ahead + 1):
+        start = add_months(first, offset)
+        if start not in existing:
+            created.append(create_partition(start))
+    return created
+
+
+def remove_partitions_before(cutoff, detach_only=False):
+    """
+    Detach every monthly partition whose whole range is older than
+    `cutoff`, and drop it unless `detach_only`. Returns the table names.
+    """
+    removed = []
+    for start, name in sorted(list_partitions().items()):
+        if add_months(start, 1) > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+            if not detach_only:
+                cursor.execute(f"DROP TABLE {name}")
+        removed.append(name)
+    return removed
@@ -0,0 +1,127 @@
+"""
+Per-request SQL instrumentation and query budgets.
+
+QueryStats is a connection.execute_wrapper() hook like metrics.QueryTimer.
+It also counts every statement under a normalized "shape": literals and
+placeholders become ?, IN lists and multi-row VALUES collapse, and
+whitespace is squeezed. A shape that repeats many times in one request is
+usually an N+1: a deferred field, or a related object read per row.
+
+RequestLoggingMiddleware uses it when JOB_SQL_INSTRUMENTATION is on. Tests
+and `manage.py check_query_budgets` use assert_max_queries() and
+check_query_budgets() to hold endpoints to a query budget.
+"""
+import json
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import connection
+
+from .metrics import QueryTimer
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|%\(\w+\)s|\$\d+')
+VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+VALUES_ROWS = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """SQL with literals and parameters replaced, so identical statements share a shape"""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = VALUE_LIST.sub('(...)', sql)
+    sql = VALUES_ROWS.sub(r'\1', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryStats(QueryTimer):
+    """QueryTimer that also counts statements and their time per normalized shape"""
+
+    def __init__(self):
+        super().__init__()
+        self.shapes = Counter()
+        self.shape_durations = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        duration = self.duration
+        try:
+            return super().__call__(execute, sql, params, many, context)
+        finally:
+            shape = normalize_sql(sql)
+            self.shapes[shape] += 1
+            self.shape_durations[shape] += self.duration - duration
+
+    def repeated_shapes(self, threshold):
+        """[(shape, count, seconds)] of shapes executed more than `threshold` times, most frequent first"""
+        return [
+            (shape, count, self.shape_durations[shape])
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def summary(self, limit=10):
+        """Human-readable breakdown of the most frequent shapes"""
+        lines = [f'{self.count} queries in {self.duration * 1000:.1f} ms']
+        for shape, count in self.shapes.most_common(limit):
+            lines.append(f'  {count:4d} x {shape[:200]}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def assert_max_queries(budget, max_repeats=None, using=None):
+    """
+    Fail with AssertionError when the block runs more than `budget` queries,
+    or, with `max_repeats`, when any query shape repeats more often than that.
+
+        with assert_max_queries(3, max_repeats=1):
+            client.get('/api/jobs/')
+    """
+    stats = QueryStats()
+    with (using or connection).execute_wrapper(stats):
+        yield stats
+    if stats.count > budget:
+        raise AssertionError(f'Query budget of {budget} exceeded: {stats.summary()}')
+    if max_repeats is not None and stats.repeated_shapes(max_repeats):
+        raise AssertionError(f'A query shape repeated more than {max_repeats} times: {stats.summary()}')
+
+
+# Endpoint -> (method, path, JSON body, max queries, max repeats of one shape).
+# {job_id} is replaced with an existing job. Budgets are for uncached
+# responses and include the savepoint queries of writes run inside a
+# transaction, as in TestCase or check_query_budgets.
+QUERY_BUDGETS = {
+    'list': ('GET', '/api/jobs/', None, 2, 1),
+    'list_filtered': ('GET', '/api/jobs/?status=RUNNING&priority=5&search=data', None, 2, 1),
+    'list_cursor': ('GET', '/api/jobs/?cursor=&page_size=50', None, 1, 1),
+    'detail': ('GET', '/api/jobs/{job_id}/', None, 1, 1),
+    'stats': ('GET', '/api/jobs/stats/', None, 2, 1),
+    'durations': ('GET', '/api/jobs/durations/', None, 2, 1),
+    'timeseries': ('GET', '/api/jobs/timeseries/', None, 2, 1),
+    'update': (
+        'PATCH', '/api/jobs/{job_id}/', {'status_type': 'RUNNING', 'progress': 50, 'message': 'budget check'}, 6, 1,
+    ),
+}
+
+
+def check_query_budgets(client, job_id, budgets=None):
+    """
+    Request every endpoint in `budgets` (default QUERY_BUDGETS) with a test
+    client; returns {name: (queries, budget, failure message or None)}.
+    """
+    results = {}
+    for name, (method, path, body, budget, max_repeats) in (budgets or QUERY_BUDGETS).items():
+        path = path.format(job_id=job_id)
+        try:
+            with assert_max_queries(budget, max_repeats) as stats:
+                response = client.generic(
+                    method, path, '' if body is None else json.dumps(body), content_type='application/json',
+                )
+            failure = None if response.status_code < 400 else f'{method} {path} returned {response.status_code}'
+        except AssertionError as e:
+            failure = str(e)
+        results[name] = (stats.count, budget, failure)
+    return results
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    text/csv renderer. Exports stream their own body; this renders the
+    small non-streaming responses (e.g. errors) negotiated for CSV requests.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if rows and isinstance(rows[0], dict):
+            header = list(rows[0].keys())
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(csv_value(row.get(key)) for key in header)
+        else:
+            for row in rows:
+                writer.writerow([csv_value(row)])
+        return buffer.getvalue().encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed. The output
+    matches JSONRenderer's compact form byte for byte for the API's data
+    (orjson may write extreme floats differently); anything orjson can't
+    encode, indented output and a missing orjson use JSONRenderer itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoder.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer too, as they are invalid in JavaScript strings
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """application/x-ndjson renderer: one JSON document per line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(ndjson_line(row) for row in rows).encode('utf-8')
+
+
+def csv_value(value):
+    """Flatten a value for a CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def ndjson_line(value):
+    return json.dumps(value, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .caching import bump_jobs_version
+from .db import delete_where_in
+from .models import TERMINAL_STATUSES, Job, JobStatus
+
+
+def compact_job_history(cutoff, batch_size=1000):
+    """
+    Collapse the status history of jobs that finished before `cutoff`.
+
+    For each job only the first and last entry of every status type are
+    kept, e.g. PENDING, the first and final RUNNING/progress ticks and the
+    terminal status; the intermediate entries are deleted. The latest entry
+    (current_status_entry_id) is always among those kept. Runs one
+    transaction per `batch_size` jobs and returns the number of rows deleted.
+    """
+    job_ids = Job.objects.filter(
+        current_status__in=TERMINAL_STATUSES, completed_at__lt=cutoff
+    ).order_by().values_list('id', flat=True)
+
+    deleted = 0
+    batch = []
+    for job_id in job_ids.iterator(chunk_size=batch_size):
+        batch.append(job_id)
+        if len(batch) >= batch_size:
+            deleted += compact_batch(batch)
+            batch = []
+    if batch:
+        deleted += compact_batch(batch)
+    return deleted
+
+
+def compact_batch(job_ids):
+    partition = [F('job_id'), F('status_type')]
+    intermediate = JobStatus.objects.filter(job_id__in=job_ids).annotate(
+        position=Window(RowNumber(), partition_by=partition, order_by=[F('timestamp').asc(), F('id').asc()]),
+        total=Window(Count('id'), partition_by=partition),
+    ).filter(position__gt=1, position__lt=F('total')).values_list('id', flat=True)
+
+    with transaction.atomic():
+        entry_ids = list(intermediate)
+        if not entry_ids:
+            return 0
+        # A plain DELETE: the post_delete receivers would otherwise make the
+        # collector fetch every row, so bump the cache version once instead
+        deleted = delete_where_in(JobStatus, 'id', entry_ids)
+        transaction.on_commit(bump_jobs_version)
+    return deleted
@@ -0,0 +1,158 @@
+"""
+Time-bucketed counts of job status transitions.
+
+roll_up() counts JobStatus rows per minute, status and job priority into
+JobStatusRollup for every minute that has closed, and advances the
+'job_status' watermark in the same transaction. A minute counts as closed
+JOB_ROLLUP_GRACE seconds after it ends, which leaves room for transactions
+that commit after their status timestamp was taken. get_timeseries() reads
+the rollups before the watermark and counts only the rest live.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import JobStatus, JobStatusRollup, RollupWatermark
+
+WATERMARK = 'job_status'
+
+BUCKET_SIZES = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+}
+
+# Window returned when the request gives no created_after
+DEFAULT_WINDOWS = {
+    'minute': timedelta(hours=1),
+    'hour': timedelta(days=1),
+}
+
+# Series reported per bucket for each status transition; a job's PENDING
+# entry is written when it is created
+TIMESERIES_SERIES = {
+    'PENDING': 'created',
+    'RUNNING': 'started',
+    'COMPLETED': 'completed',
+    'FAILED': 'failed',
+    'CANCELLED': 'cancelled',
+}
+
+# Largest span of history rolled up in one transaction (first run, catch-up)
+ROLL_UP_CHUNK = timedelta(hours=6)
+
+
+def truncate(value, bucket):
+    """Start of the UTC bucket holding `value`"""
+    value = value.astimezone(dt_timezone.utc)
+    if bucket == 'hour':
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def get_watermark():
+    return RollupWatermark.objects.filter(name=WATERMARK).values_list('value', flat=True).first()
+
+
+def count_transitions(start, end, bucket, priority=None):
+    """Live {bucket_start: Counter(status_type)} from jobs_jobstatus for [start, end)"""
+    statuses = JobStatus.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by()
+    if priority is not None:
+        statuses = statuses.filter(job__priority=priority)
+    counts = defaultdict(Counter)
+    rows = statuses.values(
+        'status_type', bucket_start=Trunc('timestamp', bucket, tzinfo=dt_timezone.utc)
+    ).annotate(count=Count('id'))
+    for row in rows:
+        counts[row['bucket_start']][row['status_type']] += row['count']
+    return counts
+
+
+def roll_up(now=None, grace=None):
+    """
+    Roll up every closed minute that isn't yet. Returns the new watermark,
+    or None when there is no status history to start from.
+    """
+    now = now or timezone.now()
+    grace = getattr(settings, 'JOB_ROLLUP_GRACE', 120) if grace is None else grace
+    until = truncate(now - timedelta(seconds=grace), 'minute')
+
+    start = get_watermark()
+    if start is None:
+        first = JobStatus.objects.order_by('timestamp').values_list('timestamp', flat=True).first()
+        if first is None:
+            return None
+        start = truncate(first, 'minute')
+
+    while start < until:
+        end = min(start + ROLL_UP_CHUNK, until)
+        if not roll_up_range(start, end):
+            # Another roller got there first
+            return get_watermark()
+        start = end
+    return start
+
+
+def roll_up_range(start, end):
+    """Roll up [start, end) and move the watermark to `end`, unless it has moved away from `start`"""
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(name=WATERMARK).first()
+        if watermark is not None and watermark.value != start:
+            return False
+
+        rows = JobStatus.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by().values(
+            'status_type',
+            bucket_start=Trunc('timestamp', 'minute', tzinfo=dt_timezone.utc),
+            job_priority=F('job__priority'),
+        ).annotate(count=Count('id'))
+        JobStatusRollup.objects.bulk_create([
+            JobStatusRollup(
+                bucket_start=row['bucket_start'], status_type=row['status_type'],
+                priority=row['job_priority'], count=row['count'],
+            )
+            for row in rows
+        ])
+        RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={'value': end})
+    return True
+
+
+def get_timeseries(start, end, bucket, priority=None):
+    """
+    Transition counts for each `bucket` from the one holding `start` to the
+    one holding `end`, zero-filled. Buckets before the rollup watermark are
+    read from JobStatusRollup; the remainder, including the open bucket, is
+    counted from jobs_jobstatus.
+    """
+    start = truncate(start, bucket)
+    end = truncate(end, bucket) + BUCKET_SIZES[bucket]
+    watermark = get_watermark() or start
+    rolled_until = min(max(watermark, start), end)
+
+    counts = defaultdict(Counter)
+    if start < rolled_until:
+        rollups = JobStatusRollup.objects.filter(bucket_start__gte=start, bucket_start__lt=rolled_until).order_by()
+        if priority is not None:
+            rollups = rollups.filter(priority=priority)
+        rows = rollups.values(
+            'status_type', bucket=Trunc('bucket_start', bucket, tzinfo=dt_timezone.utc)
+        ).annotate(total=Sum('count'))
+        for row in rows:
+            counts[row['bucket']][row['status_type']] += row['total']
+    if rolled_until < end:
+        for bucket_start, live in count_transitions(rolled_until, end, bucket, priority).items():
+            counts[truncate(bucket_start, bucket)].update(live)
+
+    results = []
+    bucket_start = start
+    while bucket_start < end:
+        bucket_counts = counts[bucket_start]
+        results.append({
+            'bucket': bucket_start,
+            **{series: bucket_counts[status_type] for status_type, series in TIMESERIES_SERIES.items()},
+        })
+        bucket_start += BUCKET_SIZES[bucket]
+    return results
@@ -0,0 +1,219 @@
+"""
+Bulk generation of synthetic jobs for load testing (seed_test_data --bulk).
+
+Jobs and their status histories are generated in chunks with one RNG per
+chunk, derived from the seed and the chunk number, so a dataset depends on
+--seed alone, not on the number of worker processes. Each chunk is written
+in its own transaction: with COPY on PostgreSQL (IDs reserved up front),
+bulk_create elsewhere. The denormalized current_* and phase columns are
+filled in directly, as record_status() would have left them.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from .caching import bump_jobs_version
+from .db import copy_instances, reserve_ids, supports_copy
+from .models import (
+    STATUS_CHOICES, TERMINAL_STATUSES, Job, JobStatus, JobStatusRollup, RollupWatermark,
+)
+
+JOB_TEMPLATES = [
+    ('Data Processing Pipeline', 'Process large CSV datasets'),
+    ('Machine Learning Training', 'Train neural network model'),
+    ('Image Resizing Batch', 'Resize product images for web'),
+    ('Database Migration', 'Migrate user data to new schema'),
+    ('Report Generation', 'Generate monthly analytics report'),
+    ('Backup Creation', 'Create database backup archive'),
+    ('Email Campaign', 'Send marketing emails to subscribers'),
+    ('Log Analysis', 'Analyze server logs for patterns'),
+    ('File Compression', 'Compress and archive old files'),
+    ('API Sync', 'Sync data with external API'),
+]
+
+STATUS_MESSAGES = {
+    'PENDING': ['Waiting for resources', 'Queued for processing', 'Scheduled to run'],
+    'RUNNING': ['Processing data...', 'Halfway complete', 'Training in progress'],
+    'COMPLETED': ['Successfully processed', 'Task completed', 'All done!'],
+    'FAILED': ['Network timeout', 'Insufficient memory', 'Permission denied'],
+    'CANCELLED': ['User cancelled', 'Timeout reached', 'Resource unavailable'],
+}
+
+DEFAULT_STATUS_MIX = {'PENDING': 20, 'RUNNING': 10, 'COMPLETED': 50, 'FAILED': 12, 'CANCELLED': 8}
+
+# Upper bounds of the generated gaps, in minutes
+MAX_QUEUE_WAIT = 30
+MAX_PROGRESS_GAP = 20
+MAX_FINAL_GAP = 120
+
+
+def parse_status_mix(value):
+    """'COMPLETED=60,FAILED=10,...' -> {status: weight}; unlisted statuses get weight 0"""
+    valid = dict(STATUS_CHOICES)
+    mix = dict.fromkeys(valid, 0)
+    for item in value.split(','):
+        status_type, _, weight = item.partition('=')
+        status_type = status_type.strip().upper()
+        if status_type not in valid:
+            raise ValueError(f'Unknown status: {status_type}')
+        mix[status_type] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError('The status mix needs at least one positive weight')
+    return mix
+
+
+@dataclass
+class SeedOptions:
+    seed: int = 0
+    chunk_size: int = 10000
+    status_mix: dict = field(default_factory=lambda: dict(DEFAULT_STATUS_MIX))
+    history_depth: int = 3
+    days: int = 30
+
+
+class ChunkGenerator:
+    """Jobs and status histories of one chunk, reproducible from (seed, chunk number)"""
+
+    def __init__(self, options, chunk_number, now):
+        self.options = options
+        self.rng = random.Random(options.seed * 1_000_003 + chunk_number)
+        self.now = now
+        self.chunk_number = chunk_number
+        self.statuses = list(options.status_mix)
+        self.weights = list(options.status_mix.values())
+        # Keep every history in the past
+        self.max_span = timedelta(
+            minutes=MAX_QUEUE_WAIT + options.history_depth * MAX_PROGRESS_GAP + MAX_FINAL_GAP
+        )
+
+    def generate(self, count):
+        """Return (jobs, histories): unsaved Jobs and a list of JobStatus lists, one per job"""
+        jobs, histories = [], []
+        for index in range(count):
+            job, history = self.generate_job(self.chunk_number * self.options.chunk_size + index + 1)
+            jobs.append(job)
+            histories.append(history)
+        return jobs, histories
+
+    def generate_job(self, number):
+        rng = self.rng
+        name, description = rng.choice(JOB_TEMPLATES)
+        final_status = rng.choices(self.statuses, self.weights)[0]
+        window = max(timedelta(days=self.options.days) - self.max_span, timedelta(0))
+        created_at = self.now - self.max_span - window * rng.random()
+
+        job = Job(
+            name=f'{name} #{number:06d}',
+            description=f'{description} - Generated load test job',
+            priority=rng.randint(1, 10),
+            created_at=created_at,
+            error_message='',
+        )
+        history = [JobStatus(status_type='PENDING', message='Job created and queued', timestamp=created_at)]
+
+        timestamp = created_at
+        started_at = None
+        # A quarter of cancellations happen before the job ever runs
+        if final_status != 'PENDING' and not (final_status == 'CANCELLED' and rng.random() < 0.25):
+            timestamp += timedelta(minutes=rng.uniform(1, MAX_QUEUE_WAIT))
+            started_at = timestamp
+            job.queue_time = timestamp - created_at
+            progress = rng.randint(1, 10)
+            history.append(JobStatus(
+                status_type='RUNNING', message=rng.choice(STATUS_MESSAGES['RUNNING']),
+                progress=progress, timestamp=timestamp,
+            ))
+            for _ in range(rng.randint(0, self.options.history_depth)):
+                timestamp += timedelta(minutes=rng.uniform(1, MAX_PROGRESS_GAP))
+                progress = min(99, progress + rng.randint(1, 30))
+                history.append(JobStatus(
+                    status_type='RUNNING', message=rng.choice(STATUS_MESSAGES['RUNNING']),
+                    progress=progress, timestamp=timestamp,
+                ))
+
+        if final_status in TERMINAL_STATUSES:
+            previous = timestamp
+            timestamp += timedelta(minutes=rng.uniform(5, MAX_FINAL_GAP))
+            if started_at is None:
+                job.queue_time = timestamp - previous
+            else:
+                job.run_time = timestamp - started_at
+            message = rng.choice(STATUS_MESSAGES[final_status])
+            history.append(JobStatus(
+                status_type=final_status, message=message,
+                progress=100 if final_status == 'COMPLETED' else None, timestamp=timestamp,
+            ))
+            job.completed_at = timestamp
+            if final_status == 'FAILED':
+                job.error_message = message
+
+        latest = history[-1]
+        job.updated_at = latest.timestamp
+        job.current_status = latest.status_type
+        job.current_progress = latest.progress
+        job.current_message = latest.message
+        job.status_changed_at = latest.timestamp
+        return job, history
+
+
+def insert_chunk(jobs, histories):
+    """Write one generated chunk in a single transaction; returns the number of status rows"""
+    statuses = [status for history in histories for status in history]
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Skip the per-row NOTIFY of live job events (migration 0012)
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL jobs.suppress_events = 'on'")
+
+        if supports_copy():
+            for job, job_id in zip(jobs, reserve_ids(Job, len(jobs))):
+                job.id = job_id
+            for status, status_id in zip(statuses, reserve_ids(JobStatus, len(statuses))):
+                status.id = status_id
+            link_histories(jobs, histories)
+            copy_instances(Job, jobs)
+            copy_instances(JobStatus, statuses)
+        else:
+            # bulk_create() stamps the auto_now fields with the current time
+            generated_times = [(job.created_at, job.updated_at) for job in jobs]
+            Job.objects.bulk_create(jobs)
+            link_histories(jobs, histories)
+            JobStatus.objects.bulk_create(statuses)
+            for job, history, (created_at, updated_at) in zip(jobs, histories, generated_times):
+                job.current_status_entry_id = history[-1].id
+                job.created_at, job.updated_at = created_at, updated_at
+            Job.objects.bulk_update(jobs, ['current_status_entry_id', 'created_at', 'updated_at'])
+    return len(statuses)
+
+
+def link_histories(jobs, histories):
+    """Point each history at its job, and the job at its latest entry when IDs are known"""
+    for job, history in zip(jobs, histories):
+        for status in history:
+            status.job_id = job.id
+        job.current_status_entry_id = history[-1].id
+
+
+def seed_chunk(options, chunk_number, count, now):
+    """Generate and insert one chunk; returns (jobs, status rows) written"""
+    jobs, histories = ChunkGenerator(options, chunk_number, now).generate(count)
+    return len(jobs), insert_chunk(jobs, histories)
+
+
+def clear_jobs():
+    """
+    Remove all jobs, their history and the rollups derived from it, without
+    loading rows into Python (TRUNCATE on PostgreSQL).
+    """
+    models = [JobStatus, Job, JobStatusRollup, RollupWatermark]
+    with transaction.atomic():
+        tables = [connection.ops.quote_name(model._meta.db_table) for model in models]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f"TRUNCATE {', '.join(tables)}")
+            else:
+                for table in tables:
+                    cursor.execute(f'DELETE FROM {table}')
+        transaction.on_commit(bump_jobs_version)
@@ -1,3 +1,8 @@
+from functools import partial
+from operator import itemgetter
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Job, JobStatus
 
@@ -19,11 +24,106 @@ class JobReadSerializer(serializers.ModelSerializer):
             'error_message', 'result_data', 'resource_requirements'
         ]
 
+    def __init__(self, *args, fields=None, **kwargs):
+        # Optional subset of Meta.fields, e.g. from ?fields= or ?view=
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def get_latest_status(self, obj):
-        latest = obj.latest_status
-        if latest:
-            return JobStatusSerializer(latest).data
+        # Built from the denormalized current_* columns so listing never
+        # has to load the job's status history
+        if not obj.current_status:
+            return None
+        return {
+            'id': obj.current_status_entry_id,
+            'status_type': obj.current_status,
+            'timestamp': serializers.DateTimeField().to_representation(obj.status_changed_at),
+            'message': obj.current_message,
+            'progress': obj.current_progress,
+        }
+
+
+# Columns each JobReadSerializer field is built from
+JOB_READ_FIELD_COLUMNS = {
+    'id': ('id',),
+    'name': ('name',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+    'latest_status': (
+        'current_status', 'current_progress', 'current_message', 'current_status_entry_id',
+        'status_changed_at',
+    ),
+    'description': ('description',),
+    'priority': ('priority',),
+    'scheduled_at': ('scheduled_at',),
+    'completed_at': ('completed_at',),
+    'error_message': ('error_message',),
+    'result_data': ('result_data',),
+    'resource_requirements': ('resource_requirements',),
+}
+
+# Named field sets for ?view=; summary leaves out the large and rarely shown ones
+JOB_READ_VIEWS = {
+    'full': tuple(JOB_READ_FIELD_COLUMNS),
+    'summary': (
+        'id', 'name', 'created_at', 'updated_at', 'latest_status', 'description', 'priority',
+        'completed_at',
+    ),
+}
+
+JOB_READ_DATETIME_FIELDS = {'created_at', 'updated_at', 'scheduled_at', 'completed_at'}
+
+
+def job_read_columns(fields):
+    """Columns needed to build the given JobReadSerializer fields"""
+    return list(dict.fromkeys(column for field in fields for column in JOB_READ_FIELD_COLUMNS[field]))
+
+
+def datetime_representation(value, tz):
+    """Same output as serializers.DateTimeField().to_representation() for aware datetimes"""
+    if not value:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def datetime_getter(field, tz):
+    return lambda row: datetime_representation(row[field], tz)
+
+
+def latest_status_representation(row, tz):
+    if not row['current_status']:
         return None
+    return {
+        'id': row['current_status_entry_id'],
+        'status_type': row['current_status'],
+        'timestamp': datetime_representation(row['status_changed_at'], tz),
+        'message': row['current_message'],
+        'progress': row['current_progress'],
+    }
+
+
+def job_rows_to_representation(rows, fields=JOB_READ_VIEWS['full']):
+    """
+    Build JobReadSerializer's output for `fields` from .values() rows holding
+    job_read_columns(fields), without per-field serializer objects. Keep in
+    step with JobReadSerializer: the two must render byte-for-byte identical JSON.
+    """
+    tz = timezone.get_current_timezone()
+    getters = []
+    for field in fields:
+        if field == 'latest_status':
+            getter = partial(latest_status_representation, tz=tz)
+        elif field in JOB_READ_DATETIME_FIELDS:
+            getter = datetime_getter(field, tz)
+        else:
+            getter = itemgetter(field)
+        getters.append((field, getter))
+    return [{field: getter(row) for field, getter in getters} for row in rows]
 
 
 class JobWriteSerializer(serializers.ModelSerializer):
@@ -35,9 +135,10 @@ class JobWriteSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        job = super().create(validated_data)
-        # Automatically create initial PENDING status
-        JobStatus.objects.create(job=job, status_type='PENDING')
+        with transaction.atomic():
+            job = super().create(validated_data)
+            # Automatically create initial PENDING status
+            job.record_status('PENDING')
         return job
 
 
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_jobs_version
+from .models import Job, JobStatus
+
+
+@receiver([post_save, post_delete], sender=Job)
+@receiver([post_save, post_delete], sender=JobStatus)
+def invalidate_jobs_cache(sender, **kwargs):
+    """Bump the jobs cache version once the write is committed"""
+    transaction.on_commit(bump_jobs_version)
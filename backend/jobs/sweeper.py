@@ -0,0 +1,104 @@
+import logging
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('jobs.performance')
+
+
+class StuckJobSweeper:
+    """
+    Fails RUNNING jobs whose latest status is older than their timeout.
+
+    The timeout for a job is, in order of precedence: the entry for its
+    resource_requirements "class" in JOB_STUCK_TIMEOUTS_BY_RESOURCE_CLASS,
+    the entry for its priority in JOB_STUCK_TIMEOUTS_BY_PRIORITY, or
+    JOB_STUCK_TIMEOUT. Candidates are found with a range scan on the
+    (current_status, status_changed_at) index, never the status history.
+    """
+
+    def __init__(self, default_timeout=None, priority_timeouts=None, class_timeouts=None, batch_size=None):
+        self.default_timeout = default_timeout or getattr(settings, 'JOB_STUCK_TIMEOUT', 7200)
+        self.priority_timeouts = priority_timeouts if priority_timeouts is not None else \
+            getattr(settings, 'JOB_STUCK_TIMEOUTS_BY_PRIORITY', {})
+        self.class_timeouts = class_timeouts if class_timeouts is not None else \
+            getattr(settings, 'JOB_STUCK_TIMEOUTS_BY_RESOURCE_CLASS', {})
+        self.batch_size = batch_size or getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000)
+
+    def get_timeout(self, priority, resource_requirements):
+        """Return (timeout_seconds, rule description) for a job"""
+        resource_class = None
+        if isinstance(resource_requirements, dict):
+            resource_class = resource_requirements.get('class')
+        if resource_class in self.class_timeouts:
+            return self.class_timeouts[resource_class], f'resource class "{resource_class}"'
+        if priority in self.priority_timeouts:
+            return self.priority_timeouts[priority], f'priority {priority}'
+        return self.default_timeout, 'default'
+
+    def find_stuck_jobs(self, now):
+        """
+        Return {message: [(job_id, status_changed_at), ...]} for every
+        stuck job, grouped by the error message it will be failed with.
+        """
+        shortest = min([self.default_timeout, *self.priority_timeouts.values(), *self.class_timeouts.values()])
+        candidates = Job.objects.filter(
+            current_status='RUNNING',
+            status_changed_at__lt=now - timezone.timedelta(seconds=shortest),
+        ).order_by().values_list('id', 'priority', 'resource_requirements', 'status_changed_at')
+
+        stuck = defaultdict(list)
+        rows = candidates.iterator(chunk_size=self.batch_size)
+        for job_id, priority, resource_requirements, status_changed_at in rows:
+            timeout, rule = self.get_timeout(priority, resource_requirements)
+            if status_changed_at < now - timezone.timedelta(seconds=timeout):
+                message = f'Timed out: no status update for over {timeout}s while RUNNING (limit for {rule})'
+                stuck[message].append((job_id, status_changed_at))
+        return stuck
+
+    def sweep(self, dry_run=False):
+        """
+        Move stuck jobs to FAILED in batched transactions. Returns a summary
+        with the number of jobs found and failed and the sweep duration.
+        """
+        start_time = time.monotonic()
+        stuck = self.find_stuck_jobs(timezone.now())
+        found = sum(len(jobs) for jobs in stuck.values())
+
+        failed = 0
+        if not dry_run:
+            for message, jobs in stuck.items():
+                for offset in range(0, len(jobs), self.batch_size):
+                    failed += self.fail_batch(jobs[offset:offset + self.batch_size], message)
+
+        summary = {
+            'found': found,
+            'failed': failed,
+            'dry_run': dry_run,
+            'duration_ms': round((time.monotonic() - start_time) * 1000, 2),
+        }
+        logger.info(f"Stuck job sweep: {summary}")
+        return summary
+
+    def fail_batch(self, jobs, message):
+        """
+        Fail one batch, skipping jobs that reported a new status since they
+        were selected or are locked by a concurrent update.
+        """
+        seen_at = dict(jobs)
+        with transaction.atomic():
+            locked = Job.objects.select_for_update(skip_locked=True).filter(
+                id__in=list(seen_at), current_status='RUNNING'
+            ).values_list('id', 'status_changed_at')
+            job_ids = [job_id for job_id, changed_at in locked if changed_at == seen_at[job_id]]
+            if not job_ids:
+                return 0
+
+            Job.objects.filter(id__in=job_ids).record_status('FAILED', message=message)
+            Job.objects.filter(id__in=job_ids).update(error_message=message)
+        return len(job_ids)
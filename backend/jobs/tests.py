@@ -1,3 +1,1216 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.renderers import JSONRenderer
+
+from .archive import JobArchiver, read_archived_job
+from .events import (
+    EventSubscription, JobEventListener, fetch_events_since, format_event, job_event_listener, stream_events,
+)
+from .management.base import PeriodicCommand
+from .middleware import RateLimitMiddleware
+from .models import Job, JobStatus, JobStatusRollup
+from .monitoring import HealthSampler, health_sampler
+from .partitions import (
+    DEFAULT_PARTITION, add_months, create_partition, is_partitioned, list_partitions, month_start,
+    remove_partitions_before,
+)
+from .querystats import QUERY_BUDGETS, assert_max_queries, normalize_sql
+from .renderers import FastJSONRenderer
+from .retention import compact_job_history
+from .rollups import get_timeseries, get_watermark, roll_up, truncate
+from .serializers import JOB_READ_VIEWS, JobReadSerializer
+from .sweeper import StuckJobSweeper
+from .views import JobViewSet
+
+
+def create_job(name='Test Job', priority=5, status_type='PENDING', timestamp=None):
+    job = Job.objects.create(name=name, priority=priority)
+    job.record_status(status_type, timestamp=timestamp)
+    return job
+
+
+class JobAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post_json(self, path, data):
+        return self.client.post(path, json.dumps(data), content_type='application/json')
+
+
+class CurrentStatusTests(TestCase):
+    def test_record_status_mirrors_the_latest_entry(self):
+        job = create_job()
+        started = timezone.now() - timedelta(minutes=5)
+        entry = job.record_status('RUNNING', message='Working', progress=40, timestamp=started)
+
+        job = Job.objects.get(pk=job.pk)
+        self.assertEqual(job.current_status, 'RUNNING')
+        self.assertEqual(job.current_progress, 40)
+        self.assertEqual(job.current_message, 'Working')
+        self.assertEqual(job.current_status_entry_id, entry.pk)
+        self.assertEqual(job.status_changed_at, started)
+        self.assertIsNone(job.completed_at)
+
+    def test_terminal_status_sets_completed_at(self):
+        job = create_job()
+        finished = timezone.now() - timedelta(minutes=1)
+        job.record_status('COMPLETED', progress=100, timestamp=finished)
+
+        job = Job.objects.get(pk=job.pk)
+        self.assertEqual(job.current_status, 'COMPLETED')
+        self.assertEqual(job.completed_at, finished)
+        self.assertEqual(job.status_changed_at, finished)
+
+    def test_queryset_record_status(self):
+        jobs = [create_job(f'Job {index}') for index in range(3)]
+        updated = Job.objects.filter(pk__in=[jobs[0].pk, jobs[1].pk]).record_status('FAILED', message='Boom')
+        self.assertEqual(sorted(updated), sorted([jobs[0].pk, jobs[1].pk]))
+
+        for job in Job.objects.filter(pk__in=updated):
+            latest = job.statuses.order_by('-id').first()
+            self.assertEqual(job.current_status, 'FAILED')
+            self.assertEqual(job.current_message, 'Boom')
+            self.assertEqual(job.current_status_entry_id, latest.pk)
+            self.assertEqual(job.status_changed_at, latest.timestamp)
+            self.assertEqual(job.completed_at, latest.timestamp)
+        self.assertEqual(Job.objects.get(pk=jobs[2].pk).current_status, 'PENDING')
+
+    def test_bulk_create_pending(self):
+        job_ids = Job.objects.bulk_create_pending([Job(name='First'), Job(name='Second')])
+        for job in Job.objects.filter(pk__in=job_ids):
+            entry = JobStatus.objects.get(job=job)
+            self.assertEqual((job.current_status, entry.status_type), ('PENDING', 'PENDING'))
+            self.assertEqual(job.current_status_entry_id, entry.pk)
+            self.assertEqual(job.status_changed_at, entry.timestamp)
+
+
+class BackfillCurrentStatusMigrationTests(TransactionTestCase):
+    migrate_from = [('jobs', '0003_job_current_status')]
+    migrate_to = [('jobs', '0004_backfill_job_current_status')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill_copies_the_latest_status(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        OldJob = apps.get_model('jobs', 'Job')
+        OldJobStatus = apps.get_model('jobs', 'JobStatus')
+
+        now = timezone.now()
+        job = OldJob.objects.create(name='With history')
+        OldJobStatus.objects.create(job=job, status_type='PENDING', timestamp=now - timedelta(minutes=10))
+        latest = OldJobStatus.objects.create(
+            job=job, status_type='RUNNING', progress=30, message='Going', timestamp=now - timedelta(minutes=5),
+        )
+        # Inserted last but older: the latest entry is picked by timestamp
+        OldJobStatus.objects.create(job=job, status_type='FAILED', timestamp=now - timedelta(minutes=20))
+        empty = OldJob.objects.create(name='Without history')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        apps = executor.loader.project_state(self.migrate_to).apps
+        NewJob = apps.get_model('jobs', 'Job')
+
+        job = NewJob.objects.get(pk=job.pk)
+        self.assertEqual(job.current_status, 'RUNNING')
+        self.assertEqual(job.current_progress, 30)
+        self.assertEqual(job.current_message, 'Going')
+        self.assertEqual(job.current_status_entry_id, latest.pk)
+        self.assertEqual(job.status_changed_at, latest.timestamp)
+        self.assertEqual(NewJob.objects.get(pk=empty.pk).current_status, '')
+
+
+class QueryStatsTests(TestCase):
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM jobs_job WHERE id IN (1, 2, 3) AND name = 'it''s'  AND priority > %s"),
+            'SELECT * FROM jobs_job WHERE id IN (...) AND name = ? AND priority > ?',
+        )
+        self.assertEqual(
+            normalize_sql('INSERT INTO "jobs_job" ("name") VALUES (%s, %s), (%s, %s)'),
+            normalize_sql('INSERT INTO "jobs_job" ("name") VALUES (%s, %s)'),
+        )
+        # Digits inside identifiers are not literals
+        self.assertEqual(normalize_sql('SELECT "t1"."col2" FROM t1'), 'SELECT "t1"."col2" FROM t1')
+
+    def test_assert_max_queries(self):
+        with assert_max_queries(2) as stats:
+            Job.objects.count()
+            Job.objects.exists()
+        self.assertEqual(stats.count, 2)
+
+        with self.assertRaisesMessage(AssertionError, 'Query budget of 1 exceeded'):
+            with assert_max_queries(1):
+                Job.objects.count()
+                Job.objects.exists()
+
+    def test_assert_max_repeats(self):
+        create_job('First')
+        create_job('Second')
+        with self.assertRaisesMessage(AssertionError, 'repeated more than 1 times'):
+            with assert_max_queries(10, max_repeats=1):
+                for job in Job.objects.all():
+                    Job.objects.get(pk=job.pk)
+
+
+class SQLInstrumentationTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        create_job()
+
+    @override_settings(JOB_SQL_INSTRUMENTATION=True, JOB_SQL_REPEAT_THRESHOLD=0)
+    def test_headers_and_repeated_query_warnings(self):
+        with self.assertLogs('jobs.performance', 'WARNING') as logs:
+            response = self.client.get('/api/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-DB-Queries']), 0)
+        self.assertTrue(response['X-DB-Time'].endswith('ms'))
+        self.assertIn('Repeated query', logs.output[0])
+
+    @override_settings(JOB_SQL_INSTRUMENTATION=False)
+    def test_off_by_default(self):
+        response = self.client.get('/api/jobs/')
+        self.assertFalse(response.has_header('X-DB-Queries'))
+
+
+# Budgets assume a table large enough for the unfiltered list to use the
+# planner's row estimate instead of COUNT(*)
+@override_settings(JOB_RESPONSE_CACHE_TTLS={}, JOB_COUNT_CACHE_TTL=0, JOB_COUNT_ESTIMATE_THRESHOLD=1)
+class QueryBudgetTests(JobAPITestCase):
+    """Every endpoint in QUERY_BUDGETS stays within its query budget on an uncached request"""
+
+    def setUp(self):
+        super().setUp()
+        for index in range(30):
+            create_job(f'Data job {index}', priority=index % 10 + 1, status_type='RUNNING')
+        self.job_id = Job.objects.order_by('-id').values_list('id', flat=True).first()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Job._meta.db_table}')
+
+    def test_endpoints_within_budget(self):
+        for name, (method, path, body, budget, max_repeats) in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                with assert_max_queries(budget, max_repeats):
+                    response = self.client.generic(
+                        method, path.format(job_id=self.job_id),
+                        '' if body is None else json.dumps(body), content_type='application/json',
+                    )
+                self.assertLess(response.status_code, 400)
+
+
+class CursorPaginationTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(7):
+            # Repeated priorities exercise the tie-breaking columns
+            create_job(f'Job {index}', priority=index % 3)
+        self.expected_ids = list(Job.objects.order_by('-priority', '-created_at', 'id').values_list('id', flat=True))
+
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json())
+            url = response.json()[direction]
+        return pages
+
+    def test_forward_and_back(self):
+        pages = self.walk('/api/jobs/?cursor=&page_size=3')
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertNotIn('count', pages[0])
+        self.assertIsNone(pages[0]['previous'])
+        self.assertEqual([row['id'] for page in pages for row in page['results']], self.expected_ids)
+
+        back = self.walk(pages[-1]['previous'], direction='previous')
+        self.assertEqual(
+            [row['id'] for page in reversed(back) for row in page['results']], self.expected_ids[:6],
+        )
+
+    def test_ordering_parameter(self):
+        pages = self.walk('/api/jobs/?cursor=&page_size=2&ordering=name')
+        names = [row['name'] for page in pages for row in page['results']]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), 7)
+
+    def test_invalid_cursors(self):
+        self.assertEqual(self.client.get('/api/jobs/?cursor=not-a-cursor').status_code, 404)
+        # A cursor is only valid for the ordering it was issued under
+        next_link = self.client.get('/api/jobs/?cursor=&page_size=2').json()['next']
+        self.assertEqual(self.client.get(f'{next_link}&ordering=name').status_code, 404)
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTLS={})
+class SparseFieldsetTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(7):
+            # Duplicate names exercise the id tie-breaker
+            create_job(f'Job {index // 2}')
+
+    def walk(self, url):
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            results.extend(response.json()['results'])
+            url = response.json()['next']
+        return results
+
+    def test_only_requested_columns_are_selected(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/?fields=priority,name&page_size=2')
+        self.assertEqual(list(response.json()['results'][0]), ['name', 'priority'])
+        select = queries[-1]['sql']
+        self.assertIn('"priority"', select)
+        self.assertNotIn('"description"', select)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/jobs/?view=summary')
+        self.assertNotIn('"result_data"', queries[-1]['sql'])
+
+    def test_unknown_fields_and_views(self):
+        response = self.client.get('/api/jobs/?fields=name,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['fields'])
+        self.assertEqual(self.client.get('/api/jobs/?view=tiny').status_code, 400)
+
+    def test_cursor_pages_with_ordering(self):
+        results = self.walk('/api/jobs/?cursor=&fields=name&ordering=name&page_size=2')
+        self.assertEqual(len(results), 7)
+        self.assertTrue(all(set(row) == {'name'} for row in results))
+        self.assertEqual([row['name'] for row in results], sorted(row['name'] for row in results))
+
+    def test_cursor_pages_with_default_ordering(self):
+        results = self.walk('/api/jobs/?cursor=&fields=id,priority&page_size=3')
+        self.assertEqual(sorted(row['id'] for row in results), sorted(Job.objects.values_list('id', flat=True)))
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTLS={}, JOB_COUNT_CACHE_TTL=60)
+class CountStrategyTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            create_job(f'Job {index}', priority=1 if index < 3 else 2)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Job._meta.db_table}')
+
+    def get_list(self, url):
+        """(response data, COUNT queries run)"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query['sql'] for query in queries if 'COUNT(' in query['sql']]
+
+    @skipUnless(connection.vendor == 'postgresql', 'Row estimates come from pg_class')
+    @override_settings(JOB_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_unfiltered_list_uses_the_estimate(self):
+        data, counts = self.get_list('/api/jobs/?page_size=2')
+        self.assertFalse(data['count_exact'])
+        self.assertGreater(data['count'], 0)
+        self.assertEqual(counts, [])
+
+        # Pages past an estimated count are still served
+        data, _ = self.get_list('/api/jobs/?page_size=2&page=3')
+        self.assertEqual(len(data['results']), 1)
+
+    @override_settings(JOB_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_filtered_list_counts_exactly(self):
+        data, counts = self.get_list('/api/jobs/?priority=1')
+        self.assertTrue(data['count_exact'])
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(len(counts), 1)
+
+    @override_settings(JOB_COUNT_ESTIMATE_THRESHOLD=1000000)
+    def test_small_tables_count_exactly(self):
+        data, counts = self.get_list('/api/jobs/')
+        self.assertTrue(data['count_exact'])
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(counts), 1)
+
+    @override_settings(JOB_CACHE_SHARED=True)
+    def test_filtered_counts_are_cached_until_a_write(self):
+        self.assertEqual(len(self.get_list('/api/jobs/?priority=1')[1]), 1)
+        # Paging and ordering don't change the count
+        data, counts = self.get_list('/api/jobs/?priority=1&page_size=1&ordering=name')
+        self.assertEqual((data['count'], counts), (3, []))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job('Another', priority=1)
+        data, counts = self.get_list('/api/jobs/?priority=1')
+        self.assertEqual((data['count'], len(counts)), (4, 1))
+
+    @override_settings(JOB_CACHE_SHARED=False)
+    def test_no_count_cache_without_a_shared_cache(self):
+        self.get_list('/api/jobs/?priority=1')
+        data, counts = self.get_list('/api/jobs/?priority=1')
+        self.assertEqual((data['count'], len(counts)), (3, 1))
+
+
+class ConditionalResponseTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = create_job()
+
+    @override_settings(JOB_CACHE_SHARED=True)
+    def test_writes_change_the_etag(self):
+        response = self.client.get('/api/jobs/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # The version is bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/jobs/{self.job.id}/', json.dumps({'status_type': 'RUNNING'}), content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['results'][0]['latest_status']['status_type'], 'RUNNING')
+
+    @override_settings(JOB_CACHE_SHARED=True)
+    def test_bulk_writes_change_the_etag(self):
+        etag = self.client.get(f'/api/jobs/{self.job.id}/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_json('/api/jobs/bulk_status_update/', {
+                'job_ids': [self.job.id], 'status': {'status_type': 'COMPLETED'},
+            })
+        response = self.client.get(f'/api/jobs/{self.job.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['latest_status']['status_type'], 'COMPLETED')
+
+    @override_settings(JOB_CACHE_SHARED=False)
+    def test_no_validators_without_a_shared_cache(self):
+        response = self.client.get('/api/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class BulkStatusUpdateTests(JobAPITestCase):
+    def test_missing_jobs_are_reported(self):
+        jobs = [create_job(f'Job {index}') for index in range(3)]
+        missing_id = max(job.id for job in jobs) + 100
+        response = self.post_json('/api/jobs/bulk_status_update/', {
+            'job_ids': [jobs[0].id, str(jobs[1].id), missing_id, jobs[0].id],
+            'status': {'status_type': 'RUNNING', 'progress': 10},
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated_jobs'], 2)
+        self.assertEqual(response.json()['not_found'], [missing_id])
+        statuses = dict(Job.objects.values_list('id', 'current_status'))
+        self.assertEqual(statuses, {jobs[0].id: 'RUNNING', jobs[1].id: 'RUNNING', jobs[2].id: 'PENDING'})
+        self.assertEqual(JobStatus.objects.filter(job=jobs[0], status_type='RUNNING').count(), 1)
+
+    @override_settings(JOB_BULK_CHUNK_SIZE=2)
+    def test_updates_in_chunks(self):
+        jobs = [create_job(f'Job {index}') for index in range(5)]
+        response = self.post_json('/api/jobs/bulk_status_update/', {
+            'job_ids': [job.id for job in jobs], 'status': {'status_type': 'CANCELLED'},
+        })
+        self.assertEqual(response.json()['updated_jobs'], 5)
+        self.assertEqual(Job.objects.filter(current_status='CANCELLED', completed_at__isnull=False).count(), 5)
+
+    def test_job_ids_must_be_a_list(self):
+        jobs = [create_job(f'Job {index}') for index in range(2)]
+        for job_ids in [f'{jobs[0].id}{jobs[1].id}', {'id': jobs[0].id}, [jobs[0].id, 'x']]:
+            with self.subTest(job_ids=job_ids):
+                response = self.post_json('/api/jobs/bulk_status_update/', {
+                    'job_ids': job_ids, 'status': {'status_type': 'RUNNING'},
+                })
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.filter(current_status='RUNNING').exists())
+
+    def test_invalid_status(self):
+        job = create_job()
+        response = self.post_json('/api/jobs/bulk_status_update/', {
+            'job_ids': [job.id], 'status': {'status_type': 'EXPLODED'},
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkCreateTests(JobAPITestCase):
+    def test_invalid_rows_are_reported_without_aborting_the_rest(self):
+        response = self.post_json('/api/jobs/bulk_create/', [
+            {'name': 'First', 'priority': 3},
+            {'name': 'Bad priority', 'priority': 'high'},
+            {'name': 'Third'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created_jobs'], 2)
+        self.assertEqual([error['index'] for error in data['errors']], [1])
+        self.assertIsNone(data['ids'][1])
+        created = Job.objects.filter(id__in=[data['ids'][0], data['ids'][2]])
+        self.assertEqual(sorted(created.values_list('name', flat=True)), ['First', 'Third'])
+        self.assertEqual(set(created.values_list('current_status', flat=True)), {'PENDING'})
+        self.assertEqual(JobStatus.objects.filter(job__in=created, status_type='PENDING').count(), 2)
+
+    def test_ndjson_parse_errors(self):
+        body = '{"name": "Streamed"}\nnot json\n\n{"name": "Also streamed"}\n'
+        response = self.client.post('/api/jobs/bulk_create/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created_jobs'], 2)
+        self.assertEqual([error['index'] for error in data['errors']], [1])
+
+    def test_ndjson_without_content_length(self):
+        response = self.client.post(
+            '/api/jobs/bulk_create/', '{"name": "Chunked"}\n', content_type='application/x-ndjson',
+            CONTENT_LENGTH='', HTTP_TRANSFER_ENCODING='chunked',
+        )
+        self.assertEqual(response.status_code, 411)
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_no_rows(self):
+        for body, content_type in [('[]', 'application/json'), ('\n', 'application/x-ndjson')]:
+            with self.subTest(content_type=content_type):
+                response = self.client.post('/api/jobs/bulk_create/', body, content_type=content_type)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'No jobs to create'})
+
+    def test_all_rows_invalid(self):
+        response = self.post_json('/api/jobs/bulk_create/', [{'priority': 1}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Job.objects.count(), 0)
+
+
+class FastReadPathTests(JobAPITestCase):
+    """The values()-based read path renders exactly what JobReadSerializer + JSONRenderer would"""
+
+    def setUp(self):
+        super().setUp()
+        create_job('Plain')
+        self.job = Job.objects.create(
+            name='Caf\u00e9 \u2713 \u2028', description='Nightly "export"', priority=9,
+            scheduled_at=timezone.now() + timedelta(hours=1),
+            result_data={'rows': 3, 'ratio': 0.25, 'nested': [1, 'x', None]},
+            resource_requirements={'class': 'gpu', 'memory_gb': 16},
+        )
+        self.job.record_status('RUNNING', message='Halfway', progress=50)
+        self.job.record_status('COMPLETED', progress=100)
+        # No status yet: latest_status is null
+        Job.objects.create(name='Unstarted')
+
+    def assert_renders_like_serializer(self, data, jobs, fields, many=True):
+        expected = JSONRenderer().render(JobReadSerializer(jobs, many=many, fields=fields).data)
+        self.assertEqual(JSONRenderer().render(data), expected)
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+
+    def test_list(self):
+        for view, fields in JOB_READ_VIEWS.items():
+            with self.subTest(view=view):
+                response = self.client.get(f'/api/jobs/?view={view}')
+                self.assertEqual(response.status_code, 200)
+                jobs = Job.objects.order_by(*JobViewSet.ordering)
+                self.assert_renders_like_serializer(response.data['results'], jobs, fields)
+
+        response = self.client.get('/api/jobs/?fields=latest_status,name')
+        self.assert_renders_like_serializer(
+            response.data['results'], Job.objects.order_by(*JobViewSet.ordering), ['name', 'latest_status'],
+        )
+
+    def test_detail(self):
+        for view, fields in JOB_READ_VIEWS.items():
+            with self.subTest(view=view):
+                response = self.client.get(f'/api/jobs/{self.job.pk}/?view={view}')
+                self.assertEqual(response.status_code, 200)
+                self.assert_renders_like_serializer(response.data, Job.objects.get(pk=self.job.pk), fields, many=False)
+
+    def test_update(self):
+        for view, fields in JOB_READ_VIEWS.items():
+            with self.subTest(view=view):
+                response = self.client.patch(
+                    f'/api/jobs/{self.job.pk}/?view={view}',
+                    json.dumps({'status_type': 'RUNNING', 'progress': 10, 'message': 'Retrying'}),
+                    content_type='application/json',
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assert_renders_like_serializer(response.data, Job.objects.get(pk=self.job.pk), fields, many=False)
+
+
+class SearchTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Job.objects.create(name='Data Processing Pipeline', description='Process large CSV files')
+        Job.objects.create(name='Image Resizing Batch', description='Resize images for the data_team')
+        Job.objects.create(name='Report Generation', description='Monthly report')
+
+    def search(self, term, **params):
+        response = self.client.get('/api/jobs/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['name'] for row in response.json()['results'])
+
+    def test_matches_name_and_description(self):
+        self.assertEqual(self.search('Data Proc'), ['Data Processing Pipeline'])
+        self.assertEqual(self.search('data'), ['Data Processing Pipeline', 'Image Resizing Batch'])
+        self.assertEqual(self.search('report'), ['Report Generation'])
+        self.assertEqual(self.search('nothing'), [])
+
+    def test_operator_and_punctuation_characters(self):
+        for term in ["&|!():'", "it's", 'data & !report', '(data', 'data:*', ':*', 'a\\b', '"data"', '<->']:
+            with self.subTest(term=term):
+                # Ill-formed input never reaches the database as a broken query
+                self.search(term)
+
+    def test_empty_terms(self):
+        for term in ['', '   ', ',']:
+            with self.subTest(term=term):
+                self.assertEqual(len(self.search(term)), 3)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_prefix_matches_rank_name_matches_first(self):
+        self.assertEqual(self.search('proc data'), ['Data Processing Pipeline'])
+        # Split on underscores as the tsvector is
+        self.assertEqual(self.search('data_team'), ['Image Resizing Batch'])
+        # Operators are dropped, leaving the words
+        self.assertEqual(self.search('(data)'), ['Data Processing Pipeline', 'Image Resizing Batch'])
+        self.assertEqual(self.search('!report'), ['Report Generation'])
+
+        response = self.client.get('/api/jobs/', {'search': 'data'})
+        self.assertEqual(
+            [row['name'] for row in response.json()['results']], ['Data Processing Pipeline', 'Image Resizing Batch'],
+        )
+
+    @skipIf(connection.vendor == 'postgresql', 'Other databases fall back to icontains')
+    def test_icontains_fallback(self):
+        # Substrings match anywhere, not only at the start of a word
+        self.assertEqual(self.search('esizing'), ['Image Resizing Batch'])
+        self.assertEqual(self.search('data_team'), ['Image Resizing Batch'])
+        self.assertEqual(self.search('report monthly'), ['Report Generation'])
+
+
+class RateLimitTests(TestCase):
+    """The sliding-window limiter on the generic cache path (LocMemCache)"""
+
+    def setUp(self):
+        cache.clear()
+        self.middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        self.middleware.rate_limits['read'] = {'requests': 3, 'window': 60}
+        self.factory = RequestFactory()
+
+    def get(self, path='/api/jobs/', ip='10.0.0.1'):
+        return self.middleware(self.factory.get(path, REMOTE_ADDR=ip))
+
+    def at(self, seconds):
+        return mock.patch('jobs.middleware.time.time', return_value=seconds)
+
+    def test_allows_requests_within_the_limit(self):
+        with self.at(600.0):
+            responses = [self.get() for _ in range(3)]
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200])
+        self.assertEqual([response['X-RateLimit-Remaining'] for response in responses], ['2', '1', '0'])
+        self.assertEqual(responses[0]['X-RateLimit-Limit'], '3')
+        self.assertEqual(responses[0]['X-RateLimit-Reset'], '660')
+
+    def test_rejects_requests_over_the_limit(self):
+        with self.at(600.0):
+            for _ in range(3):
+                self.get()
+            response = self.get()
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '60')
+            self.assertEqual(json.loads(response.content)['error'], 'Rate limit exceeded')
+
+            # Other clients, exempt clients and non-API paths are unaffected
+            self.assertEqual(self.get(ip='10.0.0.2').status_code, 200)
+            self.assertEqual(self.get(ip='127.0.0.1').status_code, 200)
+            self.assertEqual(self.get(path='/health/').status_code, 200)
+
+    def test_window_rollover(self):
+        with self.at(600.0):
+            for _ in range(3):
+                self.get()
+        # Halfway through the next window half of the previous count remains
+        with self.at(690.0), mock.patch.object(cache, 'get', wraps=cache.get) as cache_get:
+            self.assertEqual(self.get().status_code, 200)
+            self.assertEqual(self.get().status_code, 429)
+            # The closed window's count is read from the cache once
+            self.assertEqual(cache_get.call_count, 1)
+        # Two windows on, nothing of the old counts is left
+        with self.at(780.0):
+            self.assertEqual([self.get().status_code for _ in range(4)], [200, 200, 200, 429])
+
+
+class HealthEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # A fresh sampler per test, with host resource usage kept out of it
+        self.system_health = {'status': 'healthy'}
+        self.sampler = HealthSampler(
+            dict(health_sampler.checks, system=lambda: dict(self.system_health)), interval=15,
+        )
+        for patcher in [
+            mock.patch('jobs.monitoring.health_sampler', self.sampler),
+            mock.patch.object(self.sampler, 'start'),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_liveness(self):
+        response = self.client.get('/health/live/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'alive')
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(self.client.post('/health/live/').status_code, 405)
+
+    def test_readiness(self):
+        response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ready')
+
+        with mock.patch('jobs.monitoring.connection') as broken:
+            broken.cursor.side_effect = Exception('connection refused')
+            with self.assertLogs('jobs.performance', 'ERROR'):
+                response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'not_ready')
+
+    def test_first_probe_is_sampled_inline(self):
+        response = self.client.get('/health/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], 'healthy')
+        self.assertEqual(set(data['checks']), {'database', 'cache', 'jobs', 'system'})
+        self.assertTrue(all('age_seconds' in check for check in data['checks'].values()))
+        self.sampler.start.assert_called_once()
+
+    def test_failed_and_stale_checks(self):
+        self.system_health = {'status': 'degraded', 'warnings': ['High CPU usage']}
+        response = self.client.get('/health/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual((response.json()['status'], response.json()['failed_checks']), ('degraded', ['system']))
+
+        # Samples older than three intervals are stale
+        for name, (sampled_at, result) in self.sampler.snapshot().items():
+            self.sampler._results[name] = (sampled_at - 60, result)
+        data = self.client.get('/health/').json()
+        self.assertEqual(data['status'], 'unhealthy')
+        self.assertEqual({check['status'] for check in data['checks'].values()}, {'stale'})
+
+
+class PrometheusMetricsTests(JobAPITestCase):
+    def request_count(self, route, status='200'):
+        labels = {'route': route, 'method': 'GET', 'status': status}
+        return REGISTRY.get_sample_value('jobs_http_requests_total', labels) or 0
+
+    def test_exposition(self):
+        before = self.request_count('job-list')
+        self.assertEqual(self.client.get('/api/jobs/').status_code, 200)
+        self.assertEqual(self.request_count('job-list'), before + 1)
+
+        response = self.client.get('/metrics/prometheus/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        for name in [
+            'jobs_http_request_duration_seconds_bucket{', 'jobs_http_requests_total{',
+            'jobs_db_query_duration_seconds_bucket{', 'jobs_db_queries_total{',
+        ]:
+            self.assertIn(name, body)
+        # Routes are labelled by URL pattern name, never the raw path
+        self.assertIn('route="job-list"', body)
+        self.assertNotIn('/api/jobs/', body)
+
+    def test_scrapes_are_not_recorded(self):
+        self.client.get('/metrics/prometheus/')
+        self.assertNotIn('route="prometheus_metrics"', self.client.get('/metrics/prometheus/').content.decode())
+
+
+class PerformanceMetricsTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        for minutes in [10, 20, 30]:
+            job = create_job(timestamp=now - timedelta(minutes=minutes))
+            job.record_status('COMPLETED', timestamp=now)
+        create_job()
+
+    def test_application_metrics(self):
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data), {'timestamp', 'application', 'database', 'system', 'response_time_ms'})
+        application = data['application']
+        self.assertEqual(application['total_jobs'], 4)
+        self.assertEqual(application['status_distribution']['completed'], 3)
+        self.assertEqual(application['status_distribution']['pending'], 1)
+        self.assertEqual(set(application['completion_time_seconds']), {'p50', 'p90', 'p99'})
+        if connection.vendor == 'postgresql':
+            self.assertIsNotNone(application['completion_time_seconds']['p50'])
+            self.assertIn('jobs_job', [table['table'] for table in data['database']['table_statistics']])
+
+    @override_settings(APP_METRICS_CACHE_TTL=60)
+    def test_application_metrics_are_cached(self):
+        self.assertEqual(self.client.get('/metrics/').json()['application']['total_jobs'], 4)
+        create_job()
+        # Served from the cache until the TTL expires
+        self.assertEqual(self.client.get('/metrics/').json()['application']['total_jobs'], 4)
+        cache.clear()
+        self.assertEqual(self.client.get('/metrics/').json()['application']['total_jobs'], 5)
+
+
+class RollupTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = truncate(timezone.now(), 'minute')
+        self.first = create_job('Old', priority=2, timestamp=self.now - timedelta(minutes=30))
+        self.first.record_status('RUNNING', timestamp=self.now - timedelta(minutes=20))
+        self.second = create_job('Recent', priority=7, timestamp=self.now - timedelta(seconds=30))
+
+    def test_watermark_stops_short_of_the_grace_period(self):
+        watermark = roll_up(now=self.now, grace=120)
+        self.assertEqual(watermark, self.now - timedelta(minutes=2))
+        self.assertEqual(get_watermark(), watermark)
+        # Only the two closed transitions are rolled up
+        self.assertEqual(sum(JobStatusRollup.objects.values_list('count', flat=True)), 2)
+
+    def test_rolling_up_again_counts_nothing_twice(self):
+        roll_up(now=self.now, grace=120)
+        roll_up(now=self.now, grace=120)
+        self.assertEqual(sum(JobStatusRollup.objects.values_list('count', flat=True)), 2)
+
+        roll_up(now=self.now + timedelta(minutes=5), grace=120)
+        self.assertEqual(sum(JobStatusRollup.objects.values_list('count', flat=True)), 3)
+
+    def test_timeseries_matches_live_counts(self):
+        start, end = self.now - timedelta(hours=1), self.now
+        live = get_timeseries(start, end, 'minute')
+        roll_up(now=self.now, grace=120)
+        self.assertEqual(get_timeseries(start, end, 'minute'), live)
+        self.assertEqual(sum(bucket['created'] for bucket in live), 2)
+        self.assertEqual(sum(bucket['started'] for bucket in live), 1)
+
+        self.assertEqual(sum(bucket['created'] for bucket in get_timeseries(start, end, 'minute', priority=7)), 1)
+
+    def test_no_history(self):
+        JobStatus.objects.all().delete()
+        self.assertIsNone(roll_up(now=self.now))
+        self.assertIsNone(get_watermark())
+
+    def test_endpoint(self):
+        roll_up(now=self.now, grace=120)
+        response = self.client.get('/api/jobs/timeseries/?bucket=minute')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(sum(bucket['created'] for bucket in results), 2)
+        self.assertEqual(sum(bucket['started'] for bucket in results), 1)
+
+        self.assertEqual(self.client.get('/api/jobs/timeseries/?bucket=week').status_code, 400)
+        response = self.client.get('/api/jobs/timeseries/?created_after=2030-01-02&created_before=2030-01-01')
+        self.assertEqual(response.status_code, 400)
+
+
+def make_running(job, minutes_ago):
+    job.record_status('RUNNING', progress=10, timestamp=timezone.now() - timedelta(minutes=minutes_ago))
+    return job
+
+
+@override_settings(JOB_STUCK_TIMEOUT=3600, JOB_STUCK_TIMEOUTS_BY_PRIORITY={}, JOB_STUCK_TIMEOUTS_BY_RESOURCE_CLASS={})
+class StuckJobSweeperTests(TestCase):
+    def test_fails_only_stuck_running_jobs(self):
+        stuck = make_running(create_job('Stuck'), minutes_ago=90)
+        recent = make_running(create_job('Recent'), minutes_ago=10)
+        pending = create_job('Old pending', timestamp=timezone.now() - timedelta(hours=5))
+        done = create_job('Old done')
+        done.record_status('COMPLETED', timestamp=timezone.now() - timedelta(hours=5))
+
+        summary = StuckJobSweeper().sweep()
+        self.assertEqual((summary['found'], summary['failed']), (1, 1))
+
+        statuses = dict(Job.objects.values_list('name', 'current_status'))
+        self.assertEqual(statuses, {
+            'Stuck': 'FAILED', 'Recent': 'RUNNING', 'Old pending': 'PENDING', 'Old done': 'COMPLETED',
+        })
+        stuck.refresh_from_db()
+        self.assertTrue(stuck.error_message.startswith('Timed out: no status update for over 3600s'))
+        self.assertIsNotNone(stuck.completed_at)
+        self.assertEqual(stuck.statuses.order_by('-id').first().message, stuck.error_message)
+        self.assertEqual(Job.objects.exclude(pk=stuck.pk).exclude(error_message='').count(), 0)
+        self.assertEqual(recent.statuses.count(), 2)
+        self.assertEqual(pending.statuses.count(), 1)
+
+    def test_timeout_rules(self):
+        gpu = create_job('GPU')
+        Job.objects.filter(pk=gpu.pk).update(resource_requirements={'class': 'gpu'})
+        make_running(gpu, minutes_ago=90)
+        urgent = make_running(create_job('Urgent', priority=10), minutes_ago=20)
+        normal = make_running(create_job('Normal'), minutes_ago=20)
+
+        sweeper = StuckJobSweeper(priority_timeouts={10: 600}, class_timeouts={'gpu': 4 * 3600})
+        sweeper.sweep()
+        statuses = dict(Job.objects.values_list('id', 'current_status'))
+        self.assertEqual(statuses, {gpu.pk: 'RUNNING', urgent.pk: 'FAILED', normal.pk: 'RUNNING'})
+        self.assertIn('limit for priority 10', Job.objects.get(pk=urgent.pk).error_message)
+
+    def test_dry_run(self):
+        make_running(create_job(), minutes_ago=90)
+        self.assertEqual(StuckJobSweeper().sweep(dry_run=True)['found'], 1)
+        self.assertEqual(Job.objects.get().current_status, 'RUNNING')
+
+    def test_jobs_updated_after_selection_are_skipped(self):
+        job = make_running(create_job(), minutes_ago=90)
+        sweeper = StuckJobSweeper()
+        stuck = sweeper.find_stuck_jobs(timezone.now())
+        job.record_status('RUNNING', progress=50)
+        for message, jobs in stuck.items():
+            self.assertEqual(sweeper.fail_batch(jobs, message), 0)
+        self.assertEqual(Job.objects.get().current_status, 'RUNNING')
+
+    def test_command(self):
+        make_running(create_job(), minutes_ago=90)
+        out = StringIO()
+        call_command('sweep_stuck_jobs', '--dry-run', stdout=out)
+        self.assertIn('Found 1 stuck jobs', out.getvalue())
+        call_command('sweep_stuck_jobs', stdout=out)
+        self.assertIn('Failed 1 stuck jobs', out.getvalue())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'SKIP LOCKED needs PostgreSQL')
+@override_settings(JOB_STUCK_TIMEOUT=3600, JOB_STUCK_TIMEOUTS_BY_PRIORITY={}, JOB_STUCK_TIMEOUTS_BY_RESOURCE_CLASS={})
+class StuckJobSweeperLockingTests(TransactionTestCase):
+    def test_locked_jobs_are_skipped(self):
+        locked_job = make_running(create_job('Locked'), minutes_ago=90)
+        free_job = make_running(create_job('Free'), minutes_ago=90)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Job.objects.select_for_update().get(pk=locked_job.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            summary = StuckJobSweeper().sweep()
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual((summary['found'], summary['failed']), (2, 1))
+        self.assertEqual(Job.objects.get(pk=locked_job.pk).current_status, 'RUNNING')
+        self.assertEqual(Job.objects.get(pk=free_job.pk).current_status, 'FAILED')
+
+
+class PeriodicCommandTests(TestCase):
+    class Command(PeriodicCommand):
+        interval_setting = 'TEST_INTERVAL'
+        task_name = 'test task'
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.runs = 0
+
+        def run_once(self, options):
+            self.runs += 1
+            if self.runs == 1:
+                raise RuntimeError('transient')
+
+    def test_run_once_is_required(self):
+        class Incomplete(PeriodicCommand):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_loop_survives_errors(self):
+        command = self.Command(stdout=StringIO())
+        # Stop the loop on its third sleep
+        with mock.patch('jobs.management.base.time.sleep', side_effect=[None, None, KeyboardInterrupt]), \
+                self.assertLogs('jobs.performance', 'ERROR') as logs, self.assertRaises(KeyboardInterrupt):
+            command.handle(loop=True, interval=5)
+        self.assertEqual(command.runs, 3)
+        self.assertIn('test task failed: transient', logs.output[0])
+
+
+class CompactJobHistoryTests(TestCase):
+    def create_history(self, name, steps, start):
+        """A job with one status per (status_type, progress) step, a minute apart"""
+        job = Job.objects.create(name=name)
+        for minute, (status_type, progress) in enumerate(steps):
+            job.record_status(status_type, progress=progress, timestamp=start + timedelta(minutes=minute))
+        return job
+
+    def history(self, job):
+        return list(job.statuses.order_by('timestamp', 'id').values_list('status_type', 'progress'))
+
+    def test_keeps_the_first_and_last_entry_of_each_status(self):
+        old = timezone.now() - timedelta(days=40)
+        steps = [
+            ('PENDING', None), ('RUNNING', 10), ('RUNNING', 20), ('RUNNING', 30), ('FAILED', None),
+            ('RUNNING', 40), ('RUNNING', 50), ('COMPLETED', 100),
+        ]
+        finished = self.create_history('Finished', steps, old)
+        recent = self.create_history('Recent', steps, timezone.now() - timedelta(days=1))
+        running = self.create_history('Still running', steps[:4], old)
+
+        deleted = compact_job_history(timezone.now() - timedelta(days=30), batch_size=1)
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(
+            self.history(finished),
+            [('PENDING', None), ('RUNNING', 10), ('FAILED', None), ('RUNNING', 50), ('COMPLETED', 100)],
+        )
+        finished.refresh_from_db()
+        self.assertTrue(JobStatus.objects.filter(pk=finished.current_status_entry_id).exists())
+        self.assertEqual(len(self.history(recent)), 8)
+        self.assertEqual(len(self.history(running)), 4)
+
+        # Nothing left to compact
+        self.assertEqual(compact_job_history(timezone.now() - timedelta(days=30)), 0)
+
+
+def use_archive_dir(test):
+    """Point JOB_ARCHIVE_DIR at a temporary directory for the test"""
+    archive_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(archive_dir.cleanup)
+    settings_override = override_settings(JOB_ARCHIVE_DIR=archive_dir.name)
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    return Path(archive_dir.name)
+
+
+def create_finished_job(name, status_type='COMPLETED', days_ago=100):
+    finished = timezone.now() - timedelta(days=days_ago)
+    job = create_job(name, timestamp=finished - timedelta(minutes=10))
+    job.record_status('RUNNING', progress=50, timestamp=finished - timedelta(minutes=5))
+    job.record_status(status_type, timestamp=finished)
+    return job
+
+
+class JobArchiverTests(JobAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.archive_dir = use_archive_dir(self)
+        self.cutoff = timezone.now() - timedelta(days=90)
+
+    def test_archives_old_terminal_jobs(self):
+        done = create_finished_job('Old done')
+        failed = create_finished_job('Old failed', status_type='FAILED')
+        create_finished_job('Recent done', days_ago=10)
+        create_job('Old pending', timestamp=timezone.now() - timedelta(days=100))
+        restarted = create_finished_job('Restarted')
+        restarted.record_status('RUNNING', progress=0)
+
+        self.assertEqual(JobArchiver(self.cutoff, block_size=1).run(), 2)
+
+        self.assertEqual(
+            set(Job.objects.values_list('name', flat=True)), {'Recent done', 'Old pending', 'Restarted'}
+        )
+        self.assertFalse(JobStatus.objects.filter(job_id__in=[done.pk, failed.pk]).exists())
+        self.assertEqual(restarted.statuses.count(), 4)
+
+        record = read_archived_job(done.pk)
+        self.assertEqual(record['job']['name'], 'Old done')
+        self.assertEqual([status['status_type'] for status in record['statuses']], ['PENDING', 'RUNNING', 'COMPLETED'])
+        self.assertEqual(read_archived_job(failed.pk)['job']['current_status'], 'FAILED')
+        self.assertIsNone(read_archived_job(restarted.pk))
+
+        response = self.client.get(f'/api/jobs/archived/{failed.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['job']['name'], 'Old failed')
+        self.assertEqual(self.client.get(f'/api/jobs/archived/{restarted.pk}/').status_code, 404)
+
+    def test_nothing_to_archive_leaves_no_file(self):
+        create_finished_job('Recent done', days_ago=10)
+        self.assertEqual(JobArchiver(self.cutoff).run(), 0)
+        self.assertEqual(list(self.archive_dir.iterdir()), [])
+
+    def test_jobs_restarted_after_selection_are_kept(self):
+        job = create_finished_job('Old done')
+        archiver = JobArchiver(self.cutoff)
+        job_ids = archiver.candidates(0)
+        self.assertEqual(job_ids, [job.pk])
+        job.record_status('RUNNING', progress=0)
+
+        with open(self.archive_dir / archiver.archive_file, 'ab') as archive:
+            self.assertEqual(archiver.archive_batch(archive, job_ids), 0)
+        self.assertEqual(Job.objects.get().current_status, 'RUNNING')
+        self.assertEqual(job.statuses.count(), 4)
+        self.assertIsNone(read_archived_job(job.pk))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'SKIP LOCKED needs PostgreSQL')
+class JobArchiverLockingTests(TransactionTestCase):
+    def test_locked_jobs_are_skipped(self):
+        use_archive_dir(self)
+        locked_job = create_finished_job('Locked')
+        free_job = create_finished_job('Free')
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Job.objects.select_for_update().get(pk=locked_job.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            archived = JobArchiver(timezone.now() - timedelta(days=90)).run()
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(archived, 1)
+        self.assertEqual(list(Job.objects.values_list('name', flat=True)), ['Locked'])
+        self.assertEqual(locked_job.statuses.count(), 3)
+        self.assertEqual(read_archived_job(free_job.pk)['job']['name'], 'Free')
+
+
+def event_ids(events):
+    return [event['id'] for event in events]
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Job events need PostgreSQL LISTEN/NOTIFY')
+class JobEventTests(TransactionTestCase):
+    def test_listener_publishes_status_inserts(self):
+        listener = JobEventListener()
+        received, delivered = [], threading.Event()
+        listener.subscribe(lambda event: (received.append(event), delivered.set()))
+        conn = listener.connect()
+
+        def listen():
+            try:
+                listener.listen(conn)
+            except Exception:
+                pass  # Closing the connection ends the loop
+
+        thread = threading.Thread(target=listen, daemon=True)
+        thread.start()
+        try:
+            job = create_job('Listened', priority=7)
+            self.assertTrue(delivered.wait(10))
+        finally:
+            conn.close()
+            thread.join(10)
+        self.assertEqual(received[0]['event'], 'job_created')
+        self.assertEqual((received[0]['job_id'], received[0]['priority']), (job.pk, 7))
+
+    def test_replay_rereads_late_commits(self):
+        job = create_job()
+        inserted, release = threading.Event(), threading.Event()
+        late = []
+
+        def insert_late():
+            try:
+                with transaction.atomic():
+                    late.append(JobStatus.objects.create(job_id=job.pk, status_type='RUNNING').pk)
+                    inserted.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=insert_late)
+        thread.start()
+        try:
+            self.assertTrue(inserted.wait(10))
+            last_event_id = JobStatus.objects.create(job_id=job.pk, status_type='RUNNING', progress=50).pk
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertLess(late[0], last_event_id)
+        self.assertNotIn(late[0], event_ids(fetch_events_since(last_event_id, 10)))
+        self.assertIn(late[0], event_ids(fetch_events_since(last_event_id, 10, overlap=10)))
+
+    @override_settings(JOB_EVENTS_REPLAY_OVERLAP=1)
+    def test_stream_skips_only_replayed_events(self):
+        job = create_job()
+        first, second = (JobStatus.objects.create(job_id=job.pk, status_type='RUNNING').pk for _ in range(2))
+        events = {event['id']: event for event in fetch_events_since(first - 1, 10)}
+
+        async def collect():
+            subscription = EventSubscription(asyncio.get_running_loop())
+            stream = stream_events(subscription, last_event_id=second)
+            try:
+                chunks = [await anext(stream), await anext(stream)]
+                # The replayed event again, then one that committed late
+                subscription.queue.put_nowait(events[second])
+                subscription.queue.put_nowait(events[first])
+                chunks.append(await anext(stream))
+            finally:
+                await stream.aclose()
+            return chunks
+
+        with mock.patch.object(job_event_listener, 'start'):
+            chunks = async_to_sync(collect)()
+        self.assertEqual(chunks[1:], [format_event(events[second]), format_event(events[first])])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'jobs_jobstatus is only partitioned on PostgreSQL')
+class JobStatusPartitionTests(TestCase):
+    def count_rows(self, table, start):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT count(*) FROM {table} WHERE "timestamp" >= %s AND "timestamp" < %s',
+                [start, add_months(start, 1)],
+            )
+            return cursor.fetchone()[0]
+
+    def test_create_partition_moves_rows_out_of_the_default_partition(self):
+        self.assertTrue(is_partitioned())
+        start = month_start(timezone.now() + timedelta(days=5 * 365))
+        self.assertNotIn(start, list_partitions())
+        job = create_job()
+        for day in range(3):
+            job.record_status('RUNNING', timestamp=start + timedelta(days=day))
+        self.assertEqual(self.count_rows(DEFAULT_PARTITION, start), 3)
+
+        name = create_partition(start)
+
+        self.assertEqual(list_partitions()[start], name)
+        self.assertEqual(self.count_rows(DEFAULT_PARTITION, start), 0)
+        self.assertEqual(self.count_rows(name, start), 3)
+        self.assertEqual(job.statuses.count(), 4)
+        # New rows for the month go straight to its partition
+        job.record_status('COMPLETED', timestamp=start + timedelta(days=10))
+        self.assertEqual(self.count_rows(name, start), 4)
+
+    def test_remove_partitions_before(self):
+        start = datetime(2001, 1, 1, tzinfo=dt_timezone.utc)
+        name = create_partition(start)
+        self.assertEqual(remove_partitions_before(add_months(start, 1)), [name])
+        self.assertNotIn(start, list_partitions())
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            self.assertIsNone(cursor.fetchone()[0])
+
+        name = create_partition(start)
+        self.assertEqual(remove_partitions_before(add_months(start, 1), detach_only=True), [name])
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            self.assertIsNotNone(cursor.fetchone()[0])
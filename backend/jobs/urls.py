@@ -1,13 +1,19 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import JobViewSet
-from .monitoring import health_check, performance_metrics
+from .events import job_events
+from .monitoring import health_check, liveness_check, readiness_check, performance_metrics, prometheus_metrics
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet)
 
 urlpatterns = [
+    # Before the router, which would otherwise match events as a job pk
+    path('api/jobs/events/', job_events, name='job_events'),
     path('api/', include(router.urls)),
     path('health/', health_check, name='health_check'),
+    path('health/live/', liveness_check, name='liveness_check'),
+    path('health/ready/', readiness_check, name='readiness_check'),
     path('metrics/', performance_metrics, name='performance_metrics'),
+    path('metrics/prometheus/', prometheus_metrics, name='prometheus_metrics'),
 ]
\ No newline at end of file
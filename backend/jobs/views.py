@@ -1,32 +1,57 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
-from django.db.models import Count, Q, Subquery, OuterRef, Avg, F, ExpressionWrapper, DurationField
+from rest_framework.filters import OrderingFilter
+from django.db.models import Count, Q
 from django.db import models
 from django.db import connection
+from django.http import StreamingHttpResponse
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from datetime import datetime
+import csv
+import io
+import json
 import logging
+from .analytics import get_phase_durations
+from .archive import read_archived_job
+from .caching import get_stats_refreshed_at, get_validators, jobs_cache_enabled, response_cache_key
 from .models import Job, JobStatus
-from .serializers import JobReadSerializer, JobWriteSerializer, JobStatusUpdateSerializer
+from .serializers import (
+    JOB_READ_FIELD_COLUMNS, JOB_READ_VIEWS, JobReadSerializer, JobWriteSerializer,
+    JobStatusUpdateSerializer, job_read_columns, job_rows_to_representation,
+)
+from .filters import JobSearchFilter
+from .metrics import record_cache_lookup
 from .pagination import JobPagination
+from .renderers import CSVRenderer, NDJSONRenderer, csv_value, ndjson_line
+from .rollups import BUCKET_SIZES, DEFAULT_WINDOWS, get_timeseries, truncate
 
 logger = logging.getLogger('jobs.api')
 
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+EXPORT_FIELDS = [
+    'id', 'name', 'description', 'priority', 'current_status', 'current_progress',
+    'current_message', 'status_changed_at', 'created_at', 'updated_at', 'scheduled_at',
+    'completed_at', 'error_message', 'result_data', 'resource_requirements',
+]
+
 
 class JobViewSet(viewsets.ModelViewSet):
-    queryset = Job.objects.select_related().prefetch_related(
-        'statuses'
-    ).only(
-        'id', 'name', 'description', 'priority', 'created_at', 'updated_at', 'completed_at'
-    )
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    # Read actions select only the columns of the requested fields (get_read_rows)
+    queryset = Job.objects.all()
+    filter_backends = [DjangoFilterBackend, OrderingFilter, JobSearchFilter]
     filterset_fields = ['priority']
     search_fields = ['name', 'description']
     ordering_fields = ['created_at', 'name', 'priority', 'updated_at']
-    ordering = ['-priority', '-created_at']
+    ordering = ['-priority', '-created_at', 'id']
     pagination_class = JobPagination
 
     def get_serializer_class(self):
@@ -34,36 +59,124 @@ class JobViewSet(viewsets.ModelViewSet):
             return JobWriteSerializer
         return JobReadSerializer
 
+    def get_read_fields(self):
+        """
+        JobReadSerializer fields chosen with ?fields=a,b or ?view=summary|full
+        (default full), in serializer order. Unknown names are a 400.
+        """
+        if self.request.query_params.get('fields'):
+            requested = {name.strip() for name in self.request.query_params['fields'].split(',') if name.strip()}
+            unknown = requested - set(JOB_READ_FIELD_COLUMNS)
+            if unknown:
+                raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+            return [name for name in JOB_READ_FIELD_COLUMNS if name in requested]
+
+        view = self.request.query_params.get('view') or 'full'
+        if view not in JOB_READ_VIEWS:
+            raise ValidationError({'view': f"Must be one of: {', '.join(JOB_READ_VIEWS)}"})
+        return list(JOB_READ_VIEWS[view])
+
+    def conditional_response(self, request, render, extra_timestamps=()):
+        """
+        Answer with 304 Not Modified when the client's If-None-Match /
+        If-Modified-Since match the current jobs watermark, without calling
+        render() at all; otherwise render and attach the validators.
+        Without a shared cache the watermark is per process, so responses
+        are always rendered and carry no validators.
+        """
+        if not jobs_cache_enabled():
+            return render()
+
+        etag, last_modified = get_validators(request, extra_timestamps)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.cached_response(etag, render)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # Let browsers keep the response but revalidate before each use
+            response['Cache-Control'] = 'no-cache'
+        return response
+
+    def cached_response(self, etag, render):
+        """
+        Serve the response data cached for this action and ETag, or render
+        and cache it for the action's JOB_RESPONSE_CACHE_TTLS entry. Writes
+        bump the jobs version, which changes the ETag and so the key; off
+        unless that version is shared (JOB_CACHE_SHARED).
+        """
+        ttl = getattr(settings, 'JOB_RESPONSE_CACHE_TTLS', {}).get(self.action, 0)
+        if not ttl or not jobs_cache_enabled():
+            return render()
+
+        cache_key = response_cache_key(self.action, etag)
+        data = cache.get(cache_key)
+        record_cache_lookup(f'job_{self.action}_response', data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = render()
+        if response.status_code == 200:
+            cache.set(cache_key, response.data, ttl)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self._get_list_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self._get_detail_response)
+
+    def get_read_rows(self, queryset, fields):
+        """
+        Plain dict rows holding just the columns of `fields`, so large
+        columns such as result_data are only read when asked for. The pk
+        (the cursor tie-breaker), ordering columns and selected annotations
+        (e.g. search_rank) are always kept for cursor positions; the
+        representation only ever outputs `fields`.
+        """
+        order_by = queryset.query.order_by or queryset.model._meta.ordering
+        ordering = [name.lstrip('-') for name in order_by if isinstance(name, str)]
+        columns = job_read_columns(fields) + ['id'] + [
+            name for name in ordering if name in {'pk', *self.ordering_fields}
+        ]
+        return queryset.values(*dict.fromkeys(columns), *queryset.query.annotation_select)
+
+    def _get_list_response(self):
+        # Fast path: same output as JobReadSerializer(many=True), built from
+        # values() rows instead of model instances and per-field serializers
+        fields = self.get_read_fields()
+        queryset = self.get_read_rows(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(job_rows_to_representation(page, fields))
+        return Response(job_rows_to_representation(queryset, fields))
+
+    def _get_detail_response(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        fields = self.get_read_fields()
+        queryset = self.get_read_rows(self.filter_queryset(self.get_queryset()), fields)
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(job_rows_to_representation([row], fields)[0])
+
     def update(self, request, *args, **kwargs):
         """Update job status by creating new JobStatus entry"""
         job = self.get_object()
+        fields = self.get_read_fields()
         serializer = JobStatusUpdateSerializer(data=request.data)
         
         if serializer.is_valid():
-            # Create new status entry with optional fields
-            status_data = {
-                'job': job,
-                'status_type': serializer.validated_data['status_type']
-            }
-            
-            # Add optional fields if provided
-            if 'message' in serializer.validated_data:
-                status_data['message'] = serializer.validated_data['message']
-            if 'progress' in serializer.validated_data:
-                status_data['progress'] = serializer.validated_data['progress']
-                
-            JobStatus.objects.create(**status_data)
-            
-            # Update job completed_at if status is terminal
-            if serializer.validated_data['status_type'] in ['COMPLETED', 'FAILED', 'CANCELLED']:
-                from django.utils import timezone
-                job.completed_at = timezone.now()
-                job.save(update_fields=['completed_at'])
+            # Record the new status entry; current_* columns and completed_at
+            # are updated in the same transaction
+            job.record_status(
+                serializer.validated_data['status_type'],
+                message=serializer.validated_data.get('message', ''),
+                progress=serializer.validated_data.get('progress'),
+            )
             
-            # Return updated job
-            job.refresh_from_db()
-            response_serializer = self.get_serializer(job)
-            return Response(response_serializer.data)
+            # Return updated job; record_status() leaves the instance current,
+            # so its columns are rendered like the read actions' values() rows
+            row = {column: getattr(job, column) for column in job_read_columns(fields)}
+            return Response(job_rows_to_representation([row], fields)[0])
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -75,18 +188,10 @@ class JobViewSet(viewsets.ModelViewSet):
         """Enhanced queryset with status and date filtering"""
         queryset = super().get_queryset()
         
-        # Filter by status type (filter jobs by their latest status)
+        # Filter by status type (uses the denormalized latest status)
         status_type = self.request.query_params.get('status', None)
         if status_type:
-            # Subquery to get the latest status for each job
-            from django.db.models import Subquery, OuterRef
-            latest_status_subquery = JobStatus.objects.filter(
-                job=OuterRef('pk')
-            ).order_by('-timestamp').values('status_type')[:1]
-            
-            queryset = queryset.annotate(
-                latest_status_type=Subquery(latest_status_subquery)
-            ).filter(latest_status_type=status_type)
+            queryset = queryset.filter(current_status=status_type)
         
         # Filter by date range
         created_after = self.request.query_params.get('created_after', None)
@@ -110,122 +215,162 @@ class JobViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get dashboard statistics using materialized view for better performance"""
+        """
+        Get dashboard statistics from the job_stats_view materialized view.
+        The view is refreshed in the background by the refresh_job_stats
+        management command; this endpoint only ever reads it.
+        """
+        return self.conditional_response(
+            request, self._get_stats_response, extra_timestamps=[get_stats_refreshed_at()]
+        )
+
+    def _get_stats_response(self):
         try:
-            # Try to get stats from materialized view first
-            with connection.cursor() as cursor:
-                # Check if view needs refresh (older than 5 minutes)
-                cursor.execute("""
-                    SELECT last_updated, 
-                           total_jobs, pending_jobs, running_jobs, completed_jobs, 
-                           failed_jobs, cancelled_jobs, recent_jobs,
-                           avg_completion_time_minutes
-                    FROM job_stats_view 
-                    WHERE last_updated > NOW() - INTERVAL '5 minutes'
-                    LIMIT 1;
-                """)
-                
-                result = cursor.fetchone()
-                
-                if result:
-                    # Use cached stats from materialized view
-                    stats_data = {
-                        'total_jobs': result[1],
-                        'pending_jobs': result[2],
-                        'running_jobs': result[3], 
-                        'completed_jobs': result[4],
-                        'failed_jobs': result[5],
-                        'cancelled_jobs': result[6],
-                        'recent_jobs': result[7],
-                        'avg_completion_time_minutes': float(result[8]) if result[8] else 0,
-                        'last_updated': result[0].isoformat(),
-                        'data_source': 'materialized_view'
-                    }
-                else:
-                    # Refresh materialized view and get fresh stats
-                    cursor.execute("SELECT refresh_job_stats();")
-                    cursor.execute("""
-                        SELECT last_updated, 
-                               total_jobs, pending_jobs, running_jobs, completed_jobs, 
-                               failed_jobs, cancelled_jobs, recent_jobs,
-                               avg_completion_time_minutes
-                        FROM job_stats_view 
-                        LIMIT 1;
-                    """)
-                    
-                    result = cursor.fetchone()
-                    if result:
-                        stats_data = {
-                            'total_jobs': result[1],
-                            'pending_jobs': result[2],
-                            'running_jobs': result[3],
-                            'completed_jobs': result[4], 
-                            'failed_jobs': result[5],
-                            'cancelled_jobs': result[6],
-                            'recent_jobs': result[7],
-                            'avg_completion_time_minutes': float(result[8]) if result[8] else 0,
-                            'last_updated': result[0].isoformat(),
-                            'data_source': 'refreshed_view'
-                        }
-                    else:
-                        raise Exception("Failed to get stats from materialized view")
-        
+            stats_data = self._get_stats_from_view()
         except Exception as e:
             # Fallback to direct queries if materialized view fails
             logger.warning(f"Materialized view stats failed, using fallback: {e}")
+            stats_data = None
+
+        # A view hit means the precomputed snapshot answered the request
+        record_cache_lookup('job_stats_view', stats_data is not None)
+        if stats_data is None:
             stats_data = self._get_stats_fallback()
-            
-        # Add priority distribution (not in materialized view due to complexity)
-        priority_counts = Job.objects.values('priority').annotate(count=Count('priority')).order_by('priority')
-        stats_data['priority_distribution'] = {item['priority']: item['count'] for item in priority_counts}
         
         return Response(stats_data)
+
+    def _get_stats_from_view(self):
+        """Read the latest snapshot from job_stats_view, or None if it is unavailable"""
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT last_updated,
+                       total_jobs, pending_jobs, running_jobs, completed_jobs,
+                       failed_jobs, cancelled_jobs, recent_jobs,
+                       avg_completion_time_minutes, priority_distribution
+                FROM job_stats_view
+                LIMIT 1;
+            """)
+            result = cursor.fetchone()
+
+        if not result:
+            return None
+
+        priority_distribution = result[9]
+        if isinstance(priority_distribution, str):
+            priority_distribution = json.loads(priority_distribution)
+
+        return {
+            'total_jobs': result[1],
+            'pending_jobs': result[2],
+            'running_jobs': result[3],
+            'completed_jobs': result[4],
+            'failed_jobs': result[5],
+            'cancelled_jobs': result[6],
+            'recent_jobs': result[7],
+            'avg_completion_time_minutes': float(result[8]) if result[8] else 0,
+            'last_updated': result[0].isoformat(),
+            'data_source': 'materialized_view',
+            'priority_distribution': {
+                int(priority): count for priority, count in sorted(
+                    priority_distribution.items(), key=lambda item: int(item[0])
+                )
+            },
+        }
     
     def _get_stats_fallback(self):
         """Fallback method for getting stats using direct queries"""
-        total_jobs = Job.objects.count()
-        
-        # Status counts (get latest status for each job)
-        status_counts = {}
-        for status_choice in JobStatus.STATUS_CHOICES:
-            status_type = status_choice[0]
-            # Use more efficient subquery approach
-            latest_status_subquery = JobStatus.objects.filter(
-                job=OuterRef('pk')
-            ).order_by('-timestamp').values('status_type')[:1]
-            
-            count = Job.objects.annotate(
-                latest_status_type=Subquery(latest_status_subquery)
-            ).filter(latest_status_type=status_type).count()
-            
-            status_counts[status_type.lower() + '_jobs'] = count
-        
-        # Recent activity (jobs created in last 24 hours)
         yesterday = timezone.now() - timezone.timedelta(days=1)
-        recent_jobs = Job.objects.filter(created_at__gte=yesterday).count()
-        
-        # Average completion time
-        avg_completion = Job.objects.filter(
-            completed_at__isnull=False
-        ).aggregate(
+        totals = Job.objects.aggregate(
+            total_jobs=Count('id'),
+            recent_jobs=Count('id', filter=Q(created_at__gte=yesterday)),
             avg_time=models.Avg(
                 models.ExpressionWrapper(
                     models.F('completed_at') - models.F('created_at'),
                     output_field=models.DurationField()
-                )
-            )
-        )['avg_time']
-        
+                ),
+                filter=Q(completed_at__isnull=False)
+            ),
+            **{
+                status_type.lower() + '_jobs': Count('id', filter=Q(current_status=status_type))
+                for status_type, _ in JobStatus.STATUS_CHOICES
+            }
+        )
+
+        avg_completion = totals.pop('avg_time')
         avg_minutes = (avg_completion.total_seconds() / 60) if avg_completion else 0
+
+        priority_counts = Job.objects.values('priority').annotate(count=Count('id')).order_by('priority')
         
         return {
-            'total_jobs': total_jobs,
-            'recent_jobs': recent_jobs,
             'avg_completion_time_minutes': round(avg_minutes, 2),
             'data_source': 'fallback_queries',
-            **status_counts
+            'priority_distribution': {item['priority']: item['count'] for item in priority_counts},
+            **totals
         }
 
+    @action(detail=False, methods=['get'])
+    def durations(self, request):
+        """
+        Queue wait, run time and retry gap distributions (count, avg,
+        p50/p90/p99 seconds), overall and per priority, for the jobs
+        matching the list filters (?status=, ?priority=, ?created_after=, ...).
+        Read from the phase columns record_status() keeps up to date.
+        """
+        return self.conditional_response(
+            request, lambda: Response(get_phase_durations(self.filter_queryset(self.get_queryset())))
+        )
+
+    @action(detail=False, methods=['get'])
+    def timeseries(self, request):
+        """
+        Jobs created, started, completed, failed and cancelled per bucket.
+        Params: ?bucket=minute|hour (default hour), ?created_after= and
+        ?created_before= (ISO 8601; default the last hour of minutes or day
+        of hours, up to now), ?priority=. Closed buckets come from the
+        rollups written by roll_up_job_status; only the rest is counted live.
+        """
+        bucket = request.query_params.get('bucket') or 'hour'
+        if bucket not in BUCKET_SIZES:
+            raise ValidationError({'bucket': f"Must be one of: {', '.join(BUCKET_SIZES)}"})
+
+        now = timezone.now()
+        end = self._parse_timeseries_datetime('created_before') or now
+        start = self._parse_timeseries_datetime('created_after') or end - DEFAULT_WINDOWS[bucket]
+        if start > end:
+            raise ValidationError({'created_after': 'Must not be later than created_before'})
+        max_buckets = getattr(settings, 'JOB_TIMESERIES_MAX_BUCKETS', 1440)
+        if (end - start) / BUCKET_SIZES[bucket] >= max_buckets:
+            raise ValidationError({'bucket': f'The range spans more than {max_buckets} {bucket} buckets'})
+
+        try:
+            priority = int(request.query_params['priority']) if request.query_params.get('priority') else None
+        except ValueError:
+            raise ValidationError({'priority': 'Must be an integer'})
+
+        def render():
+            return Response({
+                'bucket': bucket,
+                'results': get_timeseries(start, end, bucket, priority),
+            })
+
+        # The open bucket changes with the clock as well as with writes
+        return self.conditional_response(
+            request, render, extra_timestamps=[truncate(now, bucket).timestamp()]
+        )
+
+    def _parse_timeseries_datetime(self, param):
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            raise ValidationError({param: 'Must be an ISO 8601 datetime'})
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+
     @action(detail=False, methods=['post'])
     def bulk_status_update(self, request):
         """Update status for multiple jobs"""
@@ -243,32 +388,173 @@ class JobViewSet(viewsets.ModelViewSet):
         if not status_serializer.is_valid():
             return Response(status_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        # Update all specified jobs
-        jobs = Job.objects.filter(id__in=job_ids)
-        updated_count = 0
+        # A string would otherwise be read digit by digit ("12" -> jobs 1 and 2)
+        if not isinstance(job_ids, list):
+            return Response(
+                {'error': 'job_ids must be a list of integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            job_ids = list(dict.fromkeys(int(job_id) for job_id in job_ids))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'job_ids must be a list of integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # One batched status insert and one jobs UPDATE per chunk, each chunk
+        # in its own transaction
+        chunk_size = getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000)
+        updated_ids = set()
+        for start in range(0, len(job_ids), chunk_size):
+            chunk = job_ids[start:start + chunk_size]
+            updated_ids.update(Job.objects.filter(id__in=chunk).record_status(
+                status_serializer.validated_data['status_type'],
+                message=status_serializer.validated_data.get('message', ''),
+                progress=status_serializer.validated_data.get('progress'),
+            ))
         
-        for job in jobs:
-            # Create new status entry
-            status_entry_data = {
-                'job': job,
-                'status_type': status_serializer.validated_data['status_type']
-            }
-            
-            if 'message' in status_serializer.validated_data:
-                status_entry_data['message'] = status_serializer.validated_data['message']
-            if 'progress' in status_serializer.validated_data:
-                status_entry_data['progress'] = status_serializer.validated_data['progress']
-                
-            JobStatus.objects.create(**status_entry_data)
-            
-            # Update completed_at for terminal statuses
-            if status_serializer.validated_data['status_type'] in ['COMPLETED', 'FAILED', 'CANCELLED']:
-                job.completed_at = timezone.now()
-                job.save(update_fields=['completed_at'])
-            
-            updated_count += 1
+        not_found = [job_id for job_id in job_ids if job_id not in updated_ids]
         
         return Response({
-            'message': f'Updated {updated_count} jobs',
-            'updated_jobs': updated_count
+            'message': f'Updated {len(updated_ids)} jobs',
+            'updated_jobs': len(updated_ids),
+            'not_found': not_found
         })
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Create many jobs from a JSON array, or from a streamed NDJSON body
+        (Content-Type: application/x-ndjson, one job object per line).
+        Rows are validated and inserted in batches together with their
+        initial PENDING status; invalid rows are reported by index without
+        aborting the rest. `ids` lines up with the input rows (null for
+        rejected rows).
+        """
+        if request.content_type.split(';')[0].strip() in NDJSON_CONTENT_TYPES:
+            # Without a Content-Length (a chunked upload) request.stream is
+            # empty, and the jobs would be silently dropped
+            if not request.META.get('CONTENT_LENGTH'):
+                return Response(
+                    {'error': 'NDJSON uploads need a Content-Length header'},
+                    status=status.HTTP_411_LENGTH_REQUIRED
+                )
+            rows = self._iter_ndjson_rows(request.stream)
+        elif isinstance(request.data, list):
+            rows = ((row, None) for row in request.data)
+        else:
+            return Response(
+                {'error': 'Expected a JSON array or an NDJSON body of jobs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        chunk_size = getattr(settings, 'JOB_BULK_CHUNK_SIZE', 1000)
+        row_serializer = JobWriteSerializer()
+        ids, errors, batch, batch_indexes = [], [], [], []
+
+        def flush():
+            for index, job_id in zip(batch_indexes, Job.objects.bulk_create_pending(batch)):
+                ids[index] = job_id
+            batch.clear()
+            batch_indexes.clear()
+
+        for index, (row, parse_error) in enumerate(rows):
+            ids.append(None)
+            if parse_error:
+                errors.append({'index': index, 'errors': {'non_field_errors': [parse_error]}})
+                continue
+            try:
+                validated_data = row_serializer.run_validation(row)
+            except ValidationError as e:
+                errors.append({'index': index, 'errors': e.detail})
+                continue
+
+            batch.append(Job(**validated_data))
+            batch_indexes.append(index)
+            if len(batch) >= chunk_size:
+                flush()
+        flush()
+
+        if not ids:
+            return Response(
+                {'error': 'No jobs to create'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        created_count = len(ids) - len(errors)
+        return Response({
+            'message': f'Created {created_count} jobs',
+            'created_jobs': created_count,
+            'ids': ids,
+            'errors': errors
+        }, status=status.HTTP_201_CREATED if created_count else status.HTTP_400_BAD_REQUEST)
+
+    @staticmethod
+    def _iter_ndjson_rows(stream):
+        """Yield (row, parse_error) for each non-blank line of an NDJSON stream"""
+        if stream is None:
+            return
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line), None
+            except ValueError as e:
+                yield None, f'Invalid JSON: {e}'
+
+    @action(detail=False, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream every job matching the list filters and search as CSV
+        (default, or ?format=csv) or NDJSON (?format=ndjson). Rows are read
+        through a server-side cursor in chunks, so memory use does not grow
+        with the size of the export.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*EXPORT_FIELDS)
+        rows = queryset.iterator(chunk_size=getattr(settings, 'JOB_EXPORT_CHUNK_SIZE', 2000))
+
+        renderer = request.accepted_renderer
+        if renderer.format == 'ndjson':
+            content = self._stream_ndjson(rows)
+        else:
+            content = self._stream_csv(rows)
+
+        response = StreamingHttpResponse(content, content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="jobs.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path=r'archived/(?P<job_id>\d+)')
+    def archived(self, request, job_id=None):
+        """
+        Read-only lookup of a job moved to cold storage by archive_jobs.
+        Only the compressed block holding the job is read from disk.
+        """
+        record = read_archived_job(int(job_id))
+        if record is None:
+            return Response({'error': 'Archived job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(record)
+
+    @staticmethod
+    def _stream_csv(rows, flush_every=1000):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        for count, row in enumerate(rows, 1):
+            writer.writerow(csv_value(value) for value in row)
+            if count % flush_every == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _stream_ndjson(rows, flush_every=1000):
+        lines = []
+        for row in rows:
+            lines.append(ndjson_line(dict(zip(EXPORT_FIELDS, row))))
+            if len(lines) >= flush_every:
+                yield ''.join(lines)
+                lines = []
+        yield ''.join(lines)
@@ -8,7 +8,7 @@ test.describe('Performance Tests', () => {
   test('should handle 1000+ jobs without performance degradation', async ({ page }) => {
     // Seed database with large dataset
     console.log('Creating large dataset...');
-    await execAsync('cd backend && python manage.py seed_test_data --clear --count 1200');
+    await execAsync('cd backend && python manage.py seed_test_data --bulk --clear --count 1200 --seed 1');
     
     await page.goto('/');
     
@@ -0,0 +1,45 @@
+import React from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { jobsKeys } from './useJobs';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+
+// Coalesce bursts of events (e.g. bulk updates) into one refetch
+const INVALIDATE_DELAY_MS = 500;
+
+// Subscribe to the server-sent job event stream and refresh job queries when
+// jobs are created or change status. Returns whether the stream is connected,
+// so callers can fall back to polling when it isn't (e.g. under the WSGI dev server).
+export const useJobEvents = () => {
+  const queryClient = useQueryClient();
+  const [connected, setConnected] = React.useState(false);
+
+  React.useEffect(() => {
+    if (typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(`${API_BASE_URL}/jobs/events/`);
+    let timer: ReturnType<typeof setTimeout> | undefined;
+
+    const invalidate = () => {
+      if (timer) return;
+      timer = setTimeout(() => {
+        timer = undefined;
+        queryClient.invalidateQueries({ queryKey: jobsKeys.lists() });
+        queryClient.invalidateQueries({ queryKey: jobsKeys.stats() });
+      }, INVALIDATE_DELAY_MS);
+    };
+
+    source.onopen = () => setConnected(true);
+    source.onerror = () => setConnected(source.readyState === EventSource.OPEN);
+    source.addEventListener('job_created', invalidate);
+    source.addEventListener('status_changed', invalidate);
+    source.addEventListener('reset', invalidate);
+
+    return () => {
+      if (timer) clearTimeout(timer);
+      source.close();
+    };
+  }, [queryClient]);
+
+  return connected;
+};
@@ -2,6 +2,7 @@ import React from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { jobsApi } from '../services/api/jobs';
 import { JobStatusUpdate } from '../types/job';
+import { useJobEvents } from './useJobEvents';
 
 interface UseJobsOptions {
   search?: string;
@@ -31,21 +32,24 @@ export const useJobs = (options: UseJobsOptions = {}) => {
     refetchOnWindowFocus: true,
   });
 
+  // Live updates from the server-sent event stream refresh the list on change
+  const liveUpdates = useJobEvents();
+
   // Check if there are any RUNNING jobs and enable polling
   const hasRunningJobs = queryResult.data?.results?.some(
     (job: any) => job.latest_status?.status_type === 'RUNNING'
   );
 
-  // Enable polling if there are running jobs
+  // Fall back to polling if there are running jobs and no event stream
   React.useEffect(() => {
-    if (hasRunningJobs && !status) { // Only poll when not filtering by status
+    if (hasRunningJobs && !status && !liveUpdates) { // Only poll when not filtering by status
       const interval = setInterval(() => {
         queryResult.refetch();
       }, 5000); // Poll every 5 seconds
 
       return () => clearInterval(interval);
     }
-  }, [hasRunningJobs, status, queryResult]);
+  }, [hasRunningJobs, status, liveUpdates, queryResult]);
 
   return queryResult;
 };
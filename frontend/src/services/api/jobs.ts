@@ -10,6 +10,8 @@ export const jobsApi = {
     if (params.search) urlParams.append('search', params.search);
     if (params.status) urlParams.append('status', params.status);
     if (params.priority) urlParams.append('priority', params.priority);
+    // The list never shows result_data and friends; skip reading them
+    urlParams.append('view', 'summary');
     
     const url = `${API_BASE_URL}/jobs/${urlParams.toString() ? '?' + urlParams.toString() : ''}`;
     const response = await fetch(url);
@@ -36,6 +36,10 @@ kubectl apply -f k8s/postgres-deployment.yaml
 echo "⏳ Waiting for PostgreSQL to be ready..."
 kubectl wait --for=condition=available --timeout=300s deployment/postgres -n job-dashboard
 
+echo "🧠 Deploying Redis..."
+kubectl apply -f k8s/redis-deployment.yaml
+kubectl wait --for=condition=available --timeout=300s deployment/redis -n job-dashboard
+
 echo "🔧 Deploying backend..."
 kubectl apply -f k8s/backend-deployment.yaml
 